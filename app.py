@@ -5,23 +5,34 @@ import plotly.express as px
 import plotly.figure_factory as ff
 import plotly.graph_objects as go
 from datetime import datetime, timedelta, date
-from validaciones_utils import validar_reglas_negocio, mostrar_estado_validaciones, verificar_condiciones_estandares, verificar_condiciones_oficio_cierre
+from validaciones_utils import (validar_reglas_negocio, validar_reglas_negocio_con_cache, cambios_reglas_negocio,
+                                mostrar_estado_validaciones,
+                                verificar_condiciones_estandares, verificar_condicion_publicacion,
+                                verificar_condiciones_oficio_cierre, obtener_regla, violaciones_cronologia,
+                                pares_fuera_de_orden, bits_pares, describir_par, mostrar_cronologia_hitos)
 import io
 import base64
 import os
 import re
-from fecha_utils import calcular_plazo_analisis, actualizar_plazo_analisis, calcular_plazo_cronograma, actualizar_plazo_cronograma, calcular_plazo_oficio_cierre, actualizar_plazo_oficio_cierre
+from fecha_utils import estadisticas_cache_fechas, calcular_plazo_analisis, calcular_plazo_cronograma, calcular_plazo_oficio_cierre, actualizar_plazos, obtener_fecha_corte
 
 # Importar las funciones corregidas
 from config import setup_page, load_css
 from data_utils import (
-    cargar_datos, procesar_metas, calcular_porcentaje_avance,
-    verificar_estado_fechas, formatear_fecha, es_fecha_valida,
+    cargar_datos, procesar_metas,
     validar_campos_fecha, guardar_datos_editados, procesar_fecha,
-    contar_registros_completados_por_fecha
+    contar_registros_completados_por_fecha, calcular_porcentaje_avance_df,
+    sin_columnas_derivadas, asignar_valor, obtener_fecha, fechas_para_mostrar,
+    columna_dias_habiles, indicadores_fecha_corte_df,
+    cargar_metas, cargar_con_cache, agregar_registros_por_bloques, guardar_columnas_editadas,
+    actualizar_plazos_con_cache, guardar_filas_agregadas, filas_agregadas, filas_distintas, clave_registros
 )
-from visualization import crear_gantt, comparar_avance_metas
-from constants import REGISTROS_DATA, META_DATA
+from visualization import crear_gantt, comparar_avance_metas, comparar_completados_con_metas
+from constants import (REGISTROS_DATA, META_DATA, HITOS, UMBRAL_MODO_BLOQUES, COLUMNAS_TABLERO, COLUMNAS_PLAZOS,
+                       CAMPOS_ORIGEN_PLAZOS, CAMPOS_DIAS_HABILES)
+
+# Vistas de la pestaña de datos completos
+VISTAS_DATOS = ["Vista de Tabla Completa", "Edición de Registros"]
 
 # Función para convertir fecha string a datetime
 def string_a_fecha(fecha_str):
@@ -43,15 +54,127 @@ def highlight_estado_fechas(s):
         return ['background-color: #ffffff'] * len(s)
 
 
-def mostrar_dashboard(df_filtrado, metas_nuevas_df, metas_actualizar_df, registros_df):
-    """Muestra el dashboard principal con métricas y gráficos."""
+def mostrar_dashboard(df_filtrado, metas_nuevas_df, metas_actualizar_df, registros_df, fecha_corte=None):
+    """Muestra el dashboard principal con métricas y gráficos a la fecha de corte (por defecto, hoy)."""
     # Mostrar métricas generales
+    mostrar_metricas_generales(len(df_filtrado), df_filtrado['Porcentaje Avance'].mean(),
+                               len(df_filtrado[df_filtrado['Porcentaje Avance'] == 100]))
+
+    # Calcular comparación con metas
+    comparacion_nuevos, comparacion_actualizar, fecha_meta = comparar_avance_metas(df_filtrado, metas_nuevas_df,
+                                                                                   metas_actualizar_df, fecha_corte)
+    mostrar_comparacion_metas(comparacion_nuevos, comparacion_actualizar, fecha_meta)
+
+    # Diagrama de Gantt
+    st.markdown('<div class="subtitle">Diagrama de Gantt - Cronograma de Hitos</div>', unsafe_allow_html=True)
+
+    # Crear el diagrama de Gantt
+    fig_gantt = crear_gantt(df_filtrado, fecha_corte)
+    if fig_gantt is not None:
+        st.plotly_chart(fig_gantt, use_container_width=True)
+    else:
+        st.warning("No hay datos suficientes para crear el diagrama de Gantt.")
+
+    # Tabla de registros con porcentaje de avance
+    st.markdown('<div class="subtitle">Detalle de Registros</div>', unsafe_allow_html=True)
+
+    # Definir el nuevo orden exacto de las columnas según lo solicitado
+    columnas_mostrar = [
+        # Datos básicos
+        'Cod', 'Entidad', 'Nivel Información ', 'Funcionario',  # Incluir Funcionario después de datos básicos
+        # Columnas adicionales en el orden específico
+        'Frecuencia actualizacion ', 'TipoDato',
+        'Suscripción acuerdo de compromiso', 'Entrega acuerdo de compromiso',
+        'Fecha de entrega de información', 'Plazo de análisis', 'Plazo de cronograma',
+        'Análisis y cronograma',
+        'Registro (completo)', 'ET (completo)', 'CO (completo)', 'DD (completo)', 'REC (completo)',
+        'SERVICIO (completo)',
+        'Estándares (fecha programada)', 'Estándares',
+        'Fecha de publicación programada', 'Publicación',
+        'Plazo de oficio de cierre', 'Fecha de oficio de cierre',
+        'Estado', 'Observación', 'Porcentaje Avance'
+    ]
+
+    # Mostrar tabla con colores por estado de fechas
+    try:
+        # Verificar que todas las columnas existan en df_filtrado
+        columnas_mostrar_existentes = [col for col in columnas_mostrar if col in df_filtrado.columns]
+        df_mostrar = df_filtrado[columnas_mostrar_existentes].copy()
+
+        # Aplicar formato a las fechas (formateadas una sola vez por versión de los datos)
+        fechas = fechas_para_mostrar(registros_df, 'registros.csv')
+        for col in fechas.columns:
+            if col in df_mostrar.columns:
+                df_mostrar[col] = fechas.loc[df_mostrar.index, col]
+
+        # Mostrar el dataframe con formato
+        st.dataframe(
+            df_mostrar
+            .style.format({'Porcentaje Avance': '{:.2f}%'})
+            .apply(highlight_estado_fechas, axis=1)
+            .background_gradient(cmap='RdYlGn', subset=['Porcentaje Avance']),
+            use_container_width=True
+        )
+
+        # Agregar botón para descargar la tabla en CSV
+        csv = df_mostrar.to_csv(index=False).encode('utf-8')
+        st.download_button(
+            label="Descargar tabla (CSV)",
+            data=csv,
+            file_name="registros_detalle.csv",
+            mime="text/csv",
+        )
+    except Exception as e:
+        st.error(f"Error al mostrar la tabla de registros: {e}")
+        st.dataframe(df_filtrado[columnas_mostrar_existentes])
+
+    # Días hábiles restantes o de retraso
+    mostrar_dias_habiles(df_filtrado)
+
+
+def mostrar_dias_habiles(df_filtrado):
+    """Muestra los días hábiles restantes (o de retraso) de las fechas programadas y los plazos."""
+    st.markdown('<div class="subtitle">Días Hábiles Restantes por Fecha Programada y Plazo</div>',
+                unsafe_allow_html=True)
+
+    columnas = {columna_dias_habiles(campo): campo for campo in CAMPOS_DIAS_HABILES
+                if columna_dias_habiles(campo) in df_filtrado.columns}
+    if not columnas:
+        st.info("No hay fechas programadas ni plazos para calcular los días hábiles restantes.")
+        return
+    dias = df_filtrado[list(columnas)].rename(columns=columnas)
+    vencidos = dias < 0
+
+    # Registros vencidos por fecha programada o plazo
+    conteo_vencidos = vencidos.sum()
+    fig_vencidos = px.bar(
+        x=conteo_vencidos.index,
+        y=conteo_vencidos.values,
+        labels={'x': 'Fecha programada o plazo', 'y': 'Registros vencidos'},
+        title='Registros Vencidos por Fecha Programada y Plazo'
+    )
+    st.plotly_chart(fig_vencidos, use_container_width=True)
+
+    # Tabla ordenada por el mayor retraso
+    columnas_registro = [col for col in ['Cod', 'Entidad', 'Nivel Información '] if col in df_filtrado.columns]
+    tabla = pd.concat([df_filtrado[columnas_registro], dias], axis=1)
+    if st.checkbox("Mostrar solo registros con fechas vencidas", key="solo_vencidos"):
+        tabla = tabla[vencidos.any(axis=1).to_numpy(dtype=bool, na_value=False)]
+    orden = dias.loc[tabla.index].min(axis=1)
+    tabla = tabla.loc[orden.sort_values(na_position='last', kind='stable').index]
+
+    st.dataframe(tabla, use_container_width=True)
+    st.caption("Días hábiles (sin fines de semana ni festivos) desde la fecha de corte hasta cada fecha. "
+               "Los valores negativos son días hábiles de retraso.")
+
+
+def mostrar_metricas_generales(total_registros, avance_promedio, registros_completados):
+    """Muestra las tarjetas de métricas generales del dashboard."""
     st.markdown('<div class="subtitle">Métricas Generales</div>', unsafe_allow_html=True)
 
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        total_registros = len(df_filtrado)
         st.markdown(f"""
         <div class="metric-card">
             <p style="font-size: 1rem; color: #64748b;">Total Registros</p>
@@ -60,7 +183,6 @@ def mostrar_dashboard(df_filtrado, metas_nuevas_df, metas_actualizar_df, registr
         """, unsafe_allow_html=True)
 
     with col2:
-        avance_promedio = df_filtrado['Porcentaje Avance'].mean()
         st.markdown(f"""
         <div class="metric-card">
             <p style="font-size: 1rem; color: #64748b;">Avance Promedio</p>
@@ -69,7 +191,6 @@ def mostrar_dashboard(df_filtrado, metas_nuevas_df, metas_actualizar_df, registr
         """, unsafe_allow_html=True)
 
     with col3:
-        registros_completados = len(df_filtrado[df_filtrado['Porcentaje Avance'] == 100])
         st.markdown(f"""
         <div class="metric-card">
             <p style="font-size: 1rem; color: #64748b;">Registros Completados</p>
@@ -86,13 +207,12 @@ def mostrar_dashboard(df_filtrado, metas_nuevas_df, metas_actualizar_df, registr
         </div>
         """, unsafe_allow_html=True)
 
+
+def mostrar_comparacion_metas(comparacion_nuevos, comparacion_actualizar, fecha_meta):
+    """Muestra la comparación del avance con las metas quincenales (tablas y gráficos)."""
     # Comparación con metas
     st.markdown('<div class="subtitle">Comparación con Metas Quincenales</div>', unsafe_allow_html=True)
 
-    # Calcular comparación con metas
-    comparacion_nuevos, comparacion_actualizar, fecha_meta = comparar_avance_metas(df_filtrado, metas_nuevas_df,
-                                                                                   metas_actualizar_df)
-
     # Mostrar fecha de la meta
     st.markdown(f"**Meta más cercana a la fecha actual: {fecha_meta.strftime('%d/%m/%Y')}**")
 
@@ -135,75 +255,6 @@ def mostrar_dashboard(df_filtrado, metas_nuevas_df, metas_actualizar_df, registr
         )
         st.plotly_chart(fig_actualizar, use_container_width=True)
 
-    # Diagrama de Gantt
-    st.markdown('<div class="subtitle">Diagrama de Gantt - Cronograma de Hitos</div>', unsafe_allow_html=True)
-
-    # Crear el diagrama de Gantt
-    fig_gantt = crear_gantt(df_filtrado)
-    if fig_gantt is not None:
-        st.plotly_chart(fig_gantt, use_container_width=True)
-    else:
-        st.warning("No hay datos suficientes para crear el diagrama de Gantt.")
-
-    # Tabla de registros con porcentaje de avance
-    st.markdown('<div class="subtitle">Detalle de Registros</div>', unsafe_allow_html=True)
-
-    # Definir el nuevo orden exacto de las columnas según lo solicitado
-    columnas_mostrar = [
-        # Datos básicos
-        'Cod', 'Entidad', 'Nivel Información ', 'Funcionario',  # Incluir Funcionario después de datos básicos
-        # Columnas adicionales en el orden específico
-        'Frecuencia actualizacion ', 'TipoDato',
-        'Suscripción acuerdo de compromiso', 'Entrega acuerdo de compromiso',
-        'Fecha de entrega de información', 'Plazo de análisis', 'Plazo de cronograma',
-        'Análisis y cronograma',
-        'Registro (completo)', 'ET (completo)', 'CO (completo)', 'DD (completo)', 'REC (completo)',
-        'SERVICIO (completo)',
-        'Estándares (fecha programada)', 'Estándares',
-        'Fecha de publicación programada', 'Publicación',
-        'Plazo de oficio de cierre', 'Fecha de oficio de cierre',
-        'Estado', 'Observación', 'Porcentaje Avance'
-    ]
-
-    # Mostrar tabla con colores por estado de fechas
-    try:
-        # Verificar que todas las columnas existan en df_filtrado
-        columnas_mostrar_existentes = [col for col in columnas_mostrar if col in df_filtrado.columns]
-        df_mostrar = df_filtrado[columnas_mostrar_existentes].copy()
-
-        # Aplicar formato a las fechas
-        columnas_fecha = [
-            'Suscripción acuerdo de compromiso', 'Entrega acuerdo de compromiso',
-            'Fecha de entrega de información', 'Plazo de análisis', 'Plazo de cronograma',
-            'Análisis y cronograma', 'Estándares (fecha programada)', 'Estándares',
-            'Fecha de publicación programada', 'Publicación',
-            'Plazo de oficio de cierre', 'Fecha de oficio de cierre'
-        ]
-
-        for col in columnas_fecha:
-            if col in df_mostrar.columns:
-                df_mostrar[col] = df_mostrar[col].apply(lambda x: formatear_fecha(x) if es_fecha_valida(x) else "")
-
-        # Mostrar el dataframe con formato
-        st.dataframe(
-            df_mostrar
-            .style.format({'Porcentaje Avance': '{:.2f}%'})
-            .apply(highlight_estado_fechas, axis=1)
-            .background_gradient(cmap='RdYlGn', subset=['Porcentaje Avance']),
-            use_container_width=True
-        )
-
-        # Agregar botón para descargar la tabla en CSV
-        csv = df_mostrar.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="Descargar tabla (CSV)",
-            data=csv,
-            file_name="registros_detalle.csv",
-            mime="text/csv",
-        )
-    except Exception as e:
-        st.error(f"Error al mostrar la tabla de registros: {e}")
-        st.dataframe(df_filtrado[columnas_mostrar_existentes])
 
 # Función de callback para manejar cambios
 def on_change_callback():
@@ -269,12 +320,15 @@ def mostrar_datos_completos_interactivo(registros_df):
         # Limpiar mensaje después de mostrarlo
         st.session_state.mensaje_guardado = None
 
-    # Agregar subtabs para ver todos los datos o editar individualmente
-    data_tab1, data_tab2 = st.tabs(["Vista de Tabla Completa", "Edición de Registros"])
+    # Selector para ver todos los datos o editar individualmente. No se usan pestañas porque
+    # Streamlit ejecuta todas las pestañas; así la edición (y la carga de todas las columnas)
+    # solo ocurre cuando se selecciona
+    vista_datos = st.radio("Vista de datos", VISTAS_DATOS, horizontal=True, key="vista_datos",
+                           label_visibility="collapsed")
 
-    with data_tab1:
+    if vista_datos == VISTAS_DATOS[0]:
         st.markdown("### Tabla Completa de Registros")
-        st.info("Esta vista muestra todos los registros. Para editar, use la pestaña 'Edición de Registros'.")
+        st.info("Esta vista muestra todos los registros. Para editar, seleccione 'Edición de Registros'.")
 
         # Preparar los datos para mostrar en la tabla
         df_mostrar = registros_df.copy()
@@ -302,18 +356,11 @@ def mostrar_datos_completos_interactivo(registros_df):
         # Reorganizar el DataFrame según el orden especificado
         df_mostrar = df_mostrar[columnas_mostrar]
 
-        # Formatear las columnas de fecha
-        columnas_fecha = [
-            'Suscripción acuerdo de compromiso', 'Entrega acuerdo de compromiso',
-            'Fecha de entrega de información', 'Plazo de análisis', 'Plazo de cronograma',
-            'Análisis y cronograma', 'Estándares (fecha programada)', 'Estándares',
-            'Fecha de publicación programada', 'Publicación',
-            'Plazo de oficio de cierre', 'Fecha de oficio de cierre'
-        ]
-
-        for col in columnas_fecha:
+        # Formatear las columnas de fecha (las mismas fechas formateadas del dashboard)
+        fechas = fechas_para_mostrar(registros_df, 'registros.csv')
+        for col in fechas.columns:
             if col in df_mostrar.columns:
-                df_mostrar[col] = df_mostrar[col].apply(lambda x: formatear_fecha(x) if es_fecha_valida(x) else "")
+                df_mostrar[col] = fechas.loc[df_mostrar.index, col]
 
         # Mostrar el dataframe con formato
         try:
@@ -336,7 +383,7 @@ def mostrar_datos_completos_interactivo(registros_df):
             file_name="registros_completos.csv",
             mime="text/csv",
         )
-    with data_tab2:
+    else:
         st.markdown("### Edición Individual de Registros")
 
         # Selector de registro - mostrar lista completa de registros para seleccionar
@@ -395,7 +442,7 @@ def mostrar_datos_completos_interactivo(registros_df):
                         on_change=on_change_callback
                     )
                     if nuevo_tipo != row['TipoDato']:
-                        registros_df.at[registros_df.index[indice_seleccionado], 'TipoDato'] = nuevo_tipo
+                        asignar_valor(registros_df, registros_df.index[indice_seleccionado], 'TipoDato', nuevo_tipo)
                         edited = True
 
                 with col3:
@@ -407,7 +454,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                         on_change=on_change_callback
                     )
                     if nuevo_nivel != row['Nivel Información ']:
-                        registros_df.at[registros_df.index[indice_seleccionado], 'Nivel Información '] = nuevo_nivel
+                        asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                      'Nivel Información ', nuevo_nivel)
                         edited = True
 
                 # Frecuencia de actualización (si existe)
@@ -428,8 +476,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                             on_change=on_change_callback
                         )
                         if nueva_frecuencia != row['Frecuencia actualizacion ']:
-                            registros_df.at[
-                                registros_df.index[indice_seleccionado], 'Frecuencia actualizacion '] = nueva_frecuencia
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Frecuencia actualizacion ', nueva_frecuencia)
                             edited = True
 
                     # Funcionario (si existe)
@@ -476,8 +524,8 @@ def mostrar_datos_completos_interactivo(registros_df):
 
                             # Actualizar el DataFrame si el funcionario cambia
                             if funcionario_final != row.get('Funcionario', ''):
-                                registros_df.at[
-                                    registros_df.index[indice_seleccionado], 'Funcionario'] = funcionario_final
+                                asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                              'Funcionario', funcionario_final)
                                 edited = True
 
                 # SECCIÓN 2: ACTA DE COMPROMISO
@@ -498,8 +546,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                             on_change=on_change_callback
                         )
                         if actas_acercamiento != row['Actas de acercamiento y manifestación de interés']:
-                            registros_df.at[registros_df.index[
-                                indice_seleccionado], 'Actas de acercamiento y manifestación de interés'] = actas_acercamiento
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Actas de acercamiento y manifestación de interés', actas_acercamiento)
                             edited = True
 
                 # Suscripción acuerdo de compromiso (si existe)
@@ -520,8 +568,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                         fecha_original = "" if pd.isna(row['Suscripción acuerdo de compromiso']) else row[
                             'Suscripción acuerdo de compromiso']
                         if nueva_fecha_suscripcion_str != fecha_original:
-                            registros_df.at[registros_df.index[
-                                indice_seleccionado], 'Suscripción acuerdo de compromiso'] = nueva_fecha_suscripcion_str
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Suscripción acuerdo de compromiso', nueva_fecha_suscripcion_str)
                             edited = True
 
                 with col2:
@@ -544,8 +592,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                         'Entrega acuerdo de compromiso']
 
                     if nueva_fecha_entrega_str != fecha_original:
-                        registros_df.at[registros_df.index[
-                            indice_seleccionado], 'Entrega acuerdo de compromiso'] = nueva_fecha_entrega_str
+                        asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                      'Entrega acuerdo de compromiso', nueva_fecha_entrega_str)
                         edited = True
 
                 with col3:
@@ -559,8 +607,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                         on_change=on_change_callback
                     )
                     if nuevo_acuerdo != row['Acuerdo de compromiso']:
-                        registros_df.at[
-                            registros_df.index[indice_seleccionado], 'Acuerdo de compromiso'] = nuevo_acuerdo
+                        asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                      'Acuerdo de compromiso', nuevo_acuerdo)
                         edited = True
 
                 # SECCIÓN 3: ANÁLISIS Y CRONOGRAMA
@@ -580,8 +628,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                         on_change=on_change_callback
                     )
                     if gestion_acceso != row['Gestion acceso a los datos y documentos requeridos ']:
-                        registros_df.at[registros_df.index[
-                            indice_seleccionado], 'Gestion acceso a los datos y documentos requeridos '] = gestion_acceso
+                        asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                      'Gestion acceso a los datos y documentos requeridos ', gestion_acceso)
                         edited = True
 
                 col1, col2, col3 = st.columns(3)
@@ -598,8 +646,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                             on_change=on_change_callback
                         )
                         if analisis_info != row['Análisis de información']:
-                            registros_df.at[
-                                registros_df.index[indice_seleccionado], 'Análisis de información'] = analisis_info
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Análisis de información', analisis_info)
                             edited = True
 
                 with col2:
@@ -614,8 +662,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                             on_change=on_change_callback
                         )
                         if cronograma_concertado != row['Cronograma Concertado']:
-                            registros_df.at[registros_df.index[
-                                indice_seleccionado], 'Cronograma Concertado'] = cronograma_concertado
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Cronograma Concertado', cronograma_concertado)
                             edited = True
 
                 with col3:
@@ -630,8 +678,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                             on_change=on_change_callback
                         )
                         if seguimiento_acuerdos != row['Seguimiento a los acuerdos']:
-                            registros_df.at[registros_df.index[
-                                indice_seleccionado], 'Seguimiento a los acuerdos'] = seguimiento_acuerdos
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Seguimiento a los acuerdos', seguimiento_acuerdos)
                             edited = True
 
                 # Fecha real de análisis y cronograma
@@ -655,8 +703,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                     # Actualizar el DataFrame si la fecha cambia
                     fecha_original = "" if pd.isna(row['Análisis y cronograma']) else row['Análisis y cronograma']
                     if nueva_fecha_analisis_str != fecha_original:
-                        registros_df.at[
-                            registros_df.index[indice_seleccionado], 'Análisis y cronograma'] = nueva_fecha_analisis_str
+                        asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                      'Análisis y cronograma', nueva_fecha_analisis_str)
                         edited = True
 
                 # Fecha de entrega de información y plazo de análisis
@@ -681,14 +729,12 @@ def mostrar_datos_completos_interactivo(registros_df):
                         'Fecha de entrega de información']
 
                     if nueva_fecha_entrega_info_str != fecha_original:
-                        registros_df.at[registros_df.index[
-                            indice_seleccionado], 'Fecha de entrega de información'] = nueva_fecha_entrega_info_str
+                        asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                      'Fecha de entrega de información', nueva_fecha_entrega_info_str)
                         edited = True
 
                         # Actualizar automáticamente todos los plazos
-                        registros_df = actualizar_plazo_analisis(registros_df)
-                        registros_df = actualizar_plazo_cronograma(registros_df)
-                        registros_df = actualizar_plazo_oficio_cierre(registros_df)
+                        registros_df = actualizar_plazos(registros_df)
 
                         # Guardar los datos actualizados inmediatamente para asegurarnos de que los cambios persistan
                         exito, mensaje = guardar_datos_editados(registros_df)
@@ -767,8 +813,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                         fecha_original = "" if pd.isna(row['Estándares (fecha programada)']) else row[
                             'Estándares (fecha programada)']
                         if nueva_fecha_estandares_prog_str != fecha_original:
-                            registros_df.at[registros_df.index[
-                                indice_seleccionado], 'Estándares (fecha programada)'] = nueva_fecha_estandares_prog_str
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Estándares (fecha programada)', nueva_fecha_estandares_prog_str)
                             edited = True
 
                 with col2:
@@ -792,29 +838,21 @@ def mostrar_datos_completos_interactivo(registros_df):
                     # En la sección de "Fecha de estándares (real)"
                     # Verificar si se ha introducido una fecha nueva en estándares
                     if nueva_fecha_estandares_str and nueva_fecha_estandares_str != fecha_original:
-                        # Verificar si todos los campos de estándares están completos
-                        campos_estandares = ['Registro (completo)', 'ET (completo)', 'CO (completo)', 'DD (completo)',
-                                             'REC (completo)', 'SERVICIO (completo)']
-                        todos_completos = True
-                        campos_incompletos = []
-
-                        for campo in campos_estandares:
-                            if campo in registros_df.columns and campo in registros_df.iloc[indice_seleccionado]:
-                                valor = str(registros_df.iloc[indice_seleccionado][campo]).strip()
-                                if valor.upper() != "COMPLETO":
-                                    todos_completos = False
-                                    campos_incompletos.append(campo)
+                        # Verificar si todos los campos de estándares están completos (regla 'Estándares')
+                        todos_completos, campos_incompletos = verificar_condiciones_estandares(
+                            registros_df.iloc[indice_seleccionado])
 
                         # Si no todos están completos, mostrar advertencia y no permitir el cambio
                         if not todos_completos:
                             st.error(
-                                f"No es posible diligenciar este campo. Verifique que todos los estándares se encuentren en estado Completo. Campos pendientes: {', '.join(campos_incompletos)}")
+                                f"{obtener_regla('Estándares')['mensaje']}. Campos pendientes: {', '.join(campos_incompletos)}")
                             # Mantener el valor original
-                            registros_df.at[registros_df.index[indice_seleccionado], 'Estándares'] = fecha_original
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Estándares', fecha_original)
                         else:
                             # Solo actualizar si todos los campos están completos
-                            registros_df.at[
-                                registros_df.index[indice_seleccionado], 'Estándares'] = nueva_fecha_estandares_str
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Estándares', nueva_fecha_estandares_str)
                             edited = True
 
                             # Guardar cambios inmediatamente sin más validaciones
@@ -837,8 +875,8 @@ def mostrar_datos_completos_interactivo(registros_df):
 
                     elif nueva_fecha_estandares_str != fecha_original:
                         # Si se está borrando la fecha, permitir el cambio
-                        registros_df.at[
-                            registros_df.index[indice_seleccionado], 'Estándares'] = nueva_fecha_estandares_str
+                        asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                      'Estándares', nueva_fecha_estandares_str)
                         edited = True
                         # Guardar cambios inmediatamente
                         registros_df = validar_reglas_negocio(registros_df)
@@ -867,7 +905,7 @@ def mostrar_datos_completos_interactivo(registros_df):
                     # Verificar si el campo existe en el registro
                     # Si no existe, crearlo para asegurar que se muestre
                     if campo not in registros_df.iloc[indice_seleccionado]:
-                        registros_df.at[registros_df.index[indice_seleccionado], campo] = "Sin iniciar"
+                        asignar_valor(registros_df, registros_df.index[indice_seleccionado], campo, "Sin iniciar")
 
                     # Obtener el valor actual directamente del DataFrame para asegurar que usamos el valor más reciente
                     valor_actual = registros_df.iloc[indice_seleccionado][campo] if pd.notna(
@@ -899,7 +937,7 @@ def mostrar_datos_completos_interactivo(registros_df):
 
                         # Actualizar el valor si ha cambiado
                         if nuevo_valor != valor_actual:
-                            registros_df.at[registros_df.index[indice_seleccionado], campo] = nuevo_valor
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado], campo, nuevo_valor)
                             edited = True
 
                             # Guardar cambios inmediatamente al modificar estándares
@@ -950,7 +988,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                                     on_change=on_change_callback
                                 )
                                 if nuevo_valor != valor_actual:
-                                    registros_df.at[registros_df.index[indice_seleccionado], campo] = nuevo_valor
+                                    asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                                  campo, nuevo_valor)
                                     edited = True
 
                 # SECCIÓN 5: PUBLICACIÓN
@@ -969,12 +1008,12 @@ def mostrar_datos_completos_interactivo(registros_df):
                             on_change=on_change_callback
                         )
                         if disponer_datos != row['Disponer datos temáticos']:
-                            registros_df.at[
-                                registros_df.index[indice_seleccionado], 'Disponer datos temáticos'] = disponer_datos
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Disponer datos temáticos', disponer_datos)
 
                             # Si se cambia a "No", limpiar la fecha de publicación
                             if disponer_datos.upper() == "NO" and 'Publicación' in registros_df.columns:
-                                registros_df.at[registros_df.index[indice_seleccionado], 'Publicación'] = ""
+                                asignar_valor(registros_df, registros_df.index[indice_seleccionado], 'Publicación', "")
                                 st.warning(
                                     "Se ha eliminado la fecha de publicación porque 'Disponer datos temáticos' se marcó como 'No'.")
 
@@ -1008,8 +1047,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                         fecha_original = "" if pd.isna(row['Fecha de publicación programada']) else row[
                             'Fecha de publicación programada']
                         if nueva_fecha_publicacion_prog_str != fecha_original:
-                            registros_df.at[registros_df.index[
-                                indice_seleccionado], 'Fecha de publicación programada'] = nueva_fecha_publicacion_prog_str
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Fecha de publicación programada', nueva_fecha_publicacion_prog_str)
                             edited = True
 
                 with col3:
@@ -1031,26 +1070,21 @@ def mostrar_datos_completos_interactivo(registros_df):
                     fecha_original = "" if pd.isna(row['Publicación']) else row['Publicación']
 
                     if nueva_fecha_publicacion_str and nueva_fecha_publicacion_str != fecha_original:
-                        # Verificar si Disponer datos temáticos está marcado como Si
-                        disponer_datos_tematicos = False
-                        if 'Disponer datos temáticos' in registros_df.iloc[indice_seleccionado]:
-                            valor = registros_df.iloc[indice_seleccionado]['Disponer datos temáticos']
-                            disponer_datos_tematicos = valor.upper() in ["SI", "SÍ", "YES", "Y"] if pd.notna(
-                                valor) else False
+                        # Verificar si Disponer datos temáticos está marcado como Si (regla 'Publicación')
+                        disponer_datos_tematicos = verificar_condicion_publicacion(registros_df.iloc[indice_seleccionado])
 
                         # Si no está marcado como Si, mostrar advertencia y no permitir el cambio
                         if not disponer_datos_tematicos:
-                            st.error(
-                                "No es posible diligenciar este campo. El campo 'Disponer datos temáticos' debe estar marcado como 'Si'")
+                            st.error(obtener_regla('Publicación')['mensaje'])
                             # No actualizar el valor en el DataFrame
                         else:
                             # Solo actualizar si cumple la condición
-                            registros_df.at[
-                                registros_df.index[indice_seleccionado], 'Publicación'] = nueva_fecha_publicacion_str
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Publicación', nueva_fecha_publicacion_str)
                             edited = True
 
                             # Recalcular el plazo de oficio de cierre inmediatamente
-                            registros_df = actualizar_plazo_oficio_cierre(registros_df)
+                            registros_df = actualizar_plazos(registros_df, ['Publicación'])
 
                             # Obtener el nuevo plazo calculado
                             nuevo_plazo_oficio = registros_df.iloc[indice_seleccionado][
@@ -1073,12 +1107,13 @@ def mostrar_datos_completos_interactivo(registros_df):
 
                     elif nueva_fecha_publicacion_str != fecha_original:
                         # Si se está borrando la fecha, permitir el cambio
-                        registros_df.at[
-                            registros_df.index[indice_seleccionado], 'Publicación'] = nueva_fecha_publicacion_str
+                        asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                      'Publicación', nueva_fecha_publicacion_str)
 
                         # Limpiar también el plazo de oficio de cierre
                         if 'Plazo de oficio de cierre' in registros_df.columns:
-                            registros_df.at[registros_df.index[indice_seleccionado], 'Plazo de oficio de cierre'] = ""
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Plazo de oficio de cierre', "")
 
                         edited = True
                         # Guardar cambios inmediatamente
@@ -1129,8 +1164,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                                 on_change=on_change_callback
                             )
                             if catalogo_recursos != row['Catálogo de recursos geográficos']:
-                                registros_df.at[registros_df.index[
-                                    indice_seleccionado], 'Catálogo de recursos geográficos'] = catalogo_recursos
+                                asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                              'Catálogo de recursos geográficos', catalogo_recursos)
                                 edited = True
 
                                 # Guardar y validar inmediatamente para detectar posibles cambios en fecha de oficio de cierre
@@ -1155,8 +1190,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                                 on_change=on_change_callback
                             )
                             if oficios_cierre != row['Oficios de cierre']:
-                                registros_df.at[
-                                    registros_df.index[indice_seleccionado], 'Oficios de cierre'] = oficios_cierre
+                                asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                              'Oficios de cierre', oficios_cierre)
                                 edited = True
 
                                 # Guardar y validar inmediatamente para detectar posibles cambios en fecha de oficio de cierre
@@ -1193,18 +1228,18 @@ def mostrar_datos_completos_interactivo(registros_df):
 
                                 # Si hay campos incompletos, mostrar advertencia y no permitir el cambio
                                 if not valido:
-                                    st.error(
-                                        "No es posible diligenciar la Fecha de oficio de cierre. Debe tener todos los campos Si/No en 'Si', todos los estándares completos, y todas las fechas diligenciadas y anteriores a la fecha de cierre.")
+                                    st.error(obtener_regla('Oficio de cierre')['mensaje'])
                                     # Mostrar los campos incompletos
                                     st.error(f"Campos incompletos: {', '.join(campos_incompletos)}")
                                     # NO actualizar el valor en el DataFrame para evitar validaciones recursivas
                                 else:
                                     # Solo actualizar si se cumplen todas las condiciones
-                                    registros_df.at[registros_df.index[
-                                        indice_seleccionado], 'Fecha de oficio de cierre'] = nueva_fecha_oficio_str
+                                    asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                                  'Fecha de oficio de cierre', nueva_fecha_oficio_str)
 
                                     # Actualizar Estado a "Completado"
-                                    registros_df.at[registros_df.index[indice_seleccionado], 'Estado'] = 'Completado'
+                                    asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                                  'Estado', 'Completado')
 
                                     edited = True
                                     # Guardar cambios sin recargar la página inmediatamente
@@ -1225,12 +1260,13 @@ def mostrar_datos_completos_interactivo(registros_df):
                             # Si se está borrando la fecha
                             elif nueva_fecha_oficio_str != fecha_original:
                                 # Permitir borrar la fecha y actualizar Estado a "En proceso"
-                                registros_df.at[registros_df.index[
-                                    indice_seleccionado], 'Fecha de oficio de cierre'] = nueva_fecha_oficio_str
+                                asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                              'Fecha de oficio de cierre', nueva_fecha_oficio_str)
 
                                 # Si se borra la fecha de oficio, cambiar estado a "En proceso"
                                 if registros_df.at[registros_df.index[indice_seleccionado], 'Estado'] == 'Completado':
-                                    registros_df.at[registros_df.index[indice_seleccionado], 'Estado'] = 'En proceso'
+                                    asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                                  'Estado', 'En proceso')
                                     st.info(
                                         "El estado ha sido cambiado a 'En proceso' porque se eliminó la fecha de oficio de cierre.")
 
@@ -1292,7 +1328,7 @@ def mostrar_datos_completos_interactivo(registros_df):
 
                         # Actualizar el estado si ha cambiado
                         if nuevo_estado != row['Estado']:
-                            registros_df.at[registros_df.index[indice_seleccionado], 'Estado'] = nuevo_estado
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado], 'Estado', nuevo_estado)
                             edited = True
 
                             # Guardar y validar inmediatamente sin recargar la página
@@ -1316,7 +1352,8 @@ def mostrar_datos_completos_interactivo(registros_df):
                             on_change=on_change_callback
                         )
                         if nueva_observacion != row['Observación']:
-                            registros_df.at[registros_df.index[indice_seleccionado], 'Observación'] = nueva_observacion
+                            asignar_valor(registros_df, registros_df.index[indice_seleccionado],
+                                          'Observación', nueva_observacion)
                             edited = True
 
                 # Mostrar botón de guardar si se han hecho cambios
@@ -1325,11 +1362,9 @@ def mostrar_datos_completos_interactivo(registros_df):
                         # Aplicar validaciones de reglas de negocio antes de guardar
                         registros_df = validar_reglas_negocio(registros_df)
 
-                        # Actualizar el plazo de análisis después de los cambios
-                        registros_df = actualizar_plazo_analisis(registros_df)
-
-                        # Actualizar el plazo de oficio de cierre después de los cambios
-                        registros_df = actualizar_plazo_oficio_cierre(registros_df)
+                        # Actualizar los plazos de análisis, cronograma y oficio de cierre después de los cambios
+                        registros_df = actualizar_plazos(registros_df,
+                                                         ['Fecha de entrega de información', 'Publicación'])
 
                         # Guardar los datos en el archivo
                         exito, mensaje = guardar_datos_editados(registros_df)
@@ -1362,7 +1397,7 @@ def mostrar_detalle_cronogramas(df_filtrado):
         return
 
     # Crear gráfico de barras apiladas por entidad y nivel de información
-    df_conteo = df_filtrado.groupby(['Entidad', 'Nivel Información ']).size().reset_index(name='Cantidad')
+    df_conteo = df_filtrado.groupby(['Entidad', 'Nivel Información '], observed=True).size().reset_index(name='Cantidad')
 
     fig_barras = px.bar(
         df_conteo,
@@ -1378,7 +1413,7 @@ def mostrar_detalle_cronogramas(df_filtrado):
     st.plotly_chart(fig_barras, use_container_width=True)
 
     # Crear gráfico de barras de porcentaje de avance por entidad
-    df_avance = df_filtrado.groupby('Entidad')['Porcentaje Avance'].mean().reset_index()
+    df_avance = df_filtrado.groupby('Entidad', observed=True)['Porcentaje Avance'].mean().reset_index()
     df_avance = df_avance.sort_values('Porcentaje Avance', ascending=False)
 
     fig_avance = px.bar(
@@ -1396,7 +1431,7 @@ def mostrar_detalle_cronogramas(df_filtrado):
 
     # ✅ Crear gráfico de registros completados por fecha (corregido)
     df_fechas = df_filtrado.copy()
-    df_fechas['Fecha'] = df_fechas['Publicación'].apply(procesar_fecha)
+    df_fechas['Fecha'] = obtener_fecha(df_fechas, 'Publicación')
     df_fechas = df_fechas[df_fechas['Fecha'].notna()]
 
     df_completados = df_fechas.groupby('Fecha').size().reset_index(name='Registros Completados')
@@ -1473,6 +1508,9 @@ def mostrar_exportar_resultados(df_filtrado):
     """Muestra opciones para exportar los resultados filtrados."""
     st.markdown('<div class="subtitle">Exportar Resultados</div>', unsafe_allow_html=True)
 
+    # Exportar solo las columnas originales (sin las columnas tipadas derivadas)
+    df_filtrado = sin_columnas_derivadas(df_filtrado)
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -1534,7 +1572,7 @@ def mostrar_diagnostico(registros_df, meta_df, metas_nuevas_df, metas_actualizar
         st.markdown("#### Análisis de Valores Faltantes")
 
         # Contar valores faltantes por columna
-        valores_faltantes = registros_df.isna().sum()
+        valores_faltantes = sin_columnas_derivadas(registros_df).isna().sum()
 
         # Crear dataframe para mostrar
         df_faltantes = pd.DataFrame({
@@ -1573,8 +1611,8 @@ def mostrar_diagnostico(registros_df, meta_df, metas_nuevas_df, metas_actualizar
         # Distribución de registros por entidad
         st.markdown("#### Distribución de Registros por Entidad")
 
-        # Contar registros por entidad
-        conteo_entidades = registros_df['Entidad'].value_counts().reset_index()
+        # Contar registros por entidad (sin las categorías que no tienen registros)
+        conteo_entidades = registros_df['Entidad'].value_counts()[lambda conteo: conteo > 0].reset_index()
         conteo_entidades.columns = ['Entidad', 'Cantidad']
 
         # Mostrar tabla y gráfico
@@ -1594,8 +1632,8 @@ def mostrar_diagnostico(registros_df, meta_df, metas_nuevas_df, metas_actualizar
         if 'Funcionario' in registros_df.columns:
             st.markdown("#### Distribución de Registros por Funcionario")
 
-            # Contar registros por funcionario
-            conteo_funcionarios = registros_df['Funcionario'].value_counts().reset_index()
+            # Contar registros por funcionario (sin las categorías que no tienen registros)
+            conteo_funcionarios = registros_df['Funcionario'].value_counts()[lambda conteo: conteo > 0].reset_index()
             conteo_funcionarios.columns = ['Funcionario', 'Cantidad']
 
             # Mostrar tabla y gráfico
@@ -1620,6 +1658,124 @@ def mostrar_diagnostico(registros_df, meta_df, metas_nuevas_df, metas_actualizar
         st.markdown("##### Metas para Registros a Actualizar")
         st.dataframe(metas_actualizar_df)
 
+        # Uso de las cachés de fechas (para ajustar TAMANO_CACHE_FECHAS)
+        st.markdown("#### Caché de Fechas")
+        st.dataframe(pd.DataFrame(estadisticas_cache_fechas()).T)
+
+
+def modo_por_bloques_activo():
+    """
+    Determina si el tablero trabaja en modo por bloques (solo indicadores agregados,
+    sin cargar todos los registros en memoria). Se activa por defecto cuando registros.csv
+    supera UMBRAL_MODO_BLOQUES y se suspende mientras se editan los registros completos.
+    """
+    tamano = os.path.getsize('registros.csv') if os.path.exists('registros.csv') else 0
+    modo_bloques = st.sidebar.checkbox(
+        "Modo por bloques (archivos grandes)",
+        value=tamano >= UMBRAL_MODO_BLOQUES,
+        help="Calcula las métricas leyendo registros.csv por bloques, sin cargar todos los registros."
+    )
+
+    if modo_bloques and st.session_state.get('registros_completos', False):
+        if st.sidebar.button("Volver al modo por bloques"):
+            st.session_state.registros_completos = False
+            st.rerun()
+        return False
+
+    return modo_bloques
+
+
+def seleccionar_fecha_corte():
+    """
+    Permite fijar en la barra lateral la fecha de corte de los cálculos que dependen de la fecha
+    (fechas vencidas, días hábiles restantes, hitos completados y meta más cercana).
+    Si no se fija, es el día de hoy. Retorna la fecha de corte (ver obtener_fecha_corte).
+    """
+    fijar = st.sidebar.checkbox(
+        "Fijar fecha de corte",
+        key="fijar_fecha_corte",
+        help="Calcula los vencimientos, los días hábiles restantes y el avance frente a las metas "
+             "a una fecha distinta de hoy."
+    )
+    if not fijar:
+        return obtener_fecha_corte()
+
+    fecha_corte = st.sidebar.date_input("Fecha de corte", value=date.today(), format="DD/MM/YYYY",
+                                        key="fecha_corte")
+    return obtener_fecha_corte(fecha_corte)
+
+
+def agregar_registros_validados(ruta, fecha_corte=None):
+    """Agrega los indicadores por bloques aplicando las reglas de negocio a cada bloque."""
+    return agregar_registros_por_bloques(ruta, preparar=validar_reglas_negocio, fecha_corte=fecha_corte)
+
+
+def mostrar_modo_por_bloques(fecha_corte=None):
+    """
+    Muestra el dashboard a partir de los indicadores agregados por bloques
+    (ver agregar_registros_por_bloques) a la fecha de corte. Los registros completos
+    solo se cargan cuando el usuario los solicita para editarlos.
+    """
+    if not os.path.exists('registros.csv'):
+        st.error("El archivo registros.csv no existe en el directorio actual.")
+        return
+
+    try:
+        agregados = cargar_con_cache('registros.csv', lambda ruta: agregar_registros_validados(ruta, fecha_corte),
+                                     clave='registros.csv (bloques)', version=fecha_corte)
+    except Exception as e:
+        st.error(f"Error al procesar el archivo registros.csv por bloques: {str(e)}")
+        return
+
+    st.success(f"Se han resumido {int(agregados['Registros'].sum())} registros de la base de datos (modo por bloques).")
+
+    # Filtros en la barra lateral (sobre los valores presentes en los indicadores agregados)
+    st.sidebar.markdown('<div class="subtitle">Filtros</div>', unsafe_allow_html=True)
+
+    entidades = ['Todas'] + sorted(agregados['Entidad'].unique().tolist())
+    entidad_seleccionada = st.sidebar.selectbox('Entidad', entidades)
+
+    funcionarios = ['Todos'] + sorted(agregados['Funcionario'].unique().tolist())
+    funcionario_seleccionado = st.sidebar.selectbox('Funcionario', funcionarios)
+
+    niveles_info = ['Todos'] + sorted(agregados['Nivel Información '].unique().tolist())
+    nivel_info_seleccionado = st.sidebar.selectbox('Nivel de Información', niveles_info)
+
+    if entidad_seleccionada != 'Todas':
+        agregados = agregados[agregados['Entidad'] == entidad_seleccionada]
+    if funcionario_seleccionado != 'Todos':
+        agregados = agregados[agregados['Funcionario'] == funcionario_seleccionado]
+    if nivel_info_seleccionado != 'Todos':
+        agregados = agregados[agregados['Nivel Información '] == nivel_info_seleccionado]
+
+    # Métricas generales
+    total_registros = int(agregados['Registros'].sum())
+    avance_promedio = agregados['Suma Avance'].sum() / total_registros if total_registros > 0 else float('nan')
+    mostrar_metricas_generales(total_registros, avance_promedio, int(agregados['Completados'].sum()))
+
+    st.info(f"Registros con fechas vencidas: {int(agregados['Vencidos'].sum())} | "
+            f"Registros con fechas próximas a vencer: {int(agregados['Proximos'].sum())}")
+
+    # Comparación con metas
+    meta_df = cargar_metas()
+    if meta_df.empty:
+        st.warning("No se pudieron cargar datos de metas. El archivo meta.csv debe existir en el directorio.")
+    else:
+        metas_nuevas_df, metas_actualizar_df = procesar_metas(meta_df, 'meta.csv')
+        tipo_dato = agregados['TipoDato'].str.upper()
+        completados_nuevos = agregados.loc[tipo_dato == 'NUEVO', list(HITOS)].sum().astype(int).to_dict()
+        completados_actualizar = agregados.loc[tipo_dato == 'ACTUALIZAR', list(HITOS)].sum().astype(int).to_dict()
+        mostrar_comparacion_metas(*comparar_completados_con_metas(
+            completados_nuevos, completados_actualizar, metas_nuevas_df, metas_actualizar_df, fecha_corte))
+
+    # Edición bajo demanda: se cargan los registros completos
+    st.markdown('<div class="subtitle">Edición de Registros</div>', unsafe_allow_html=True)
+    st.info("En el modo por bloques no se cargan todos los registros. "
+            "Para ver el detalle o editarlos, cargue los registros completos.")
+    if st.button("Cargar registros completos para edición"):
+        st.session_state.registros_completos = True
+        st.rerun()
+
 
 # Función para mostrar la sección de ayuda
 def mostrar_ayuda():
@@ -1700,8 +1856,20 @@ def main():
         </div>
         """, unsafe_allow_html=True)
 
-        # Cargar datos
-        registros_df, meta_df = cargar_datos()
+        # Fecha de corte de los cálculos que dependen de la fecha (por defecto, hoy)
+        fecha_corte = seleccionar_fecha_corte()
+
+        # En modo por bloques solo se calculan los indicadores agregados
+        if modo_por_bloques_activo():
+            mostrar_modo_por_bloques(fecha_corte)
+            mostrar_ayuda()
+            return
+
+        # Cargar datos: todas las columnas solo si se está editando; si no, las del tablero
+        edicion_abierta = st.session_state.get('vista_datos') == VISTAS_DATOS[1]
+        columnas_cargadas = None if edicion_abierta else COLUMNAS_TABLERO
+        registros_df, meta_df = cargar_datos(columnas_cargadas)
+        plazos_cargados = registros_df[COLUMNAS_PLAZOS].copy()
 
         # Asegurar que las columnas requeridas existan
         columnas_requeridas = ['Cod', 'Entidad', 'TipoDato', 'Acuerdo de compromiso',
@@ -1713,13 +1881,23 @@ def main():
             if columna not in registros_df.columns:
                 registros_df[columna] = ''
 
-        # Actualizar automáticamente todos los plazos
-        registros_df = actualizar_plazo_analisis(registros_df)
-        registros_df = actualizar_plazo_cronograma(registros_df)
-        registros_df = actualizar_plazo_oficio_cierre(registros_df)
-
-        # Guardar los datos actualizados inmediatamente
-        exito, mensaje = guardar_datos_editados(registros_df)
+        # Actualizar automáticamente todos los plazos (una sola vez por versión del archivo y, si solo
+        # se agregaron filas al final, solo para las nuevas)
+        registros_df = actualizar_plazos_con_cache(registros_df, 'registros.csv')
+
+        # Guardar los datos actualizados inmediatamente. Si solo cambiaron los plazos de las filas
+        # agregadas al final del archivo, solo se reescriben esas filas; si no, con columnas
+        # parciales se guardan solo los plazos (y solo si cambiaron)
+        exito, mensaje = True, ""
+        plazos_cambiados = filas_distintas(registros_df, plazos_cargados, COLUMNAS_PLAZOS)
+        inicio_filas_agregadas = filas_agregadas('registros.csv', clave_registros(columnas_cargadas))
+        if (plazos_cambiados.any() and inicio_filas_agregadas is not None
+                and not plazos_cambiados[:inicio_filas_agregadas['filas']].any()):
+            exito, mensaje = guardar_filas_agregadas(registros_df, COLUMNAS_PLAZOS, inicio_filas_agregadas)
+        elif edicion_abierta:
+            exito, mensaje = guardar_datos_editados(registros_df)
+        elif plazos_cambiados.any():
+            exito, mensaje = guardar_columnas_editadas(registros_df, COLUMNAS_PLAZOS)
         if not exito:
             st.warning(f"No se pudieron guardar los plazos actualizados: {mensaje}")
 
@@ -1760,8 +1938,14 @@ def main():
         #if st.checkbox("Mostrar columnas cargadas", value=False):
         #    st.write("Columnas en registros_df:", list(registros_df.columns))
 
-        # Aplicar validaciones de reglas de negocio
-        registros_df = validar_reglas_negocio(registros_df)
+        # Fechas de origen de los plazos antes de las validaciones (que pueden borrar la publicación)
+        origenes_plazos = [campo for campo in CAMPOS_ORIGEN_PLAZOS if campo in registros_df.columns]
+        fechas_antes = {campo: obtener_fecha(registros_df, campo) for campo in origenes_plazos}
+
+        # Aplicar validaciones de reglas de negocio (una sola vez por versión del archivo y, si solo se
+        # agregaron filas al final, solo para las nuevas)
+        registros_sin_validar = registros_df
+        registros_df = validar_reglas_negocio_con_cache(registros_df, ruta='registros.csv')
 
         # Mostrar estado de validaciones
         with st.expander("Validación de Reglas de Negocio"):
@@ -1775,16 +1959,34 @@ def main():
             5. Para introducir una fecha en 'Fecha de oficio de cierre', todos los campos Si/No deben estar marcados como 'Si', todos los estándares deben estar 'Completo' y todas las fechas diligenciadas.
             6. Al introducir una fecha en 'Fecha de oficio de cierre', el campo 'Estado' se actualizará automáticamente a 'Completado'.
             """)
-            mostrar_estado_validaciones(registros_df, st)
-
-        # Actualizar automáticamente el plazo de análisis
-        registros_df = actualizar_plazo_analisis(registros_df)
-
-        # Actualizar automáticamente el plazo de oficio de cierre
-        registros_df = actualizar_plazo_oficio_cierre(registros_df)
+            # El reporte solo se calcula al solicitarlo y se reutiliza mientras el archivo no cambie. Se
+            # calcula sobre los registros del archivo: ya corregidos, todos cumplen las reglas
+            if st.checkbox("Mostrar registros inconsistentes y correcciones automáticas", key="ver_validaciones"):
+                mostrar_estado_validaciones(registros_sin_validar, st, ruta='registros.csv')
+                mostrar_cronologia_hitos(registros_sin_validar, st, ruta='registros.csv')
+
+                # Celdas corregidas y regla que las corrigió
+                cambios_reglas = cambios_reglas_negocio(registros_sin_validar, registros_df)
+                if not cambios_reglas.empty:
+                    st.markdown("### Correcciones Automáticas")
+                    st.warning(f"Las reglas de negocio corrigieron {len(cambios_reglas)} valores al cargar los "
+                               "datos (los cambios se guardan al editar los registros).")
+                    st.dataframe(cambios_reglas.groupby(['Regla', 'Campo'], sort=False).size()
+                                 .reset_index(name='Valores corregidos'))
+                    st.dataframe(cambios_reglas)
+
+        # Recalcular solo los plazos cuyas fechas de origen cambiaron con las validaciones. Una fecha
+        # borrada no cambia el plazo (solo se calcula para las filas con fecha), así que no cuenta
+        origenes_cambiados = []
+        for campo in origenes_plazos:
+            fechas = obtener_fecha(registros_df, campo)
+            if (fechas.notna() & fechas.ne(fechas_antes[campo])).any():
+                origenes_cambiados.append(campo)
+        if origenes_cambiados:
+            registros_df = actualizar_plazos(registros_df, origenes_cambiados)
 
         # Procesar las metas
-        metas_nuevas_df, metas_actualizar_df = procesar_metas(meta_df)
+        metas_nuevas_df, metas_actualizar_df = procesar_metas(meta_df, 'meta.csv')
 
         # Asegurar que las columnas requeridas existan
         columnas_requeridas = ['Cod', 'Entidad', 'TipoDato', 'Acuerdo de compromiso',
@@ -1799,13 +2001,18 @@ def main():
         # Convertir columnas de texto a mayúsculas para facilitar comparaciones
         columnas_texto = ['TipoDato', 'Acuerdo de compromiso']
         for columna in columnas_texto:
-            registros_df[columna] = registros_df[columna].astype(str)
+            # Las columnas categóricas (ver CAMPOS_CATEGORICOS) ya contienen texto y se mantienen así
+            if not isinstance(registros_df[columna].dtype, pd.CategoricalDtype):
+                registros_df[columna] = registros_df[columna].astype(str)
 
         # Agregar columna de porcentaje de avance
-        registros_df['Porcentaje Avance'] = registros_df.apply(calcular_porcentaje_avance, axis=1)
+        registros_df['Porcentaje Avance'] = calcular_porcentaje_avance_df(registros_df)
 
-        # Agregar columna de estado de fechas
-        registros_df['Estado Fechas'] = registros_df.apply(verificar_estado_fechas, axis=1)
+        # Agregar el estado de fechas y los días hábiles restantes (o de retraso) de las fechas
+        # programadas y los plazos, calculados una vez por versión de los datos y fecha de corte
+        indicadores_fecha = indicadores_fecha_corte_df(registros_df, fecha_corte, 'registros.csv')
+        for columna in indicadores_fecha.columns:
+            registros_df[columna] = indicadores_fecha[columna]
 
         # Filtros en la barra lateral
         st.sidebar.markdown('<div class="subtitle">Filtros</div>', unsafe_allow_html=True)
@@ -1826,6 +2033,13 @@ def main():
             niveles_info += sorted(registros_df['Nivel Información '].dropna().unique().tolist())
         nivel_info_seleccionado = st.sidebar.selectbox('Nivel de Información', niveles_info)
 
+        # Filtro por cronología de los hitos: registros con fechas fuera de orden (todas o un par)
+        cronologia = violaciones_cronologia(registros_df)
+        opciones_cronologia = {'Todos': 0, 'Con fechas fuera de orden': -1}
+        for par in pares_fuera_de_orden(cronologia):
+            opciones_cronologia[describir_par(par)] = bits_pares([par])
+        cronologia_seleccionada = st.sidebar.selectbox('Cronología de hitos', list(opciones_cronologia))
+
         # Aplicar filtros
         df_filtrado = registros_df.copy()
 
@@ -1838,11 +2052,15 @@ def main():
         if nivel_info_seleccionado != 'Todos' and 'Nivel Información ' in df_filtrado.columns:
             df_filtrado = df_filtrado[df_filtrado['Nivel Información '] == nivel_info_seleccionado]
 
+        if cronologia_seleccionada != 'Todos':
+            bits = opciones_cronologia[cronologia_seleccionada]
+            df_filtrado = df_filtrado[(cronologia.loc[df_filtrado.index] & bits) != 0]
+
         # Crear pestañas
         tab1, tab2 = st.tabs(["Dashboard", "Datos Completos"])
 
         with tab1:
-            mostrar_dashboard(df_filtrado, metas_nuevas_df, metas_actualizar_df, registros_df)
+            mostrar_dashboard(df_filtrado, metas_nuevas_df, metas_actualizar_df, registros_df, fecha_corte)
 
         with tab2:
             registros_df = mostrar_datos_completos_interactivo(registros_df)
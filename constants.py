@@ -75,3 +75,248 @@ COLORES_HITOS = {
 
 # Días de alerta para fechas próximas a vencer
 DIAS_ALERTA = 30
+
+# Valores que se consideran "Si" en los campos Si/No
+VALORES_SI = ['SI', 'SÍ', 'S', 'YES', 'Y']
+VALORES_NO = ['NO', 'N']
+
+# Esquema de tipos de registros.csv. Las columnas originales se conservan como texto
+# (para guardar el archivo sin cambios) y al cargar se agregan columnas derivadas tipadas
+# cuyo nombre lleva uno de estos sufijos. Las columnas derivadas nunca se guardan.
+SUFIJO_FECHA = ' [fecha]'
+SUFIJO_BOOL = ' [bool]'
+SUFIJO_DIAS_HABILES = ' [días hábiles]'
+
+# Versión del esquema de los registros procesados. Se guarda en el snapshot Parquet (ver
+# data_utils.leer_snapshot), que se descarta si fue generado con otra versión: se debe incrementar
+# al cambiar aplicar_esquema, la conversión de fechas, los festivos o CAMPOS_CATEGORICOS
+VERSION_ESQUEMA = 1
+
+# Campos de fecha de los registros: fechas reales de los hitos, fechas programadas y plazos
+CAMPOS_FECHA_REGISTRO = list(CAMPOS_FECHA.keys()) + list(CAMPOS_FECHA.values()) + [
+    'Suscripción acuerdo de compromiso',
+    'Entrega acuerdo de compromiso',
+    'Fecha de entrega de información',
+    'Plazo de análisis',
+    'Plazo de cronograma',
+    'Plazo de oficio de cierre',
+    'Fecha de oficio de cierre'
+]
+
+# Campos de estado de los estándares (con sufijo completo)
+CAMPOS_COMPLETO = [
+    'Registro (completo)',
+    'ET (completo)',
+    'CO (completo)',
+    'DD (completo)',
+    'REC (completo)',
+    'SERVICIO (completo)'
+]
+
+# Opciones de estado de los estándares
+ESTADOS_ESTANDAR = ['Sin iniciar', 'En proceso', 'Completo']
+
+# Campos con opciones 'Si' o 'No'
+CAMPOS_SI_NO = [
+    'Actas de acercamiento y manifestación de interés',
+    'Acuerdo de compromiso',
+    'Gestion acceso a los datos y documentos requeridos ',
+    'Análisis de información',
+    'Cronograma Concertado',
+    'Seguimiento a los acuerdos',
+    'Resultados de orientación técnica',
+    'Verificación del servicio web geográfico',
+    'Verificar Aprobar Resultados',
+    'Revisar y validar los datos cargados en la base de datos',
+    'Aprobación resultados obtenidos en la rientación',
+    'Disponer datos temáticos',
+    'Catálogo de recursos geográficos',
+    'Oficios de cierre'
+]
+
+# Condiciones para diligenciar la fecha de oficio de cierre: campos Si/No que deben estar en 'Si'
+# y campos de fecha que deben estar diligenciados (y no ser posteriores al oficio de cierre)
+CAMPOS_SI_NO_OFICIO_CIERRE = [
+    'Acuerdo de compromiso',
+    'Análisis de información',
+    'Cronograma Concertado',
+    'Seguimiento a los acuerdos',
+    'Disponer datos temáticos',
+    'Catálogo de recursos geográficos',
+    'Oficios de cierre'
+]
+CAMPOS_FECHA_OFICIO_CIERRE = [
+    'Análisis y cronograma',
+    'Estándares',
+    'Publicación',
+    'Fecha de entrega de información'
+]
+REQUISITOS_OFICIO_CIERRE = (
+    [('si', campo) for campo in CAMPOS_SI_NO_OFICIO_CIERRE] +
+    [('completo', campo) for campo in CAMPOS_COMPLETO] +
+    [('valor', campo) for campo in CAMPOS_FECHA_OFICIO_CIERRE] +
+    [('hasta', campo, 'Fecha de oficio de cierre') for campo in CAMPOS_FECHA_OFICIO_CIERRE]
+)
+
+# Orden cronológico de las fechas reales de los hitos: las fechas fuera de orden se informan y se
+# pueden filtrar en el tablero, pero no se corrigen (ver violaciones_cronologia en validaciones_utils)
+CRONOLOGIA_HITOS = [
+    'Suscripción acuerdo de compromiso',
+    'Entrega acuerdo de compromiso',
+    'Fecha de entrega de información',
+    'Análisis y cronograma',
+    'Estándares',
+    'Publicación',
+    'Fecha de oficio de cierre'
+]
+
+# Reglas de negocio de los registros (ver validaciones_utils). Cada regla declara:
+# - nombre: identificador de la regla (en el reporte de inconsistencias y en el editor)
+# - condicion: predicados que deben cumplirse todos para que la regla aplique al registro
+# - requisitos: predicados que debe cumplir el registro cuando la regla aplica; si alguno
+#   falla, el registro incumple la regla
+# - accion: (campo, valor) que se asigna a los registros que incumplen la regla para corregirlos
+# - mensaje: texto que se muestra al usuario cuando un registro incumple la regla
+# Las reglas se evalúan en orden de dependencias (una regla después de las que modifican los
+# campos que lee); entre reglas que dependen unas de otras en ciclo, la declarada primero tiene
+# prioridad (por ejemplo, 'Disponer datos temáticos' en 'No' prevalece sobre la fecha de publicación).
+# Los predicados son tuplas (tipo, campo[, argumento]):
+# - 'valor' / 'vacio': el campo está (o no está) diligenciado
+# - 'fecha': el campo tiene una fecha válida
+# - 'si' / 'no': el campo es 'Si' (VALORES_SI) o 'No' (VALORES_NO)
+# - 'completo': el campo (completo) está 'Completo'
+# - 'igual': el campo es igual al argumento
+# - 'hasta': la fecha del campo no es posterior a la del campo del argumento (si ambas existen)
+# - 'alguno': se cumple alguno de los predicados que siguen al tipo
+REGLAS_VALIDACION = [
+    {
+        'nombre': 'Acuerdo de compromiso',
+        'condicion': [('alguno', ('valor', 'Suscripción acuerdo de compromiso'),
+                       ('valor', 'Entrega acuerdo de compromiso'))],
+        'requisitos': [('si', 'Acuerdo de compromiso')],
+        'accion': ('Acuerdo de compromiso', 'Si'),
+        'mensaje': "Si hay suscripción o entrega del acuerdo de compromiso, 'Acuerdo de compromiso' "
+                   "debe estar marcado como 'Si'."
+    },
+    {
+        'nombre': 'Análisis de información',
+        'condicion': [('fecha', 'Análisis y cronograma')],
+        'requisitos': [('si', 'Análisis de información')],
+        'accion': ('Análisis de información', 'Si'),
+        'mensaje': "Si 'Análisis y cronograma' tiene fecha, 'Análisis de información' debe estar marcado como 'Si'."
+    },
+    {
+        'nombre': 'Cronograma concertado',
+        'condicion': [('fecha', 'Análisis y cronograma')],
+        'requisitos': [('si', 'Cronograma Concertado')],
+        'accion': ('Cronograma Concertado', 'Si'),
+        'mensaje': "Si 'Análisis y cronograma' tiene fecha, 'Cronograma Concertado' debe estar marcado como 'Si'."
+    },
+    {
+        'nombre': 'Estándares',
+        'condicion': [('fecha', 'Estándares')],
+        'requisitos': [('completo', campo) for campo in CAMPOS_COMPLETO],
+        'accion': ('Estándares', ''),
+        'mensaje': "No es posible diligenciar este campo. Verifique que todos los estándares se encuentren "
+                   "en estado Completo"
+    },
+    {
+        'nombre': 'Disponer datos temáticos',
+        'condicion': [('no', 'Disponer datos temáticos')],
+        'requisitos': [('vacio', 'Publicación')],
+        'accion': ('Publicación', ''),
+        'mensaje': "Si 'Disponer datos temáticos' está marcado como 'No', no debe tener fecha de publicación. "
+                   "Se borrará la fecha."
+    },
+    {
+        'nombre': 'Publicación',
+        'condicion': [('fecha', 'Publicación')],
+        'requisitos': [('si', 'Disponer datos temáticos')],
+        'accion': ('Disponer datos temáticos', 'Si'),
+        'mensaje': "No es posible diligenciar este campo. El campo 'Disponer datos temáticos' debe estar "
+                   "marcado como 'Si'"
+    },
+    {
+        'nombre': 'Oficio de cierre',
+        'condicion': [('fecha', 'Fecha de oficio de cierre')],
+        'requisitos': REQUISITOS_OFICIO_CIERRE,
+        'accion': ('Fecha de oficio de cierre', ''),
+        'mensaje': "No es posible diligenciar la Fecha de oficio de cierre. Debe tener todos los campos Si/No "
+                   "en 'Si', todos los estándares completos, y todas las fechas diligenciadas y anteriores a "
+                   "la fecha de cierre."
+    },
+    {
+        'nombre': 'Estado completado',
+        'condicion': [('fecha', 'Fecha de oficio de cierre')] + REQUISITOS_OFICIO_CIERRE,
+        'requisitos': [('igual', 'Estado', 'Completado')],
+        'accion': ('Estado', 'Completado'),
+        'mensaje': "Con una fecha de oficio de cierre válida, el Estado debe ser 'Completado'."
+    },
+    {
+        'nombre': 'Estado sin oficio de cierre',
+        'condicion': [('igual', 'Estado', 'Completado')],
+        'requisitos': [('fecha', 'Fecha de oficio de cierre')] + REQUISITOS_OFICIO_CIERRE,
+        'accion': ('Estado', 'En proceso'),
+        'mensaje': "No es posible establecer el estado como 'Completado' sin una fecha de oficio de cierre "
+                   "válida. El Estado se cambiará a 'En proceso'."
+    },
+]
+
+# Columnas categóricas (pocos valores que se repiten en todos los registros) y sus categorías base
+CAMPOS_CATEGORICOS = {
+    'Entidad': [],
+    'Funcionario': [],
+    'Nivel Información ': [],
+    'TipoDato': ['Nuevo', 'Actualizar'],
+    'Estado': ['', 'En proceso', 'En proceso oficio de cierre', 'Completado', 'Finalizado']
+}
+
+# Modo de agregación por bloques para archivos de registros muy grandes:
+# número de filas leídas por bloque y tamaño del archivo (bytes) a partir del cual se activa por defecto
+TAMANO_BLOQUE = 50000
+UMBRAL_MODO_BLOQUES = 50 * 1024 * 1024
+
+# Columnas de los filtros del tablero, por las que se agrupan los indicadores en el modo por bloques
+COLUMNAS_AGRUPACION = ['Entidad', 'Funcionario', 'Nivel Información ', 'TipoDato']
+
+# Columnas de registros.csv que usan el tablero, la vista de tabla, las exportaciones, el diagnóstico,
+# los plazos y las reglas de negocio. Las demás solo se cargan al abrir la edición de registros.
+COLUMNAS_TABLERO = [
+    'Cod', 'Funcionario', 'Entidad', 'Nivel Información ', 'Frecuencia actualizacion ', 'TipoDato',
+    'Suscripción acuerdo de compromiso', 'Entrega acuerdo de compromiso', 'Acuerdo de compromiso',
+    'Análisis de información', 'Cronograma Concertado', 'Análisis y cronograma (fecha programada)',
+    'Fecha de entrega de información', 'Plazo de análisis', 'Plazo de cronograma', 'Análisis y cronograma',
+    'Seguimiento a los acuerdos', 'Estándares (fecha programada)'
+] + CAMPOS_COMPLETO + [
+    'Estándares', 'Disponer datos temáticos', 'Fecha de publicación programada', 'Publicación',
+    'Catálogo de recursos geográficos', 'Plazo de oficio de cierre', 'Oficios de cierre',
+    'Fecha de oficio de cierre', 'Estado', 'Observación'
+]
+
+# Reglas de plazos: (campo de origen, días hábiles, plazo calculado). El plazo es la fecha que
+# resulta de sumar los días hábiles a la fecha del campo de origen, que puede ser otro plazo
+# (ver fecha_utils.actualizar_plazos, que evalúa las reglas en orden de dependencias)
+REGLAS_PLAZOS = [
+    ('Fecha de entrega de información', 5, 'Plazo de análisis'),
+    ('Plazo de análisis', 3, 'Plazo de cronograma'),
+    ('Publicación', 7, 'Plazo de oficio de cierre'),
+]
+
+# Columnas calculadas por los plazos (se guardan aunque se haya cargado solo COLUMNAS_TABLERO)
+COLUMNAS_PLAZOS = [plazo for _, _, plazo in REGLAS_PLAZOS]
+
+# Campos de los que dependen los plazos: si cambian, hay que recalcular los plazos afectados
+CAMPOS_ORIGEN_PLAZOS = [origen for origen, _, _ in REGLAS_PLAZOS]
+
+# Fechas programadas de los hitos y plazos para los que se calculan los días hábiles restantes
+# (negativos si la fecha ya venció). Se calculan al cargar y no se guardan (SUFIJO_DIAS_HABILES)
+CAMPOS_DIAS_HABILES = list(CAMPOS_FECHA.values()) + COLUMNAS_PLAZOS
+
+# Rango de años de las fechas con las que se calculan días hábiles (plazos y días restantes). Las
+# fechas fuera del rango (por ejemplo 31/12/9999 como "sin plazo", o años mal digitados) no se
+# calculan, para no construir calendarios de festivos de miles de años ni pasar del año 9999
+ANIO_MINIMO_HABILES = 1900
+ANIO_MAXIMO_HABILES = 2199
+
+# Número máximo de textos de fecha distintos que se guardan en las cachés de fechas (ver fecha_utils)
+TAMANO_CACHE_FECHAS = 4096
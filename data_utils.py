@@ -1,38 +1,34 @@
 import pandas as pd
 import numpy as np
-import io
 import re
+import io
 import os
+import json
+import hashlib
+import threading
 import streamlit as st
 from datetime import datetime, timedelta
-from constants import REGISTROS_DATA, META_DATA
-
-
-def normalizar_csv(contenido, separador=';'):
-    """Normaliza el contenido de un CSV para asegurar mismo número de columnas."""
-    lineas = contenido.split('\n')
-    if not lineas:
-        return contenido
+from constants import (
+    VALORES_SI, SUFIJO_FECHA, SUFIJO_BOOL, SUFIJO_DIAS_HABILES, CAMPOS_DIAS_HABILES,
+    CAMPOS_FECHA, CAMPOS_FECHA_REGISTRO, CAMPOS_COMPLETO, CAMPOS_SI_NO, ESTADOS_ESTANDAR,
+    CAMPOS_CATEGORICOS, HITOS, TAMANO_BLOQUE, COLUMNAS_AGRUPACION, COLUMNAS_TABLERO, COLUMNAS_PLAZOS,
+    VERSION_ESQUEMA, DIAS_ALERTA
+)
+from fecha_utils import (procesar_fecha, procesar_fechas_series, formatear_fechas_series,
+                         actualizar_columna_fecha, fecha_fila, obtener_fecha, actualizar_plazos,
+                         dias_habiles_restantes, obtener_fecha_corte)
 
-    # Determinar el número de columnas a partir de la primera línea
-    columnas = lineas[0].count(separador) + 1
+# pyarrow es opcional: sin él no se usa la copia binaria y se lee siempre el CSV
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
 
-    lineas_normalizadas = []
-    for linea in lineas:
-        if not linea.strip():  # Ignorar líneas vacías
-            continue
 
-        campos = linea.split(separador)
-        if len(campos) < columnas:
-            # Añadir campos vacíos faltantes
-            linea = linea + separador * (columnas - len(campos))
-        elif len(campos) > columnas:
-            # Recortar campos excedentes
-            linea = separador.join(campos[:columnas])
-
-        lineas_normalizadas.append(linea)
-
-    return '\n'.join(lineas_normalizadas)
+# Caracteres de control que se eliminan de los valores leídos
+PATRON_CONTROL = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
 
 
 def limpiar_valor(valor):
@@ -44,13 +40,372 @@ def limpiar_valor(valor):
     valor = str(valor)
 
     # Eliminar caracteres problemáticos
-    valor = re.sub(r'[\000-\010]|[\013-\014]|[\016-\037]', '', valor)
+    valor = PATRON_CONTROL.sub('', valor)
 
     return valor.strip()
 
 
-def cargar_datos():
-    """Carga los datos desde archivos CSV. No usa datos de ejemplo."""
+def limpiar_columna(serie):
+    """Versión vectorizada de limpiar_valor para una columna completa."""
+    # Se usa la misma expresión que PATRON_CONTROL, pero como texto: con columnas de texto de
+    # pyarrow, pandas aplica un patrón de texto en el motor de expresiones de pyarrow sobre toda
+    # la columna, mientras que un re.Pattern compilado se aplica valor por valor con re
+    # (unas tres veces más lento)
+    return (serie.fillna('').astype(str)
+            .str.replace(PATRON_CONTROL.pattern, '', regex=True)
+            .str.strip())
+
+
+# Caché de archivos cargados: clave -> (firma del archivo, DataFrame procesado, estado de la lectura)
+_cache_archivos = {}
+_cache_lock = threading.Lock()
+
+
+def firma_archivo(ruta):
+    """Retorna la firma (tamaño, fecha de modificación) de un archivo, o None si no existe."""
+    try:
+        info = os.stat(ruta)
+    except OSError:
+        return None
+    return info.st_size, info.st_mtime_ns
+
+
+def huella_prefijo(ruta, longitud):
+    """Hash de los primeros `longitud` bytes de un archivo (para detectar si solo se agregaron filas)."""
+    huella = hashlib.blake2b(digest_size=16)
+    with open(ruta, 'rb') as f:
+        restante = longitud
+        while restante > 0:
+            bloque = f.read(min(restante, 1 << 20))
+            if not bloque:
+                break
+            huella.update(bloque)
+            restante -= len(bloque)
+    return huella.hexdigest()
+
+
+def estado_lectura(ruta, firma, df):
+    """
+    Estado de la última lectura completa de un archivo: bytes leídos, número de filas,
+    hash de su contenido y si termina en salto de línea (solo entonces se pueden
+    leer filas agregadas al final sin releer el archivo).
+    """
+    with open(ruta, 'rb') as f:
+        f.seek(max(firma[0] - 1, 0))
+        termina_en_salto = f.read(1) == b'\n'
+    return {'bytes': firma[0], 'filas': len(df), 'huella': huella_prefijo(ruta, firma[0]),
+            'termina_en_salto': termina_en_salto}
+
+
+def solo_filas_agregadas(ruta, firma, estado, df):
+    """Verifica si el archivo solo creció con filas nuevas al final desde la última lectura."""
+    return (firma is not None and estado is not None and estado['termina_en_salto']
+            and firma[0] > estado['bytes'] and len(df) == estado['filas']
+            and huella_prefijo(ruta, estado['bytes']) == estado['huella'])
+
+
+def cargar_con_cache(ruta, lector, clave=None, lector_cola=None, version=None):
+    """
+    Carga un archivo con la función lector reutilizando el resultado anterior
+    mientras el tamaño y la fecha de modificación del archivo no cambien.
+    La clave permite guardar varios resultados distintos del mismo archivo (por defecto, la ruta).
+    Si se indica lector_cola(ruta, df_anterior, desde_byte) y el archivo solo creció con filas
+    nuevas al final (el contenido anterior no cambió), solo se procesan las filas agregadas.
+    Lo mismo si solo se reescribieron las filas agregadas en la última lectura (por ejemplo, al
+    guardar sus plazos, ver guardar_filas_agregadas): se vuelven a procesar solo esas filas.
+    version identifica otros datos de los que depende el resultado (por ejemplo, la fecha de
+    corte): si cambia, el resultado se vuelve a calcular aunque el archivo no haya cambiado.
+    No se combina con lector_cola.
+    Retorna una copia para que las modificaciones del llamador no alteren la caché.
+    """
+    clave = ruta if clave is None else clave
+    firma = firma_archivo(ruta) if version is None else (firma_archivo(ruta), version)
+    with _cache_lock:
+        entrada = _cache_archivos.get(clave)
+    if entrada is not None and entrada[0] == firma:
+        return entrada[1].copy()
+
+    df = None
+    estado_cola = None
+    if lector_cola is not None and entrada is not None and entrada[2] is not None:
+        _, df_anterior, estado = entrada
+        anterior = estado.get('anterior')
+        try:
+            if solo_filas_agregadas(ruta, firma, estado, df_anterior):
+                estado_cola = estado
+            elif anterior is not None and solo_filas_agregadas(ruta, firma, anterior,
+                                                               df_anterior.iloc[:anterior['filas']]):
+                # Las filas agregadas en la última lectura se reescribieron: se leen de nuevo desde su inicio
+                estado_cola, df_anterior = anterior, df_anterior.iloc[:anterior['filas']]
+            if estado_cola is not None:
+                df = lector_cola(ruta, df_anterior, estado_cola['bytes'])
+        except Exception:
+            # Ante cualquier problema se vuelve a leer el archivo completo
+            df, estado_cola = None, None
+    if df is None:
+        df = lector(ruta)
+
+    estado = None
+    if lector_cola is not None and firma is not None:
+        # Si el archivo cambió durante la lectura no se guarda estado (la próxima lectura será completa)
+        estado = estado_lectura(ruta, firma, df) if firma_archivo(ruta) == firma else None
+        if estado is not None and estado_cola is not None:
+            # Dónde empezaban las filas agregadas (ver filas_agregadas)
+            estado['anterior'] = {clave: valor for clave, valor in estado_cola.items() if clave != 'anterior'}
+    with _cache_lock:
+        _cache_archivos[clave] = (firma, df, estado)
+    return df.copy()
+
+
+def filas_agregadas(ruta, clave=None):
+    """
+    Si la última carga de un archivo con cargar_con_cache (con la clave indicada) solo procesó
+    las filas agregadas al final y el archivo no cambió desde entonces, retorna dónde empiezan
+    esas filas: el estado de la lectura anterior ('filas' del DataFrame, 'bytes' del archivo y
+    'huella' de esos bytes). En caso contrario retorna None.
+    """
+    clave = ruta if clave is None else clave
+    with _cache_lock:
+        entrada = _cache_archivos.get(clave)
+    if entrada is None or entrada[2] is None or entrada[0] != firma_archivo(ruta):
+        return None
+    return entrada[2].get('anterior')
+
+
+def detectar_separador(ruta):
+    """Determina el separador (';' o ',') y el número de columnas a partir de la primera línea."""
+    with open(ruta, 'r', encoding='utf-8-sig') as f:
+        primer_linea = f.readline()
+
+    # Verificar si el delimitador es realmente ';'
+    separador = ';' if ';' in primer_linea else ','
+    return separador, primer_linea.count(separador) + 1
+
+
+def salto_de_linea(ruta, por_defecto='\n'):
+    """Salto de línea que usa un archivo ('\r\n' o '\n'), según su primera línea."""
+    if not os.path.exists(ruta):
+        return por_defecto
+    with open(ruta, 'rb') as f:
+        primer_linea = f.readline()
+    if not primer_linea.endswith(b'\n'):
+        return por_defecto
+    return '\r\n' if primer_linea.endswith(b'\r\n') else '\n'
+
+
+def posiciones_columnas(ruta, columnas=None):
+    """
+    Retorna el separador y las posiciones de las columnas a leer de un CSV: todas las
+    definidas por la primera línea o, si se indican nombres, solo las que coinciden.
+    """
+    separador, total_columnas = detectar_separador(ruta)
+    if columnas is None:
+        return separador, list(range(total_columnas))
+
+    nombres = pd.read_csv(ruta, sep=separador, engine='c', encoding='utf-8', nrows=0).columns
+    return separador, [i for i, nombre in enumerate(nombres[:total_columnas]) if nombre in columnas]
+
+
+def leer_csv(ruta, columnas=None, **kwargs):
+    """
+    Lee un CSV directamente con el motor C de pandas tolerando filas irregulares.
+    El número de columnas lo define la primera línea: a las filas cortas se les
+    completan los campos faltantes (vacíos) y a las largas se les descartan los excedentes.
+    Si se indican columnas, solo se leen esas (las demás ni siquiera se convierten).
+    """
+    separador, posiciones = posiciones_columnas(ruta, columnas)
+    return pd.read_csv(ruta, sep=separador, engine='c', encoding='utf-8',
+                       usecols=posiciones, skip_blank_lines=True,
+                       dtype=str, **kwargs)  # Usar string para todos los tipos
+
+
+def leer_registros(ruta, columnas=None):
+    """Lee y limpia el archivo de registros (solo las columnas indicadas, si se indican)."""
+    registros_df = leer_csv(ruta, columnas)
+
+    # Limpiar valores
+    for col in registros_df.columns:
+        registros_df[col] = limpiar_columna(registros_df[col])
+
+    # Agregar las columnas tipadas una sola vez por versión del archivo
+    return aplicar_esquema(registros_df)
+
+
+# Claves de los metadatos del snapshot donde se guardan la firma del CSV de origen y la
+# versión del esquema con que se procesó (VERSION_ESQUEMA)
+CLAVE_FIRMA_SNAPSHOT = b'dtema_firma_csv'
+CLAVE_VERSION_SNAPSHOT = b'dtema_version_esquema'
+
+
+def ruta_snapshot(ruta):
+    """Ruta de la copia binaria (Parquet) que acompaña a un CSV."""
+    return os.path.splitext(ruta)[0] + '.parquet'
+
+
+def columnas_seleccionadas(nombres, columnas):
+    """Nombres (en su orden) que están entre las columnas indicadas o son derivadas de alguna de ellas."""
+    return [col for col in nombres
+            if col in columnas or (es_columna_derivada(col) and campo_original(col) in columnas)]
+
+
+def leer_snapshot(ruta, firma, columnas=None):
+    """
+    Lee el snapshot Parquet de un CSV si fue generado a partir de la versión
+    actual del archivo (misma firma) y con la versión actual del esquema (VERSION_ESQUEMA),
+    pues guarda las columnas derivadas. Retorna None si no existe o está desactualizado.
+    Si se indican columnas, solo se leen esas y sus columnas derivadas.
+    """
+    if pq is None or firma is None:
+        return None
+    ruta_parquet = ruta_snapshot(ruta)
+    if not os.path.exists(ruta_parquet):
+        return None
+    try:
+        esquema = pq.read_schema(ruta_parquet)
+        metadatos = esquema.metadata or {}
+        if json.loads(metadatos.get(CLAVE_FIRMA_SNAPSHOT, b'null')) != list(firma):
+            return None
+        if json.loads(metadatos.get(CLAVE_VERSION_SNAPSHOT, b'null')) != VERSION_ESQUEMA:
+            return None
+        if columnas is not None:
+            columnas = columnas_seleccionadas(esquema.names, columnas)
+        return pq.read_table(ruta_parquet, columns=columnas).to_pandas()
+    except Exception:
+        # Un snapshot ilegible se ignora; el CSV sigue siendo la fuente de verdad
+        return None
+
+
+def escribir_snapshot(df, ruta, firma):
+    """Guarda el DataFrame ya procesado (fechas y categorías incluidas) junto al CSV."""
+    if pa is None or firma is None:
+        return
+    ruta_parquet = ruta_snapshot(ruta)
+    ruta_temporal = ruta_parquet + '.tmp'
+    try:
+        tabla = pa.Table.from_pandas(df)
+        metadatos = dict(tabla.schema.metadata or {})
+        metadatos[CLAVE_FIRMA_SNAPSHOT] = json.dumps(list(firma)).encode()
+        metadatos[CLAVE_VERSION_SNAPSHOT] = json.dumps(VERSION_ESQUEMA).encode()
+        pq.write_table(tabla.replace_schema_metadata(metadatos), ruta_temporal)
+        # Reemplazo atómico para que otra sesión nunca lea un archivo a medio escribir
+        os.replace(ruta_temporal, ruta_parquet)
+    except Exception:
+        # El snapshot es solo una optimización: si falla, se sigue trabajando con el CSV
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+
+
+def leer_registros_con_snapshot(ruta, columnas=None):
+    """
+    Lee los registros desde el snapshot Parquet cuando corresponde a la versión
+    actual del CSV, evitando la lectura, limpieza y conversión de fechas. En caso
+    contrario lee el CSV completo, regenera el snapshot para las siguientes sesiones
+    y, si se indican columnas, retorna solo esas (y sus columnas derivadas).
+    """
+    firma = firma_archivo(ruta)
+    registros_df = leer_snapshot(ruta, firma, columnas)
+    if registros_df is not None:
+        return registros_df
+
+    # Sin pyarrow no hay snapshot: basta con leer las columnas indicadas
+    if pa is None or firma is None:
+        return leer_registros(ruta, columnas)
+
+    registros_df = leer_registros(ruta)
+    # Solo se guarda si el CSV no cambió mientras se procesaba
+    if firma_archivo(ruta) == firma:
+        escribir_snapshot(registros_df, ruta, firma)
+    if columnas is not None:
+        registros_df = registros_df[columnas_seleccionadas(registros_df.columns, columnas)]
+    return registros_df
+
+
+def leer_cola_registros(ruta, registros_df, desde_byte, columnas=None):
+    """
+    Lee solo las filas agregadas al final del archivo de registros (a partir de desde_byte),
+    las limpia, les aplica el esquema y las concatena a los registros ya procesados.
+    Las categorías de las columnas categóricas se unifican para que el resultado sea
+    igual al de leer el archivo completo.
+    """
+    separador, posiciones = posiciones_columnas(ruta, columnas)
+    with open(ruta, 'rb') as f:
+        f.seek(desde_byte)
+        cola = f.read()
+
+    cola_df = pd.read_csv(io.BytesIO(cola), sep=separador, engine='c', encoding='utf-8',
+                          header=None, usecols=posiciones, skip_blank_lines=True, dtype=str)
+    cola_df.columns = [col for col in registros_df.columns if not es_columna_derivada(col)][:len(posiciones)]
+
+    # Limpiar valores y agregar las columnas tipadas solo a las filas nuevas
+    for col in cola_df.columns:
+        cola_df[col] = limpiar_columna(cola_df[col])
+    aplicar_esquema(cola_df)
+
+    registros_df = registros_df.copy()
+    for col in registros_df.columns:
+        if isinstance(registros_df[col].dtype, pd.CategoricalDtype):
+            base = CAMPOS_CATEGORICOS.get(col, ESTADOS_ESTANDAR if col in CAMPOS_COMPLETO else [])
+            valores = set(registros_df[col].cat.categories) | set(cola_df[col].cat.categories)
+            categorias = list(base) + sorted(valores - set(base))
+            registros_df[col] = registros_df[col].cat.set_categories(categorias)
+            cola_df[col] = cola_df[col].cat.set_categories(categorias)
+
+    return pd.concat([registros_df, cola_df[registros_df.columns]], ignore_index=True)
+
+
+def leer_cola_registros_con_snapshot(ruta, registros_df, desde_byte, columnas=None):
+    """
+    Lee las filas agregadas (ver leer_cola_registros) y, si se leyeron todas las
+    columnas, actualiza el snapshot Parquet. Si solo se leyeron algunas columnas, el
+    snapshot queda desactualizado y se regenera en la siguiente lectura completa
+    (leer_registros_con_snapshot).
+    """
+    firma = firma_archivo(ruta)
+    registros_df = leer_cola_registros(ruta, registros_df, desde_byte, columnas)
+    if columnas is None and firma_archivo(ruta) == firma:
+        escribir_snapshot(registros_df, ruta, firma)
+    return registros_df
+
+
+def leer_metas(ruta):
+    """Lee y limpia el archivo de metas (sin encabezado)."""
+    meta_df = leer_csv(ruta, header=None)
+
+    # Limpiar valores
+    for col in meta_df.columns:
+        meta_df[col] = limpiar_columna(meta_df[col])
+
+    return meta_df
+
+
+def clave_registros(columnas=None):
+    """Clave en la caché de registros.csv cargado con la selección de columnas indicada."""
+    return 'registros.csv' if columnas is None else f"registros.csv {tuple(columnas)}"
+
+
+def cargar_registros(columnas=None):
+    """
+    Carga registros.csv con caché (ver cargar_con_cache). Si se indican columnas
+    (por ejemplo COLUMNAS_TABLERO), solo se leen y procesan esas columnas; cada
+    selección de columnas tiene su propia entrada en la caché (clave_registros).
+    """
+    return cargar_con_cache(
+        'registros.csv',
+        lambda ruta: leer_registros_con_snapshot(ruta, columnas),
+        clave=clave_registros(columnas),
+        lector_cola=lambda ruta, df, desde: leer_cola_registros_con_snapshot(ruta, df, desde, columnas)
+    )
+
+
+def cargar_datos(columnas=None):
+    """
+    Carga los datos desde archivos CSV. No usa datos de ejemplo.
+    Los archivos solo se vuelven a leer cuando cambian en disco (ver cargar_con_cache),
+    los registros se toman del snapshot Parquet cuando está al día con el CSV y,
+    si al CSV solo se le agregaron filas al final, solo se procesan las filas nuevas.
+    Si se indican columnas (por ejemplo COLUMNAS_TABLERO), solo se cargan esas columnas
+    de los registros; las columnas requeridas que falten se crean vacías.
+    """
     try:
         # Declarar variables por defecto para evitar errores
         registros_df = None
@@ -64,39 +419,17 @@ def cargar_datos():
             'Plazo de análisis', 'Plazo de cronograma', 'Plazo de oficio de cierre'
         ]
 
-        columnas_meta = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
-
         # Cargar archivo de registros
         if os.path.exists('registros.csv'):
             try:
-                # Leer el contenido directamente
-                with open('registros.csv', 'r', encoding='utf-8') as f:
-                    contenido = f.read()
-
-                # Verificar si el delimitador es realmente ';'
-                primer_linea = contenido.split('\n')[0]
-                if ';' in primer_linea:
-                    # Si hay ';' en la primera línea, normalizar y usar ';' como separador
-                    contenido_normalizado = normalizar_csv(contenido, ';')
-                    registros_df = pd.read_csv(io.StringIO(contenido_normalizado), sep=';',
-                                               engine='python', on_bad_lines='skip',
-                                               dtype=str)  # Usar string para todos los tipos
-                else:
-                    # Intentar con coma como separador alternativo
-                    contenido_normalizado = normalizar_csv(contenido, ',')
-                    registros_df = pd.read_csv(io.StringIO(contenido_normalizado), sep=',',
-                                               engine='python', on_bad_lines='skip',
-                                               dtype=str)  # Usar string para todos los tipos
-
-                # Limpiar valores
-                for col in registros_df.columns:
-                    registros_df[col] = registros_df[col].apply(limpiar_valor)
+                registros_df = cargar_registros(columnas)
 
                 # Verificar y añadir columnas requeridas si faltan
-                for columna in columnas_requeridas:
-                    if columna not in registros_df.columns:
-                        st.warning(f"La columna '{columna}' no existe en el archivo. Se creará como columna vacía.")
-                        registros_df[columna] = ''
+                columnas_faltantes = [col for col in columnas_requeridas if col not in registros_df.columns]
+                for columna in columnas_faltantes:
+                    st.warning(f"La columna '{columna}' no existe en el archivo. Se creará como columna vacía.")
+                    registros_df[columna] = ''
+                aplicar_esquema(registros_df, columnas_faltantes)
 
                 #st.success(f"Archivo registros.csv cargado correctamente con {len(registros_df)} registros.")
             except Exception as e:
@@ -109,40 +442,7 @@ def cargar_datos():
             st.warning("Se ha creado un DataFrame vacío con las columnas requeridas.")
 
         # Cargar archivo de metas
-        if os.path.exists('meta.csv'):
-            try:
-                # Leer el contenido y determinar el separador correcto
-                with open('meta.csv', 'r', encoding='utf-8') as f:
-                    contenido = f.read()
-
-                # Verificar si el delimitador es realmente ';'
-                primer_linea = contenido.split('\n')[0]
-                if ';' in primer_linea:
-                    # Si hay ';' en la primera línea, normalizar y usar ';' como separador
-                    contenido_normalizado = normalizar_csv(contenido, ';')
-                    meta_df = pd.read_csv(io.StringIO(contenido_normalizado), sep=';',
-                                          header=None, engine='python', on_bad_lines='skip',
-                                          dtype=str)  # Usar string para todos los tipos
-                else:
-                    # Intentar con coma como separador alternativo
-                    contenido_normalizado = normalizar_csv(contenido, ',')
-                    meta_df = pd.read_csv(io.StringIO(contenido_normalizado), sep=',',
-                                          header=None, engine='python', on_bad_lines='skip',
-                                          dtype=str)  # Usar string para todos los tipos
-
-                # Limpiar valores
-                for col in meta_df.columns:
-                    meta_df[col] = meta_df[col].apply(limpiar_valor)
-
-                #st.success("Archivo meta.csv cargado correctamente.")
-            except Exception as e:
-                st.error(f"Error al procesar el archivo meta.csv: {str(e)}")
-                meta_df = pd.DataFrame(columns=columnas_meta)
-                st.warning("Se ha creado un DataFrame vacío con las columnas requeridas para metas.")
-        else:
-            st.error("El archivo meta.csv no existe en el directorio actual.")
-            meta_df = pd.DataFrame(columns=columnas_meta)
-            st.warning("Se ha creado un DataFrame vacío con las columnas requeridas para metas.")
+        meta_df = cargar_metas()
 
         return registros_df, meta_df
 
@@ -157,36 +457,25 @@ def cargar_datos():
 
         return registros_df, meta_df
 
-def procesar_fecha(fecha_str):
-    """Procesa una fecha de manera segura manejando NaT."""
-    if pd.isna(fecha_str) or fecha_str == '' or fecha_str is None:
-        return None
-
-    # Si es un objeto datetime o Timestamp, retornarlo directamente
-    if isinstance(fecha_str, (pd.Timestamp, datetime)):
-        if pd.isna(fecha_str):  # Comprobar si es NaT
-            return None
-        return fecha_str
+def cargar_metas():
+    """Carga el archivo de metas (meta.csv), o un DataFrame vacío si no se puede leer."""
+    columnas_meta = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
 
-    # Si es un string, procesarlo
-    try:
-        # Eliminar espacios y caracteres extraños
-        fecha_str = re.sub(r'[^\d/\-]', '', str(fecha_str).strip())
+    if os.path.exists('meta.csv'):
+        try:
+            meta_df = cargar_con_cache('meta.csv', leer_metas)
 
-        # Formatos a intentar
-        formatos = ['%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%m/%d/%Y']
+            #st.success("Archivo meta.csv cargado correctamente.")
+        except Exception as e:
+            st.error(f"Error al procesar el archivo meta.csv: {str(e)}")
+            meta_df = pd.DataFrame(columns=columnas_meta)
+            st.warning("Se ha creado un DataFrame vacío con las columnas requeridas para metas.")
+    else:
+        st.error("El archivo meta.csv no existe en el directorio actual.")
+        meta_df = pd.DataFrame(columns=columnas_meta)
+        st.warning("Se ha creado un DataFrame vacío con las columnas requeridas para metas.")
 
-        for formato in formatos:
-            try:
-                fecha = pd.to_datetime(fecha_str, format=formato)
-                if pd.notna(fecha):  # Verificar que no sea NaT
-                    return fecha
-            except:
-                continue
-
-        return None
-    except Exception:
-        return None
+    return meta_df
 
 
 def es_fecha_valida(valor):
@@ -198,28 +487,197 @@ def es_fecha_valida(valor):
         return False
 
 
-def formatear_fecha(fecha_str):
-    """Formatea una fecha en formato DD/MM/YYYY manejando NaT."""
-    try:
-        fecha = procesar_fecha(fecha_str)
-        if fecha is not None and pd.notna(fecha):
-            return fecha.strftime('%d/%m/%Y')
-        return ""
-    except Exception:
-        # Si hay cualquier error, devuelve cadena vacía
-        return ""
+def columna_fecha(campo):
+    """Nombre de la columna derivada con la fecha (datetime64) de un campo."""
+    return f"{campo}{SUFIJO_FECHA}"
+
+
+def columna_bool(campo):
+    """Nombre de la columna derivada con el indicador booleano de un campo."""
+    return f"{campo}{SUFIJO_BOOL}"
+
 
+def columna_dias_habiles(campo):
+    """Nombre de la columna derivada con los días hábiles restantes hasta la fecha de un campo."""
+    return f"{campo}{SUFIJO_DIAS_HABILES}"
 
-def verificar_completado_por_fecha(fecha_programada, fecha_completado=None):
+
+def es_columna_derivada(columna):
+    """Verifica si una columna es una columna derivada del esquema tipado."""
+    return isinstance(columna, str) and columna.endswith((SUFIJO_FECHA, SUFIJO_BOOL, SUFIJO_DIAS_HABILES))
+
+
+def campo_original(columna):
+    """Nombre del campo a partir del cual se calcula una columna derivada."""
+    for sufijo in (SUFIJO_FECHA, SUFIJO_BOOL, SUFIJO_DIAS_HABILES):
+        if columna.endswith(sufijo):
+            return columna[:-len(sufijo)]
+    return columna
+
+
+def sin_columnas_derivadas(df):
+    """Retorna el DataFrame sin las columnas derivadas, para guardar o exportar."""
+    derivadas = [col for col in df.columns if es_columna_derivada(col)]
+    return df.drop(columns=derivadas) if derivadas else df
+
+
+def texto_columna(serie):
+    """Retorna la columna como texto, con los valores faltantes como cadena vacía."""
+    return serie.astype(object).where(serie.notna(), '').astype(str)
+
+
+def convertir_si_no(serie):
+    """Convierte una columna Si/No a booleano (True si el valor es 'Si' o equivalente)."""
+    return texto_columna(serie).str.strip().str.upper().isin(VALORES_SI)
+
+
+def convertir_categorica(serie, categorias_base=()):
+    """Convierte una columna de texto a categórica, conservando los valores originales."""
+    valores = texto_columna(serie)
+    categorias = list(categorias_base) + sorted(set(valores) - set(categorias_base))
+    return valores.astype(pd.CategoricalDtype(categorias))
+
+
+def aplicar_esquema(df, columnas=None):
+    """
+    Agrega las columnas derivadas tipadas del esquema de registros:
+    - Campos de fecha (CAMPOS_FECHA_REGISTRO): columna datetime64 (columna_fecha)
+    - Campos Si/No (CAMPOS_SI_NO): columna booleana (columna_bool)
+    - Campos (completo) (CAMPOS_COMPLETO): se convierten a categóricos y se agrega
+      una columna booleana que indica si están 'Completo'
+    - Entidad, Funcionario, Nivel Información, TipoDato y Estado (CAMPOS_CATEGORICOS):
+      se convierten a categóricos
+    Las columnas originales conservan su texto, por lo que el archivo se guarda sin cambios.
+    Si se indican columnas, solo se recalculan las derivadas de esas columnas.
+    Modifica df y lo retorna.
+    """
+    campos = list(df.columns) if columnas is None else [col for col in columnas if col in df.columns]
+
+    for campo in campos:
+        if campo in CAMPOS_FECHA_REGISTRO:
+            df[columna_fecha(campo)] = procesar_fechas_series(df[campo])
+        elif campo in CAMPOS_SI_NO:
+            df[columna_bool(campo)] = convertir_si_no(df[campo])
+        elif campo in CAMPOS_COMPLETO:
+            df[campo] = convertir_categorica(df[campo], ESTADOS_ESTANDAR)
+            df[columna_bool(campo)] = (df[campo] == 'Completo').astype(bool)
+        elif campo in CAMPOS_CATEGORICOS:
+            df[campo] = convertir_categorica(df[campo], CAMPOS_CATEGORICOS[campo])
+
+    return df
+
+
+def asignar_valor(df, idx, campo, valor):
+    """
+    Asigna un valor a una celda (df.at[idx, campo] = valor).
+    Si la columna es categórica y el valor no está entre sus categorías, lo agrega primero.
+    También actualiza la celda de la columna derivada del campo, para que las fechas y
+    booleanos tipados sigan siendo válidos sin recalcular la columna completa.
+    """
+    if campo in df.columns and isinstance(df[campo].dtype, pd.CategoricalDtype) \
+            and valor not in df[campo].cat.categories:
+        df[campo] = df[campo].cat.add_categories([valor])
+    df.at[idx, campo] = valor
+
+    if campo in CAMPOS_FECHA_REGISTRO:
+        actualizar_columna_fecha(df, idx, campo, procesar_fecha(valor))
+    elif columna_bool(campo) in df.columns:
+        if campo in CAMPOS_COMPLETO:
+            df.at[idx, columna_bool(campo)] = valor == 'Completo'
+        else:
+            df.at[idx, columna_bool(campo)] = str(valor).strip().upper() in VALORES_SI
+
+
+def asignar_valores(df, mascara, campo, valor):
+    """
+    Versión vectorizada de asignar_valor: asigna el mismo valor a todas las filas indicadas
+    por la máscara booleana (alineada con las filas de df), en una sola asignación, y
+    actualiza esas filas de la columna derivada del campo.
+    """
+    filas = np.asarray(mascara, dtype=bool)
+    if not filas.any():
+        return
+    if campo in df.columns and isinstance(df[campo].dtype, pd.CategoricalDtype) \
+            and valor not in df[campo].cat.categories:
+        df[campo] = df[campo].cat.add_categories([valor])
+    df.loc[filas, campo] = valor
+
+    if campo in CAMPOS_FECHA_REGISTRO:
+        actualizar_columna_fecha(df, filas, campo, procesar_fecha(valor))
+    elif columna_bool(campo) in df.columns:
+        if campo in CAMPOS_COMPLETO:
+            df.loc[filas, columna_bool(campo)] = valor == 'Completo'
+        else:
+            df.loc[filas, columna_bool(campo)] = str(valor).strip().upper() in VALORES_SI
+
+
+def fechas_para_mostrar(df, ruta=None):
+    """
+    Retorna los campos de fecha de df como texto dd/mm/aaaa (vacío si no hay fecha), a partir
+    de las columnas de fecha tipadas. Si se indica la ruta de registros.csv, el resultado se
+    reutiliza mientras el archivo no cambie (lo comparten el dashboard, la tabla completa y
+    sus descargas).
+    """
+    campos = [campo for campo in CAMPOS_FECHA_REGISTRO if campo in df.columns]
+
+    def formatear(_):
+        return pd.DataFrame({campo: formatear_fechas_series(obtener_fecha(df, campo)) for campo in campos},
+                            index=df.index, columns=campos)
+
+    if ruta is not None and firma_archivo(ruta) is not None:
+        fechas = cargar_con_cache(ruta, formatear, clave=f"{ruta} (fechas para mostrar) {tuple(campos)}")
+        if fechas.index.equals(df.index):
+            return fechas
+    return formatear(None)
+
+
+def actualizar_plazos_con_cache(df, ruta=None):
+    """
+    Calcula todos los plazos de df (ver fecha_utils.actualizar_plazos). Si se indica la ruta
+    de registros.csv, df debe ser el contenido recién cargado del archivo: los plazos solo
+    dependen de él, así que se calculan una sola vez por versión del archivo y, si al archivo
+    solo se le agregaron filas al final, solo para las filas nuevas.
+    Modifica df y lo retorna.
+    """
+    if ruta is None or firma_archivo(ruta) is None:
+        return actualizar_plazos(df)
+
+    def calcular(_, desde_fila=0):
+        actualizado = actualizar_plazos(df.iloc[desde_fila:])
+        columnas = [col for plazo in COLUMNAS_PLAZOS for col in (plazo, columna_fecha(plazo))]
+        return actualizado[[col for col in columnas if col in actualizado.columns]]
+
+    def calcular_cola(_, plazos_anteriores, desde_byte):
+        return pd.concat([plazos_anteriores, calcular(None, len(plazos_anteriores))])
+
+    plazos = cargar_con_cache(ruta, calcular, clave=f"{ruta} (plazos)", lector_cola=calcular_cola)
+    if not plazos.index.equals(df.index):
+        return actualizar_plazos(df)
+    for columna in plazos.columns:
+        df[columna] = plazos[columna]
+    return df
+
+
+def obtener_bool(df, campo):
+    """Retorna el indicador booleano de un campo, usando la columna derivada si existe."""
+    derivada = columna_bool(campo)
+    if derivada in df.columns:
+        return df[derivada]
+    if campo in CAMPOS_COMPLETO:
+        return texto_columna(df[campo]) == 'Completo'
+    return convertir_si_no(df[campo])
+
+
+def verificar_completado_por_fecha(fecha_programada, fecha_completado=None, fecha_corte=None):
     """
     Verifica si una tarea está completada basada en fechas.
     Si fecha_completado está presente, la tarea está completada.
-    Si no, se verifica si la fecha programada ya pasó.
+    Si no, se verifica si la fecha programada ya pasó a la fecha de corte (por defecto, hoy).
     """
     if fecha_completado is not None and pd.notna(fecha_completado):
         return True
 
-    fecha_actual = datetime.now()
+    fecha_actual = obtener_fecha_corte(fecha_corte)
     fecha_prog = procesar_fecha(fecha_programada)
 
     if fecha_prog is not None and pd.notna(fecha_prog) and fecha_prog <= fecha_actual:
@@ -274,67 +732,77 @@ def calcular_porcentaje_avance(registro):
         # En caso de error, retornar 0
         st.warning(f"Error al calcular porcentaje de avance: {e}")
         return 0
-def procesar_metas(meta_df):
-    """Procesa las metas a partir del DataFrame de metas."""
+
+
+def calcular_porcentaje_avance_df(df):
+    """
+    Versión vectorizada de calcular_porcentaje_avance para todos los registros.
+    Usa el indicador tipado de 'Acuerdo de compromiso' si existe.
+    """
+    avance = pd.Series(0, index=df.index)
+
+    # Acuerdo de compromiso (20%): 'Si' o equivalente, o 'Completo'
+    if 'Acuerdo de compromiso' in df.columns:
+        acuerdo = obtener_bool(df, 'Acuerdo de compromiso') | (
+            texto_columna(df['Acuerdo de compromiso']).str.strip().str.upper() == 'COMPLETO')
+        avance += acuerdo.astype(int) * 20
+
+    # Análisis y cronograma (20%), Estándares (30%), Publicación (25%) y oficio de cierre (5%)
+    for campo, peso in [('Análisis y cronograma', 20), ('Estándares', 30),
+                        ('Publicación', 25), ('Fecha de oficio de cierre', 5)]:
+        if campo in df.columns:
+            avance += (texto_columna(df[campo]) != '').astype(int) * peso
+
+    return avance
+
+
+# Columnas de meta.csv con las metas de cada tipo de registro, en el orden de los hitos
+COLUMNAS_METAS = {'Nuevo': [1, 2, 3, 4], 'Actualizar': [6, 7, 8, 9]}
+
+
+def convertir_metas(meta_df):
+    """
+    Convierte las metas de meta.csv a un DataFrame indexado por fecha, con columnas
+    (tipo de registro, hito). Las fechas están en la primera columna desde la fila 3;
+    las filas sin fecha válida se descartan y las columnas que no existan se toman como 0.
+    """
+    filas = meta_df.iloc[3:]
+    fechas = procesar_fechas_series(filas[0]) if 0 in filas.columns else pd.Series(pd.NaT, index=filas.index)
+    filas = filas[fechas.notna()]
+
+    bloques = {}
+    for tipo, columnas in COLUMNAS_METAS.items():
+        # Columnas ausentes en el archivo: meta 0; valores no numéricos: NaN
+        bloques[tipo] = pd.DataFrame({
+            hito: pd.to_numeric(filas[col], errors='coerce') if col in filas.columns else 0
+            for hito, col in zip(HITOS, columnas)
+        }, index=filas.index)
+
+    metas = pd.concat(bloques, axis=1)
+    metas.index = pd.DatetimeIndex(fechas[fechas.notna()].to_numpy())
+    return metas
+
+
+def procesar_metas(meta_df, ruta=None):
+    """
+    Procesa las metas a partir del DataFrame de metas (ver convertir_metas).
+    Si se indica la ruta de meta.csv, la conversión se reutiliza mientras el archivo no cambie.
+    """
     try:
-        # La estructura de las metas es compleja, vamos a procesarla
-        # Asumiendo que las filas 3 en adelante contienen las fechas y metas
-        fechas = []
-        metas_nuevas = {}
-        metas_actualizar = {}
-
-        # Inicializar listas para cada hito
-        for hito in ['Acuerdo de compromiso', 'Análisis y cronograma', 'Estándares', 'Publicación']:
-            metas_nuevas[hito] = []
-            metas_actualizar[hito] = []
-
-        # Procesar cada fila (desde la fila 3 que contiene las fechas y valores)
-        for i in range(3, len(meta_df)):
-            try:
-                fila = meta_df.iloc[i]
-
-                # La primera columna contiene la fecha
-                fecha = procesar_fecha(fila[0])
-                if fecha is not None:
-                    fechas.append(fecha)
-
-                    # Columnas 1-4 son para registros nuevos (asegurar que existan)
-                    metas_nuevas['Acuerdo de compromiso'].append(
-                        pd.to_numeric(fila[1] if len(fila) > 1 else 0, errors='coerce') or 0)
-                    metas_nuevas['Análisis y cronograma'].append(
-                        pd.to_numeric(fila[2] if len(fila) > 2 else 0, errors='coerce') or 0)
-                    metas_nuevas['Estándares'].append(
-                        pd.to_numeric(fila[3] if len(fila) > 3 else 0, errors='coerce') or 0)
-                    metas_nuevas['Publicación'].append(
-                        pd.to_numeric(fila[4] if len(fila) > 4 else 0, errors='coerce') or 0)
-
-                    # Columnas 6-9 son para registros a actualizar (asegurar que existan)
-                    metas_actualizar['Acuerdo de compromiso'].append(
-                        pd.to_numeric(fila[6] if len(fila) > 6 else 0, errors='coerce') or 0)
-                    metas_actualizar['Análisis y cronograma'].append(
-                        pd.to_numeric(fila[7] if len(fila) > 7 else 0, errors='coerce') or 0)
-                    metas_actualizar['Estándares'].append(
-                        pd.to_numeric(fila[8] if len(fila) > 8 else 0, errors='coerce') or 0)
-                    metas_actualizar['Publicación'].append(
-                        pd.to_numeric(fila[9] if len(fila) > 9 else 0, errors='coerce') or 0)
-            except Exception as e:
-                st.warning(f"Error al procesar fila {i} de metas: {e}")
-                continue
+        if ruta is not None and firma_archivo(ruta) is not None:
+            metas = cargar_con_cache(ruta, lambda _: convertir_metas(meta_df), clave=f"{ruta} (procesadas)")
+        else:
+            metas = convertir_metas(meta_df)
 
         # Si no hay fechas, mostrar un error
-        if not fechas:
+        if metas.empty:
             st.error("No se pudieron procesar las fechas de las metas")
             # Crear un DataFrame de ejemplo como respaldo
             fechas = [datetime.now()]
-            for hito in metas_nuevas:
-                metas_nuevas[hito] = [0]
-                metas_actualizar[hito] = [0]
+            metas_vacias = {hito: [0] for hito in HITOS}
+            return pd.DataFrame(metas_vacias, index=fechas), pd.DataFrame(metas_vacias, index=fechas)
 
-        # Convertir a DataFrames
-        metas_nuevas_df = pd.DataFrame(metas_nuevas, index=fechas)
-        metas_actualizar_df = pd.DataFrame(metas_actualizar, index=fechas)
-
-        return metas_nuevas_df, metas_actualizar_df
+        return metas['Nuevo'], metas['Actualizar']
     except Exception as e:
         st.error(f"Error al procesar metas: {e}")
         # Crear DataFrames vacíos como respaldo
@@ -350,9 +818,9 @@ def procesar_metas(meta_df):
         return metas_nuevas_df, metas_actualizar_df
 
 
-def verificar_estado_fechas(row):
-    """Verifica si las fechas están vencidas o próximas a vencer."""
-    fecha_actual = datetime.now()
+def verificar_estado_fechas(row, fecha_corte=None):
+    """Verifica si las fechas están vencidas o próximas a vencer a la fecha de corte (por defecto, hoy)."""
+    fecha_actual = obtener_fecha_corte(fecha_corte)
     estado = "normal"  # Por defecto, estado normal
 
     # Lista de campos de fechas a verificar
@@ -364,19 +832,162 @@ def verificar_estado_fechas(row):
 
     for campo in campos_fecha:
         if campo in row and row[campo]:
-            fecha = procesar_fecha(row[campo])
+            fecha = fecha_fila(row, campo)
             if fecha is not None and pd.notna(fecha):
                 # Si la fecha ya está vencida
                 if fecha < fecha_actual:
                     return "vencido"  # Prioridad alta, retornamos inmediatamente
 
-                # Si la fecha está próxima a vencer en los próximos 30 días
-                if fecha <= fecha_actual + timedelta(days=30):
+                # Si la fecha está próxima a vencer en los próximos DIAS_ALERTA días
+                if fecha <= fecha_actual + timedelta(days=DIAS_ALERTA):
                     estado = "proximo"  # Marcamos como próximo, pero seguimos verificando otras fechas
 
     return estado
 
 
+def verificar_estado_fechas_df(df, fecha_corte=None):
+    """Versión vectorizada de verificar_estado_fechas usando las columnas de fecha tipadas."""
+    fecha_actual = obtener_fecha_corte(fecha_corte)
+    vencido = pd.Series(False, index=df.index)
+    proximo = pd.Series(False, index=df.index)
+
+    for campo in CAMPOS_FECHA.values():
+        if campo in df.columns:
+            fechas = obtener_fecha(df, campo)
+            vencido |= fechas < fecha_actual
+            proximo |= fechas <= fecha_actual + timedelta(days=DIAS_ALERTA)
+
+    estado = pd.Series("normal", index=df.index)
+    estado[proximo] = "proximo"
+    estado[vencido] = "vencido"
+    return estado
+
+
+def dias_habiles_restantes_df(df, fecha_corte=None):
+    """
+    Días hábiles restantes a la fecha de corte (negativos: días hábiles de retraso) hasta cada
+    fecha programada y cada plazo (CAMPOS_DIAS_HABILES), como columnas derivadas (columna_dias_habiles).
+    """
+    return pd.DataFrame({
+        columna_dias_habiles(campo): dias_habiles_restantes(obtener_fecha(df, campo), fecha_corte)
+        for campo in CAMPOS_DIAS_HABILES if campo in df.columns
+    }, index=df.index)
+
+
+def completados_por_fecha_df(df, columna_fecha_programada, columna_fecha_completado, fecha_corte=None):
+    """
+    Indica, para cada registro, si tiene fecha programada y, además, una fecha de completado
+    o un valor positivo ('Si' o equivalente, o 'Completo') en la columna de completado, o si
+    su fecha programada ya pasó a la fecha de corte (por defecto, hoy).
+    """
+    if columna_fecha_programada not in df.columns:
+        return pd.Series(False, index=df.index)
+
+    programado = texto_columna(df[columna_fecha_programada]) != ''
+    vencido = obtener_fecha(df, columna_fecha_programada) <= obtener_fecha_corte(fecha_corte)
+    real = pd.Series(False, index=df.index)
+    if columna_fecha_completado in df.columns:
+        texto_completado = texto_columna(df[columna_fecha_completado])
+        real = (texto_completado != '') & (obtener_fecha(df, columna_fecha_completado).notna() |
+                                           texto_completado.str.strip().str.upper().isin(VALORES_SI + ['COMPLETO']))
+    return programado & (real | vencido)
+
+
+def completados_por_hito_df(df, fecha_corte=None):
+    """
+    Indica, para cada registro y cada hito de las metas (HITOS), si el hito se cuenta
+    como completado:
+    - Acuerdo de compromiso: el valor es 'Si' o equivalente, o 'Completo'
+    - Demás hitos: completados_por_fecha_df con la fecha programada del hito (CAMPOS_FECHA)
+      y el propio hito como columna de completado
+    """
+    completados = pd.DataFrame(False, index=df.index, columns=list(HITOS))
+
+    if 'Acuerdo de compromiso' in df.columns:
+        completados['Acuerdo de compromiso'] = texto_columna(df['Acuerdo de compromiso']).str.upper().isin(
+            VALORES_SI + ['COMPLETO'])
+
+    for hito, campo_programado in CAMPOS_FECHA.items():
+        if hito in completados.columns:
+            completados[hito] = completados_por_fecha_df(df, campo_programado, hito, fecha_corte)
+
+    return completados
+
+
+def indicadores_registros_df(df, fecha_corte=None):
+    """
+    Calcula los indicadores del tablero para cada registro, listos para sumarse por grupos:
+    número de registros, porcentaje de avance, registros completados (100%),
+    registros con fechas vencidas o próximas a vencer y hitos completados a la fecha de corte.
+    """
+    avance = calcular_porcentaje_avance_df(df)
+    estado = verificar_estado_fechas_df(df, fecha_corte)
+    indicadores = pd.DataFrame({
+        'Registros': 1,
+        'Suma Avance': avance,
+        'Completados': (avance == 100).astype(int),
+        'Vencidos': (estado == 'vencido').astype(int),
+        'Proximos': (estado == 'proximo').astype(int)
+    }, index=df.index)
+    return pd.concat([indicadores, completados_por_hito_df(df, fecha_corte).astype(int)], axis=1)
+
+
+def indicadores_fecha_corte_df(df, fecha_corte=None, ruta=None):
+    """
+    Calcula las columnas de los registros que dependen de la fecha de corte: 'Estado Fechas'
+    (verificar_estado_fechas_df) y los días hábiles restantes (dias_habiles_restantes_df).
+    Si se indica la ruta del archivo de registros, se calculan una sola vez por versión del
+    archivo y fecha de corte.
+    """
+    fecha_corte = obtener_fecha_corte(fecha_corte)
+
+    def calcular(_):
+        indicadores = dias_habiles_restantes_df(df, fecha_corte)
+        indicadores.insert(0, 'Estado Fechas', verificar_estado_fechas_df(df, fecha_corte))
+        return indicadores
+
+    if ruta is not None and firma_archivo(ruta) is not None:
+        indicadores = cargar_con_cache(ruta, calcular, clave=f"{ruta} (fecha de corte)", version=fecha_corte)
+        if indicadores.index.equals(df.index):
+            return indicadores
+    return calcular(ruta)
+
+
+def agregar_registros_por_bloques(ruta, preparar=None, tamano_bloque=TAMANO_BLOQUE, columnas=COLUMNAS_TABLERO,
+                                  fecha_corte=None):
+    """
+    Lee el archivo de registros por bloques y acumula los indicadores del tablero
+    (ver indicadores_registros_df) agrupados por las columnas de los filtros
+    (COLUMNAS_AGRUPACION), sin mantener todos los registros en memoria.
+    preparar es una función opcional que se aplica a cada bloque ya limpio
+    (por ejemplo, las reglas de negocio) antes de calcular los indicadores.
+    Solo se leen las columnas indicadas (por defecto COLUMNAS_TABLERO).
+    Los indicadores que dependen de la fecha se calculan a la fecha de corte (por defecto, hoy).
+    Retorna un DataFrame con una fila por combinación de valores de los filtros.
+    """
+    acumulado = None
+    with leer_csv(ruta, columnas, chunksize=tamano_bloque) as lector:
+        for bloque in lector:
+            for col in bloque.columns:
+                bloque[col] = limpiar_columna(bloque[col])
+            aplicar_esquema(bloque)
+            if preparar is not None:
+                bloque = preparar(bloque)
+
+            indicadores = indicadores_registros_df(bloque, fecha_corte)
+            for col in COLUMNAS_AGRUPACION:
+                indicadores[col] = texto_columna(bloque[col]) if col in bloque.columns else ''
+            parcial = indicadores.groupby(COLUMNAS_AGRUPACION, sort=False).sum()
+
+            # Solo se conserva el resumen por grupos, no los registros del bloque
+            acumulado = parcial if acumulado is None else acumulado.add(parcial, fill_value=0)
+
+    if acumulado is None:
+        # Archivo sin registros
+        return pd.DataFrame(columns=COLUMNAS_AGRUPACION + list(indicadores_registros_df(pd.DataFrame()).columns))
+    return acumulado.astype(int).reset_index()
+
+
 def validar_campos_fecha(df, campos_fecha=['Análisis y cronograma', 'Estándares', 'Publicación']):
     """
     Valida que los campos específicos contengan solo fechas válidas.
@@ -386,9 +997,7 @@ def validar_campos_fecha(df, campos_fecha=['Análisis y cronograma', 'Estándare
 
     for campo in campos_fecha:
         if campo in df_validado.columns:
-            df_validado[campo] = df_validado[campo].apply(
-                lambda x: formatear_fecha(x) if es_fecha_valida(x) else ""
-            )
+            df_validado[campo] = formatear_fechas_series(obtener_fecha(df_validado, campo))
 
     return df_validado
 
@@ -396,13 +1005,19 @@ def guardar_datos_editados(df, ruta_archivo='registros.csv'):
     """Guarda los datos editados en un archivo CSV, asegurando que ciertos campos sean fechas."""
     try:
         # Validar que los campos de fechas sean fechas válidas
-        df_validado = validar_campos_fecha(df)
+        df_validado = sin_columnas_derivadas(validar_campos_fecha(df))
+
+        # Convertir DataFrame a CSV (con los saltos de línea que ya usa el archivo)
+        csv_data = df_validado.to_csv(index=False, sep=';', lineterminator=salto_de_linea(ruta_archivo))
 
-        # Convertir DataFrame a CSV
-        csv_data = df_validado.to_csv(index=False, sep=';')
+        # No reescribir el archivo si el contenido no cambió, para no invalidar la caché de carga
+        if os.path.exists(ruta_archivo):
+            with open(ruta_archivo, 'r', encoding='utf-8', newline='') as f:
+                if f.read() == csv_data:
+                    return True, "Datos guardados correctamente."
 
         # Guardar archivo
-        with open(ruta_archivo, 'w', encoding='utf-8') as f:
+        with open(ruta_archivo, 'w', encoding='utf-8', newline='') as f:
             f.write(csv_data)
 
         return True, "Datos guardados correctamente."
@@ -410,28 +1025,76 @@ def guardar_datos_editados(df, ruta_archivo='registros.csv'):
         st.error(f"Error al guardar datos: {e}")
         return False, f"Error al guardar datos: {e}"
 
-def contar_registros_completados_por_fecha(df, columna_fecha_programada, columna_fecha_completado):
+def guardar_columnas_editadas(df, columnas, ruta_archivo='registros.csv'):
     """
-    Cuenta los registros que tienen una fecha de completado o cuya fecha programada ya pasó.
+    Guarda en el archivo solo las columnas indicadas de un DataFrame que se cargó con
+    una selección de columnas: se cargan los registros completos, se reemplazan esas
+    columnas (las filas se corresponden por índice) y se guarda el archivo completo.
     """
-    count = 0
-    for _, row in df.iterrows():
-        if columna_fecha_programada in row and row[columna_fecha_programada]:
-            fecha_programada = row[columna_fecha_programada]
+    try:
+        registros_completos = cargar_registros()
+        if len(registros_completos) != len(df):
+            return False, "Los registros cambiaron en disco; vuelva a cargar los datos antes de guardar."
+        for columna in columnas:
+            registros_completos[columna] = df[columna].to_numpy()
+        aplicar_esquema(registros_completos, columnas)
+        return guardar_datos_editados(registros_completos, ruta_archivo)
+    except Exception as e:
+        return False, f"Error al guardar los datos: {str(e)}"
 
-            # Verificar si hay una fecha de completado
-            fecha_completado = None
-            if columna_fecha_completado in row and row[columna_fecha_completado]:
-                # Intentar procesar como fecha primero
-                fecha_completado = procesar_fecha(row[columna_fecha_completado])
-                # Si no es una fecha, verificar si es un valor booleano positivo
-                if fecha_completado is None and str(row[columna_fecha_completado]).strip().upper() in ['SI', 'SÍ',
-                                                                                                       'S', 'YES',
-                                                                                                       'Y',
-                                                                                                       'COMPLETO']:
-                    fecha_completado = datetime.now()  # Usar fecha actual como completado
 
-            if verificar_completado_por_fecha(fecha_programada, fecha_completado):
-                count += 1
+def guardar_filas_agregadas(df, columnas, inicio, ruta_archivo='registros.csv'):
+    """
+    Guarda las columnas indicadas de las filas agregadas al final del archivo en su última carga
+    (ver filas_agregadas): las filas de df a partir de inicio['filas'], que en el archivo empiezan
+    en el byte inicio['bytes']. Solo se reescriben esas filas, con el separador y los saltos de
+    línea del archivo; el contenido anterior no se modifica, así que la siguiente carga solo
+    vuelve a procesar esas filas.
+    """
+    try:
+        if huella_prefijo(ruta_archivo, inicio['bytes']) != inicio['huella']:
+            return False, "Los registros cambiaron en disco; vuelva a cargar los datos antes de guardar."
+
+        separador, posiciones = posiciones_columnas(ruta_archivo)
+        nombres = pd.read_csv(ruta_archivo, sep=separador, engine='c', encoding='utf-8', nrows=0).columns
+        with open(ruta_archivo, 'rb') as f:
+            f.seek(inicio['bytes'])
+            cola = f.read()
+        cola_df = pd.read_csv(io.BytesIO(cola), sep=separador, engine='c', encoding='utf-8', header=None,
+                              usecols=posiciones, skip_blank_lines=True, dtype=str, keep_default_na=False)
+        cola_df.columns = nombres[:len(posiciones)]
+
+        filas = df.iloc[inicio['filas']:]
+        if len(cola_df) != len(filas):
+            return False, "Los registros cambiaron en disco; vuelva a cargar los datos antes de guardar."
+        for columna in columnas:
+            cola_df[columna] = texto_columna(filas[columna]).to_numpy()
+
+        csv_data = cola_df.fillna('').to_csv(index=False, header=False, sep=separador,
+                                             lineterminator=salto_de_linea(ruta_archivo))
+        with open(ruta_archivo, 'r+b') as f:
+            f.seek(inicio['bytes'])
+            f.truncate()
+            f.write(csv_data.encode('utf-8'))
 
-    return count
+        return True, "Datos guardados correctamente."
+    except Exception as e:
+        return False, f"Error al guardar los datos: {str(e)}"
+
+
+def filas_distintas(df, otro, columnas):
+    """Máscara (array booleano) de las filas en que alguna de las columnas indicadas tiene otro texto en otro."""
+    distintas = np.zeros(len(df), dtype=bool)
+    for columna in columnas:
+        distintas |= (texto_columna(df[columna]) != texto_columna(otro[columna])).to_numpy()
+    return distintas
+
+
+def contar_registros_completados_por_fecha(df, columna_fecha_programada, columna_fecha_completado,
+                                           fecha_corte=None):
+    """
+    Cuenta los registros que tienen una fecha de completado o cuya fecha programada ya pasó
+    a la fecha de corte (por defecto, hoy). Ver completados_por_fecha_df.
+    """
+    return int(completados_por_fecha_df(df, columna_fecha_programada, columna_fecha_completado,
+                                        fecha_corte).sum())
@@ -1,38 +1,108 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 import re
+from constants import SUFIJO_FECHA, TAMANO_CACHE_FECHAS, REGLAS_PLAZOS, ANIO_MINIMO_HABILES, ANIO_MAXIMO_HABILES
+from festivos_utils import calendario_habiles
 
-# Lista de días festivos en Colombia para 2025
-FESTIVOS_2025 = [
-    datetime(2025, 1, 1),  # Año Nuevo
-    datetime(2025, 1, 6),  # Día de los Reyes Magos
-    datetime(2025, 3, 24),  # Día de San José
-    datetime(2025, 4, 17),  # Jueves Santo
-    datetime(2025, 4, 18),  # Viernes Santo
-    datetime(2025, 5, 1),  # Día del Trabajo
-    datetime(2025, 5, 29),  # Ascensión del Señor
-    datetime(2025, 6, 19),  # Corpus Christi
-    datetime(2025, 6, 27),  # Sagrado Corazón
-    datetime(2025, 6, 30),  # San Pedro y San Pablo
-    datetime(2025, 7, 20),  # Día de la Independencia
-    datetime(2025, 8, 7),  # Batalla de Boyacá
-    datetime(2025, 8, 18),  # Asunción de la Virgen
-    datetime(2025, 10, 13),  # Día de la Raza
-    datetime(2025, 11, 3),  # Todos los Santos
-    datetime(2025, 11, 17),  # Independencia de Cartagena
-    datetime(2025, 12, 8),  # Día de la Inmaculada Concepción
-    datetime(2025, 12, 25)  # Navidad
-]
-
-
-def es_festivo(fecha):
-    """Verifica si una fecha es festivo en Colombia."""
-    for festivo in FESTIVOS_2025:
-        if (fecha.day == festivo.day and
-                fecha.month == festivo.month and
-                fecha.year == festivo.year):
-            return True
-    return False
+
+def calendario_fechas(inicio, dias):
+    """
+    Retorna el calendario de días hábiles que cubre las fechas de inicio (datetime64[D])
+    y los `dias` días hábiles siguientes (ver festivos_utils.calendario_habiles).
+    """
+    anios = np.asarray(inicio).astype('datetime64[Y]').astype(int) + 1970
+    # Un año tiene más de 240 días hábiles: se agrega un año por cada 240 días (o fracción)
+    return calendario_habiles(int(np.min(anios)), int(np.max(anios)) + 1 + dias // 240)
+
+
+def en_rango_habiles(fechas):
+    """
+    Indica qué fechas de una columna (datetime64) tienen un año entre ANIO_MINIMO_HABILES y
+    ANIO_MAXIMO_HABILES, para las que se calculan días hábiles (False donde no hay fecha).
+    """
+    anios = fechas.dt.year
+    return (anios >= ANIO_MINIMO_HABILES).fillna(False) & (anios <= ANIO_MAXIMO_HABILES).fillna(False)
+
+
+def sumar_dias_habiles(fechas, dias):
+    """
+    Suma días hábiles a una columna de fechas (datetime64) en una sola operación.
+    Igual que avanzar día a día desde la fecha inicial (que no se cuenta) hasta encontrar
+    el número de días hábiles indicado; se conserva la hora de cada fecha. NaT se mantiene, y
+    las fechas fuera del rango de años de los días hábiles (en_rango_habiles) dan NaT.
+    """
+    if dias == 0:
+        # Sin días que sumar la fecha no cambia (busday_offset la llevaría al hábil anterior)
+        return fechas.copy()
+    resultado = pd.Series(pd.NaT, index=fechas.index, dtype=fechas.dtype)
+    validas = en_rango_habiles(fechas)
+    if validas.any():
+        inicio = fechas[validas].to_numpy().astype('datetime64[D]')
+        # roll='backward': si el inicio no es hábil se parte del hábil anterior, con lo que
+        # el resultado es el día hábil número `dias` posterior a la fecha inicial
+        fin = np.busday_offset(inicio, dias, roll='backward', busdaycal=calendario_fechas(inicio, dias))
+        resultado[validas] = fechas[validas] + pd.to_timedelta(fin - inicio)
+    return resultado
+
+
+def sumar_dias_habiles_fecha(fecha, dias):
+    """
+    Versión de sumar_dias_habiles para una sola fecha (datetime o Timestamp).
+    Retorna None si la fecha está fuera del rango de años de los días hábiles.
+    """
+    if dias == 0:
+        return fecha
+    if not ANIO_MINIMO_HABILES <= fecha.year <= ANIO_MAXIMO_HABILES:
+        return None
+    inicio = np.datetime64(fecha.date(), 'D')
+    fin = np.busday_offset(inicio, dias, roll='backward', busdaycal=calendario_fechas(inicio, dias))
+    return fecha + timedelta(days=int((fin - inicio) / np.timedelta64(1, 'D')))
+
+
+def obtener_fecha_corte(fecha_corte=None):
+    """
+    Retorna la fecha de corte de los cálculos que dependen de la fecha actual (vencimientos,
+    días hábiles restantes, hitos completados por fecha y meta más cercana): el día indicado
+    (date, datetime o texto) o, si no se indica, hoy. Se toma el final de ese día, de modo que
+    las fechas del propio día cuentan como alcanzadas (igual que al compararlas con la hora
+    actual) y el resultado no cambia en el transcurso del día.
+    """
+    dia = pd.Timestamp(datetime.now() if fecha_corte is None else fecha_corte).normalize()
+    return dia + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)
+
+
+def dias_habiles_restantes(fechas, fecha_corte=None):
+    """
+    Días hábiles desde la fecha de corte (por defecto, hoy) hasta cada fecha de una columna (datetime64), en una
+    sola operación (numpy.busday_count). Si la fecha aún no llega, son los días hábiles que
+    quedan antes de ella (desde hoy inclusive hasta la fecha, sin contarla); si ya pasó, es el
+    negativo de los días hábiles de retraso (desde la fecha inclusive hasta hoy, sin contar hoy).
+    0 si vence hoy. Así una fecha hábil vencida es al menos -1 desde el día siguiente, aunque
+    sea fin de semana o festivo (un vencimiento del viernes es -1 el sábado, el domingo y el lunes).
+    Retorna una columna de enteros con valores faltantes donde no hay fecha o la fecha (o la
+    fecha de corte) está fuera del rango de años de los días hábiles (en_rango_habiles).
+    """
+    corte = obtener_fecha_corte(fecha_corte)
+    hoy = np.datetime64(corte.date(), 'D')
+    resultado = pd.Series(pd.NA, index=fechas.index, dtype='Int64')
+    if not ANIO_MINIMO_HABILES <= corte.year <= ANIO_MAXIMO_HABILES:
+        return resultado
+    validas = en_rango_habiles(fechas)
+    if validas.any():
+        destino = fechas[validas].to_numpy().astype('datetime64[D]')
+        calendario = calendario_fechas(np.append(destino, hoy), 0)
+        # busday_count cuenta [inicio, fin); con el inicio posterior contaría (fin, inicio], por lo
+        # que las fechas vencidas se cuentan desde la fecha hasta hoy y se cambia el signo
+        resultado[validas] = np.where(destino >= hoy,
+                                      np.busday_count(hoy, destino, busdaycal=calendario),
+                                      -np.busday_count(destino, hoy, busdaycal=calendario))
+    return resultado
+
+
+# Formatos de fecha aceptados, en orden de prioridad
+FORMATOS_FECHA = ['%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%m/%d/%Y']
 
 
 def procesar_fecha(fecha_str):
@@ -46,29 +116,72 @@ def procesar_fecha(fecha_str):
             return None
         return fecha_str
 
-    # Si es un string, procesarlo
+    # Si es un string, procesarlo (con caché, pues los registros repiten las mismas fechas)
     try:
-        # Eliminar espacios y caracteres extraños
-        fecha_str = re.sub(r'[^\d/\-]', '', str(fecha_str).strip())
+        return procesar_texto_fecha(str(fecha_str))
+    except Exception:
+        return None
 
-        # Formatos a intentar
-        formatos = ['%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%m/%d/%Y']
 
-        for formato in formatos:
-            try:
-                fecha = pd.to_datetime(fecha_str, format=formato)
-                if pd.notna(fecha):  # Verificar que no sea NaT
-                    return fecha
-            except:
-                continue
+@lru_cache(maxsize=TAMANO_CACHE_FECHAS)
+def procesar_texto_fecha(texto):
+    """Convierte un texto a fecha (Timestamp) o None. Memoizado: ver estadisticas_cache_fechas."""
+    # Eliminar espacios y caracteres extraños
+    fecha_str = re.sub(r'[^\d/\-]', '', texto.strip())
 
-        return None
-    except Exception:
-        return None
+    for formato in FORMATOS_FECHA:
+        try:
+            fecha = pd.to_datetime(fecha_str, format=formato)
+            if pd.notna(fecha):  # Verificar que no sea NaT
+                return fecha
+        except:
+            continue
+
+    return None
+
+
+def procesar_fechas_series(serie):
+    """
+    Versión vectorizada de procesar_fecha para una columna completa.
+    Retorna una columna datetime64 (NaT donde el valor no es una fecha). El formato
+    principal se intenta sobre toda la columna y los demás formatos de FORMATOS_FECHA
+    solo sobre los valores que aún no se pudieron convertir.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+
+    indice = serie.index
+    serie = serie.reset_index(drop=True)
+    resultado = pd.Series(pd.NaT, index=serie.index, dtype='datetime64[us]')
+
+    # Valores que ya son fechas (columnas de tipo object con datetime o Timestamp)
+    if serie.dtype == object:
+        es_fecha = serie.map(lambda valor: isinstance(valor, datetime)).astype(bool)
+        if es_fecha.any():
+            resultado[es_fecha] = pd.to_datetime(serie[es_fecha])
+            serie = serie[~es_fecha]
+
+    # Texto: eliminar espacios y caracteres extraños
+    texto = serie[serie.notna()].astype(str)
+    pendientes = texto[texto != ''].str.strip().str.replace(r'[^\d/\-]', '', regex=True)
+
+    for formato in FORMATOS_FECHA:
+        if pendientes.empty:
+            break
+        fechas = pd.to_datetime(pendientes, format=formato, errors='coerce')
+        convertidas = fechas.notna()
+        resultado[convertidas.index[convertidas]] = fechas[convertidas]
+        pendientes = pendientes[~convertidas]
+
+    resultado.index = indice
+    return resultado
 
 
 def formatear_fecha(fecha_str):
     """Formatea una fecha en formato DD/MM/YYYY manejando NaT."""
+    # Los textos se formatean con caché; las fechas ya convertidas se formatean directamente
+    if isinstance(fecha_str, str):
+        return formatear_texto_fecha(fecha_str)
     try:
         fecha = procesar_fecha(fecha_str)
         if fecha is not None and pd.notna(fecha):
@@ -79,6 +192,37 @@ def formatear_fecha(fecha_str):
         return ""
 
 
+@lru_cache(maxsize=TAMANO_CACHE_FECHAS)
+def formatear_texto_fecha(texto):
+    """Formatea un texto de fecha en formato DD/MM/YYYY. Memoizado: ver estadisticas_cache_fechas."""
+    try:
+        fecha = procesar_fecha(texto)
+        if fecha is not None and pd.notna(fecha):
+            return fecha.strftime('%d/%m/%Y')
+        return ""
+    except Exception:
+        return ""
+
+
+def estadisticas_cache_fechas():
+    """
+    Retorna los aciertos, fallos, tamaño y capacidad de las cachés de fechas,
+    para dimensionar TAMANO_CACHE_FECHAS.
+    """
+    return {nombre: funcion.cache_info()._asdict() for nombre, funcion in [
+        ('procesar_fecha', procesar_texto_fecha),
+        ('formatear_fecha', formatear_texto_fecha),
+    ]}
+
+
+def formatear_fechas_series(serie):
+    """
+    Versión vectorizada de formatear_fecha para una columna completa:
+    texto DD/MM/YYYY, o cadena vacía si el valor no es una fecha.
+    """
+    return procesar_fechas_series(serie).dt.strftime('%d/%m/%Y').fillna('')
+
+
 def calcular_plazo_analisis(fecha_entrega):
     """
     Calcula el plazo de análisis como 5 días hábiles después de la fecha de entrega,
@@ -89,24 +233,8 @@ def calcular_plazo_analisis(fecha_entrega):
     if fecha is None or pd.isna(fecha):
         return None
 
-    # Contador de días hábiles
-    dias_habiles = 0
-    fecha_actual = fecha
-
     # Calcular 5 días hábiles a partir de la fecha de entrega
-    while dias_habiles < 5:
-        # Avanzar un día
-        fecha_actual = fecha_actual + timedelta(days=1)
-
-        # Verificar si es día hábil (no es fin de semana ni festivo)
-        dia_semana = fecha_actual.weekday()  # 0 = lunes, 6 = domingo
-
-        # Si no es sábado (5) ni domingo (6) ni festivo, contamos como día hábil
-        if dia_semana < 5 and not es_festivo(fecha_actual):
-            dias_habiles += 1
-
-    # Retornar la fecha calculada
-    return fecha_actual
+    return sumar_dias_habiles_fecha(fecha, 5)
 
 
 def calcular_plazo_cronograma(fecha_plazo_analisis):
@@ -119,24 +247,8 @@ def calcular_plazo_cronograma(fecha_plazo_analisis):
     if fecha is None or pd.isna(fecha):
         return None
 
-    # Contador de días hábiles
-    dias_habiles = 0
-    fecha_actual = fecha
-
     # Calcular 3 días hábiles a partir del plazo de análisis
-    while dias_habiles < 3:
-        # Avanzar un día
-        fecha_actual = fecha_actual + timedelta(days=1)
-
-        # Verificar si es día hábil (no es fin de semana ni festivo)
-        dia_semana = fecha_actual.weekday()  # 0 = lunes, 6 = domingo
-
-        # Si no es sábado (5) ni domingo (6) ni festivo, contamos como día hábil
-        if dia_semana < 5 and not es_festivo(fecha_actual):
-            dias_habiles += 1
-
-    # Retornar la fecha calculada
-    return fecha_actual
+    return sumar_dias_habiles_fecha(fecha, 3)
 
 
 def calcular_plazo_oficio_cierre(fecha_publicacion):
@@ -149,158 +261,103 @@ def calcular_plazo_oficio_cierre(fecha_publicacion):
     if fecha is None or pd.isna(fecha):
         return None
 
-    # Contador de días hábiles
-    dias_habiles = 0
-    fecha_actual = fecha
-
     # Calcular 7 días hábiles a partir de la fecha de publicación
-    while dias_habiles < 7:
-        # Avanzar un día
-        fecha_actual = fecha_actual + timedelta(days=1)
-
-        # Verificar si es día hábil (no es fin de semana ni festivo)
-        dia_semana = fecha_actual.weekday()  # 0 = lunes, 6 = domingo
-
-        # Si no es sábado (5) ni domingo (6) ni festivo, contamos como día hábil
-        if dia_semana < 5 and not es_festivo(fecha_actual):
-            dias_habiles += 1
-
-    # Retornar la fecha calculada
-    return fecha_actual
+    return sumar_dias_habiles_fecha(fecha, 7)
 
 
-def actualizar_plazo_analisis(df):
+def actualizar_columna_fecha(df, idx, campo, fecha):
     """
-    Actualiza la columna 'Plazo de análisis' en el DataFrame
-    basándose en la columna 'Fecha de entrega de información'.
+    Actualiza la columna de fecha tipada de un campo (si el DataFrame la tiene) en la fila idx,
+    o en las filas indicadas si idx es una máscara booleana.
     """
-    if 'Fecha de entrega de información' not in df.columns:
-        return df
-
-    # Crear una copia del DataFrame
-    df_actualizado = df.copy()
-
-    # Iterar sobre cada fila
-    for idx, row in df.iterrows():
-        fecha_entrega = row.get('Fecha de entrega de información', None)
-        if fecha_entrega and pd.notna(fecha_entrega) and fecha_entrega != '':
-            plazo = calcular_plazo_analisis(fecha_entrega)
-            if plazo is not None:
-                df_actualizado.at[idx, 'Plazo de análisis'] = formatear_fecha(plazo)
-                
-                # Al actualizar el plazo de análisis, también actualizar el plazo de cronograma
-                plazo_cronograma = calcular_plazo_cronograma(plazo)
-                if plazo_cronograma is not None:
-                    df_actualizado.at[idx, 'Plazo de cronograma'] = formatear_fecha(plazo_cronograma)
-
-    return df_actualizado
+    columna = f"{campo}{SUFIJO_FECHA}"
+    if columna in df.columns:
+        df.loc[idx, columna] = pd.NaT if fecha is None else pd.Timestamp(fecha).normalize()
 
 
-def actualizar_plazo_cronograma(df):
+def actualizar_columna_fechas(df, campo, fechas):
     """
-    Actualiza la columna 'Plazo de cronograma' en el DataFrame
-    basándose en la columna 'Plazo de análisis'.
+    Asigna a un campo las fechas no vacías de una columna datetime64, como texto DD/MM/YYYY
+    y en la columna de fecha tipada (si el DataFrame la tiene). Las demás filas no cambian.
     """
-    if 'Plazo de análisis' not in df.columns:
-        return df
+    validas = fechas.notna()
+    if not validas.any():
+        return
+    df.loc[validas, campo] = fechas[validas].dt.strftime('%d/%m/%Y')
+    columna = f"{campo}{SUFIJO_FECHA}"
+    if columna in df.columns:
+        df.loc[validas, columna] = fechas[validas].dt.normalize()
 
-    # Crear una copia del DataFrame
-    df_actualizado = df.copy()
 
-    # Asegurarse de que la columna 'Plazo de cronograma' exista
-    if 'Plazo de cronograma' not in df_actualizado.columns:
-        df_actualizado['Plazo de cronograma'] = ''
+def obtener_fecha(df, campo):
+    """Retorna las fechas (datetime64) de un campo, usando la columna derivada si existe."""
+    derivada = f"{campo}{SUFIJO_FECHA}"
+    if derivada in df.columns:
+        return df[derivada]
+    return procesar_fechas_series(df[campo])
 
-    # Iterar sobre cada fila
-    for idx, row in df.iterrows():
-        plazo_analisis = row.get('Plazo de análisis', None)
-        if plazo_analisis and pd.notna(plazo_analisis) and plazo_analisis != '':
-            plazo_cronograma = calcular_plazo_cronograma(plazo_analisis)
-            if plazo_cronograma is not None:
-                df_actualizado.at[idx, 'Plazo de cronograma'] = formatear_fecha(plazo_cronograma)
 
-    return df_actualizado
+def fecha_fila(row, campo):
+    """
+    Retorna la fecha de un campo de una fila (datetime o None).
+    Usa la columna de fecha tipada si la fila la tiene, sin volver a interpretar el texto.
+    """
+    columna = f"{campo}{SUFIJO_FECHA}"
+    if columna in row:
+        fecha = row[columna]
+        return None if pd.isna(fecha) else fecha
+    return procesar_fecha(row.get(campo, None))
 
 
-def actualizar_plazo_oficio_cierre(df):
+def ordenar_reglas_plazos(reglas=REGLAS_PLAZOS):
+    """
+    Ordena las reglas de plazos (origen, días hábiles, plazo) de modo que cada plazo se
+    calcule después de los plazos de los que depende su campo de origen.
+    """
+    pendientes = list(reglas)
+    ordenadas = []
+    while pendientes:
+        plazos_pendientes = {plazo for _, _, plazo in pendientes}
+        listas = [regla for regla in pendientes if regla[0] not in plazos_pendientes]
+        if not listas:
+            raise ValueError("Las reglas de plazos tienen una dependencia circular")
+        ordenadas += listas
+        pendientes = [regla for regla in pendientes if regla not in listas]
+    return ordenadas
+
+
+def reglas_afectadas(campos, reglas=REGLAS_PLAZOS):
+    """Retorna, en orden de dependencias, las reglas cuyo plazo depende (directa o indirectamente) de los campos."""
+    afectados = set(campos)
+    resultado = []
+    for origen, dias, plazo in ordenar_reglas_plazos(reglas):
+        if origen in afectados:
+            resultado.append((origen, dias, plazo))
+            afectados.add(plazo)
+    return resultado
+
+
+def actualizar_plazos(df, campos=None, reglas=REGLAS_PLAZOS):
     """
-    Actualiza la columna 'Plazo de oficio de cierre' en el DataFrame
-    basándose en la columna 'Publicación'.
+    Calcula los plazos de las reglas (ver REGLAS_PLAZOS) sobre columnas completas, en orden
+    de dependencias y con una sola copia del DataFrame. Solo cambian las filas cuyo campo
+    de origen tiene fecha. Si se indican campos, solo se recalculan los plazos que dependen de ellos.
     """
-    if 'Publicación' not in df.columns:
-        return df
+    reglas = ordenar_reglas_plazos(reglas) if campos is None else reglas_afectadas(campos, reglas)
 
     # Crear una copia del DataFrame
     df_actualizado = df.copy()
 
-    # Asegurarse de que la columna 'Plazo de oficio de cierre' exista
-    if 'Plazo de oficio de cierre' not in df_actualizado.columns:
-        df_actualizado['Plazo de oficio de cierre'] = ''
+    for origen, dias, plazo in reglas:
+        if origen not in df_actualizado.columns:
+            continue
 
-    # Iterar sobre cada fila
-    for idx, row in df.iterrows():
-        fecha_publicacion = row.get('Publicación', None)
-        if fecha_publicacion and pd.notna(fecha_publicacion) and fecha_publicacion != '':
-            plazo_oficio = calcular_plazo_oficio_cierre(fecha_publicacion)
-            if plazo_oficio is not None:
-                df_actualizado.at[idx, 'Plazo de oficio de cierre'] = formatear_fecha(plazo_oficio)
+        # Asegurarse de que la columna del plazo exista
+        if plazo not in df_actualizado.columns:
+            df_actualizado[plazo] = ''
 
-    return df_actualizado
+        fechas = sumar_dias_habiles(obtener_fecha(df_actualizado, origen), dias)
+        actualizar_columna_fechas(df_actualizado, plazo, fechas)
 
+    return df_actualizado
 
-# Función para probar el cálculo del plazo de análisis
-def test_calcular_plazo_analisis():
-    fechas_prueba = [
-        "15/01/2025",
-        "27/03/2025",
-        "30/04/2025",
-        "20/12/2025"
-    ]
-
-    for fecha in fechas_prueba:
-        plazo = calcular_plazo_analisis(fecha)
-        if plazo:
-            print(f"Fecha de entrega: {fecha} -> Plazo de análisis: {formatear_fecha(plazo)}")
-        else:
-            print(f"Fecha de entrega: {fecha} -> Plazo de análisis: No se pudo calcular")
-
-
-# Función para probar el cálculo del plazo de cronograma
-def test_calcular_plazo_cronograma():
-    fechas_prueba = [
-        "22/01/2025",
-        "03/04/2025",
-        "08/05/2025",
-        "30/12/2025"
-    ]
-
-    for fecha in fechas_prueba:
-        plazo = calcular_plazo_cronograma(fecha)
-        if plazo:
-            print(f"Plazo de análisis: {fecha} -> Plazo de cronograma: {formatear_fecha(plazo)}")
-        else:
-            print(f"Plazo de análisis: {fecha} -> Plazo de cronograma: No se pudo calcular")
-
-
-# Función para probar el cálculo del plazo de oficio de cierre
-def test_calcular_plazo_oficio_cierre():
-    fechas_prueba = [
-        "15/01/2025",
-        "27/03/2025",
-        "30/04/2025",
-        "20/12/2025"
-    ]
-
-    for fecha in fechas_prueba:
-        plazo = calcular_plazo_oficio_cierre(fecha)
-        if plazo:
-            print(f"Fecha de publicación: {fecha} -> Plazo de oficio de cierre: {formatear_fecha(plazo)}")
-        else:
-            print(f"Fecha de publicación: {fecha} -> Plazo de oficio de cierre: No se pudo calcular")
-
-
-if __name__ == "__main__":
-    # Ejecutar pruebas
-    test_calcular_plazo_analisis()
-    test_calcular_plazo_cronograma()
-    test_calcular_plazo_oficio_cierre()
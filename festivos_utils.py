@@ -0,0 +1,97 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+import numpy as np
+
+# Festivos de fecha fija (mes, día, nombre): no se trasladan
+FESTIVOS_FIJOS = [
+    (1, 1, 'Año Nuevo'),
+    (5, 1, 'Día del Trabajo'),
+    (7, 20, 'Día de la Independencia'),
+    (8, 7, 'Batalla de Boyacá'),
+    (12, 8, 'Día de la Inmaculada Concepción'),
+    (12, 25, 'Navidad'),
+]
+
+# Festivos que se trasladan al lunes siguiente (Ley Emiliani, Ley 51 de 1983)
+FESTIVOS_EMILIANI = [
+    (1, 6, 'Día de los Reyes Magos'),
+    (3, 19, 'Día de San José'),
+    (6, 29, 'San Pedro y San Pablo'),
+    (8, 15, 'Asunción de la Virgen'),
+    (10, 12, 'Día de la Raza'),
+    (11, 1, 'Todos los Santos'),
+    (11, 11, 'Independencia de Cartagena'),
+]
+
+# Festivos relativos al Domingo de Pascua: (días desde Pascua, se traslada al lunes, nombre)
+FESTIVOS_PASCUA = [
+    (-3, False, 'Jueves Santo'),
+    (-2, False, 'Viernes Santo'),
+    (39, True, 'Ascensión del Señor'),
+    (60, True, 'Corpus Christi'),
+    (68, True, 'Sagrado Corazón'),
+]
+
+
+def calcular_domingo_pascua(anio):
+    """Calcula el Domingo de Pascua de un año (algoritmo de Gauss/Meeus para el calendario gregoriano)."""
+    a = anio % 19
+    b, c = divmod(anio, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(anio, mes, dia + 1)
+
+
+def trasladar_a_lunes(fecha):
+    """Retorna la fecha si es lunes o, si no, el lunes siguiente."""
+    return fecha + timedelta(days=(7 - fecha.weekday()) % 7)
+
+
+@lru_cache(maxsize=None)
+def festivos_anio(anio):
+    """
+    Retorna los festivos de Colombia de un año como tupla ordenada de (fecha, nombre).
+    Dos festivos pueden caer el mismo día (por ejemplo, al trasladarse al mismo lunes).
+    """
+    festivos = [(date(anio, mes, dia), nombre) for mes, dia, nombre in FESTIVOS_FIJOS]
+    festivos += [(trasladar_a_lunes(date(anio, mes, dia)), nombre) for mes, dia, nombre in FESTIVOS_EMILIANI]
+
+    pascua = calcular_domingo_pascua(anio)
+    for dias, trasladar, nombre in FESTIVOS_PASCUA:
+        fecha = pascua + timedelta(days=dias)
+        festivos.append((trasladar_a_lunes(fecha) if trasladar else fecha, nombre))
+
+    return tuple(sorted(festivos))
+
+
+@lru_cache(maxsize=None)
+def conjunto_festivos(anio):
+    """Retorna las fechas festivas de un año como conjunto, para consultas en tiempo constante."""
+    return frozenset(fecha for fecha, _ in festivos_anio(anio))
+
+
+def festivos_rango(anio_inicio, anio_fin):
+    """Retorna las fechas festivas (sin repetir, ordenadas) de los años anio_inicio a anio_fin, inclusive."""
+    return sorted(set().union(*(conjunto_festivos(anio) for anio in range(anio_inicio, anio_fin + 1))))
+
+
+def es_festivo(fecha):
+    """Verifica si una fecha es festivo en Colombia."""
+    if isinstance(fecha, datetime):
+        fecha = fecha.date()
+    return fecha in conjunto_festivos(fecha.year)
+
+
+@lru_cache(maxsize=32)
+def calendario_habiles(anio_inicio, anio_fin):
+    """
+    Retorna el calendario de días hábiles (lunes a viernes, sin festivos) de los años
+    anio_inicio a anio_fin, inclusive, para numpy.busday_offset.
+    """
+    return np.busdaycalendar(weekmask='1111100', holidays=festivos_rango(anio_inicio, anio_fin))
@@ -0,0 +1,86 @@
+import random
+import shutil
+from datetime import timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from constants import CAMPOS_COMPLETO, CAMPOS_FECHA_REGISTRO, CAMPOS_SI_NO
+from data_utils import aplicar_esquema, limpiar_columna
+from festivos_utils import conjunto_festivos
+
+# Archivo de registros del repositorio (las pruebas trabajan sobre una copia, ver ruta)
+REGISTROS_CSV = Path(__file__).resolve().parent.parent / 'registros.csv'
+
+# Valores con los que se generan los registros: válidos, equivalentes, vacíos y basura
+FECHAS = ['', '  ', '01/02/2025', '15/03/2025', '2025-04-10', 'abc', '30/12/2024', '05/06/2026', None]
+VALORES_SI_NO = ['', 'Si', 'No', ' si ', 'N', 'S', 'YES', 'x', None, 'Sí']
+VALORES_COMPLETO = ['', 'Completo', 'En proceso', 'Sin iniciar', 'Completo ', None]
+ESTADOS = ['', 'Completado', 'En proceso', 'Finalizado', None]
+
+COLUMNAS_REGISTROS = (['Cod', 'Entidad', 'Nivel Información '] + CAMPOS_SI_NO + CAMPOS_COMPLETO +
+                      CAMPOS_FECHA_REGISTRO + ['Estado'])
+
+
+def generar_registros(n, semilla=0, tipado=True):
+    """Registros aleatorios (limpios como al cargarlos) con las columnas de las reglas de negocio."""
+    rng = random.Random(semilla)
+    datos = {}
+    for columna in COLUMNAS_REGISTROS:
+        if columna in CAMPOS_COMPLETO:
+            opciones = VALORES_COMPLETO
+        elif columna in CAMPOS_SI_NO:
+            opciones = VALORES_SI_NO
+        elif columna in CAMPOS_FECHA_REGISTRO:
+            opciones = FECHAS
+        elif columna == 'Estado':
+            opciones = ESTADOS
+        else:
+            opciones = ['A', 'B', 'C']
+        datos[columna] = [rng.choice(opciones) for _ in range(n)]
+    datos['Cod'] = [str(i) for i in range(n)]
+
+    df = pd.DataFrame(datos)
+    for columna in df.columns:
+        df[columna] = limpiar_columna(df[columna])
+    # Índice no consecutivo, como el de un DataFrame filtrado
+    df.index = df.index * 3 + 7
+    return aplicar_esquema(df) if tipado else df
+
+
+def es_habil(dia):
+    return dia.weekday() < 5 and dia not in conjunto_festivos(dia.year)
+
+
+def sumar_dia_a_dia(fecha, dias):
+    """Referencia: avanzar día a día desde la fecha (que no se cuenta) hasta contar los días hábiles."""
+    resultado, contados = fecha, 0
+    while contados < dias:
+        resultado += timedelta(days=1)
+        if es_habil(resultado.date()):
+            contados += 1
+    return resultado
+
+
+def restantes_dia_a_dia(destino, hoy):
+    """Referencia: hábiles en [hoy, destino) si la fecha no ha llegado, o -hábiles en [destino, hoy)."""
+    desde, hasta, signo = (hoy, destino, 1) if destino >= hoy else (destino, hoy, -1)
+    dias, dia = 0, desde
+    while dia < hasta:
+        dias += es_habil(dia)
+        dia += timedelta(days=1)
+    return signo * dias
+
+
+@pytest.fixture(params=[True, False], ids=['tipado', 'texto'])
+def registros(request):
+    return generar_registros(200, semilla=21, tipado=request.param)
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    """Copia de registros.csv en un directorio temporal."""
+    ruta = tmp_path / 'registros.csv'
+    shutil.copy(REGISTROS_CSV, ruta)
+    return ruta
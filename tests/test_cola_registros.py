@@ -0,0 +1,123 @@
+import pandas as pd
+import pytest
+
+import data_utils
+import validaciones_utils
+from constants import COLUMNAS_PLAZOS, COLUMNAS_TABLERO
+from data_utils import (actualizar_plazos_con_cache, cargar_con_cache, filas_agregadas, filas_distintas,
+                        guardar_datos_editados, guardar_filas_agregadas, leer_cola_registros, leer_registros,
+                        texto_columna)
+from fecha_utils import actualizar_plazos
+from validaciones_utils import validar_reglas_negocio, validar_reglas_negocio_con_cache
+
+def agregar_filas(ruta, n, vacios=()):
+    """Agrega al final n copias de la última fila con Cod, Entidad y Estado nuevos (y los campos vacios en blanco)."""
+    lineas = ruta.read_bytes().decode('utf-8').splitlines()
+    encabezado, ultima = lineas[0].split(';'), lineas[-1].split(';')
+    nuevas = []
+    for i in range(n):
+        fila = list(ultima)
+        fila[encabezado.index('Cod')] = f"9{i:03d}"
+        fila[encabezado.index('Entidad')] = f"Entidad nueva {i % 2}"
+        fila[encabezado.index('Estado')] = 'Completado'
+        for campo in vacios:
+            fila[encabezado.index(campo)] = ''
+        nuevas.append(';'.join(fila) + '\r\n')
+    with open(ruta, 'ab') as archivo:
+        archivo.write(''.join(nuevas).encode('utf-8'))
+
+
+def cargar(ruta, columnas, lecturas):
+    def lector(ruta):
+        lecturas.append('completa')
+        return leer_registros(ruta, columnas)
+
+    def lector_cola(ruta, df, desde):
+        lecturas.append('cola')
+        return leer_cola_registros(ruta, df, desde, columnas)
+
+    return cargar_con_cache(str(ruta), lector, clave=f"{ruta} {columnas}", lector_cola=lector_cola)
+
+
+@pytest.mark.parametrize('columnas', [None, COLUMNAS_TABLERO], ids=['todas', 'tablero'])
+def test_filas_agregadas_igual_que_lectura_completa(ruta, columnas):
+    lecturas = []
+    cargar(ruta, columnas, lecturas)
+    agregar_filas(ruta, 3)
+    registros = cargar(ruta, columnas, lecturas)
+
+    assert lecturas == ['completa', 'cola']
+    pd.testing.assert_frame_equal(registros, leer_registros(str(ruta), columnas))
+
+    agregar_filas(ruta, 1)
+    pd.testing.assert_frame_equal(cargar(ruta, columnas, lecturas), leer_registros(str(ruta), columnas))
+    assert lecturas == ['completa', 'cola', 'cola']
+
+
+def test_cambio_en_el_contenido_anterior_relee_el_archivo(ruta):
+    lecturas = []
+    cargar(ruta, None, lecturas)
+    contenido = ruta.read_bytes()
+    ruta.write_bytes(contenido.replace(b'Completado', b'En proceso', 1) if b'Completado' in contenido
+                     else contenido.replace(b';', b'; ', 1))
+    agregar_filas(ruta, 2)
+    registros = cargar(ruta, None, lecturas)
+
+    assert lecturas == ['completa', 'completa']
+    pd.testing.assert_frame_equal(registros, leer_registros(str(ruta)))
+
+
+def test_plazos_y_reglas_solo_para_filas_agregadas(ruta, monkeypatch):
+    lecturas, calculados = [], []
+    registros = cargar(ruta, None, lecturas)
+    actualizar_plazos_con_cache(registros, str(ruta))
+    validar_reglas_negocio_con_cache(registros, ruta=str(ruta))
+    agregar_filas(ruta, 3, vacios=COLUMNAS_PLAZOS)
+    registros = cargar(ruta, None, lecturas)
+
+    def contar(funcion):
+        def envoltura(df, *args, **kwargs):
+            calculados.append(len(df))
+            return funcion(df, *args, **kwargs)
+        return envoltura
+
+    monkeypatch.setattr(data_utils, 'actualizar_plazos', contar(actualizar_plazos))
+    monkeypatch.setattr(validaciones_utils, 'validar_reglas_negocio', contar(validar_reglas_negocio))
+    plazos = actualizar_plazos_con_cache(registros.copy(), str(ruta))
+    validados = validar_reglas_negocio_con_cache(registros, ruta=str(ruta))
+
+    assert calculados == [3, 3]
+    pd.testing.assert_frame_equal(plazos, actualizar_plazos(registros))
+    esperados = validar_reglas_negocio(registros)
+    assert validados.columns.equals(esperados.columns)
+    assert not filas_distintas(validados, esperados, esperados.columns).any()
+
+
+def test_guardar_plazos_de_filas_agregadas_sin_reescribir_el_archivo(ruta):
+    # Plazos al día en las filas existentes (el archivo completo se guarda con sus saltos de línea)
+    assert guardar_datos_editados(actualizar_plazos(leer_registros(str(ruta))), str(ruta))[0]
+    assert b'\n' not in ruta.read_bytes().replace(b'\r\n', b'')
+    lecturas = []
+    cargar(ruta, COLUMNAS_TABLERO, lecturas)
+    agregar_filas(ruta, 2, vacios=COLUMNAS_PLAZOS)
+    contenido = ruta.read_bytes()
+    registros = cargar(ruta, COLUMNAS_TABLERO, lecturas)
+    inicio = filas_agregadas(str(ruta), f"{ruta} {COLUMNAS_TABLERO}")
+    plazos_cargados = registros[COLUMNAS_PLAZOS].copy()
+    registros = actualizar_plazos(registros)
+
+    cambiados = filas_distintas(registros, plazos_cargados, COLUMNAS_PLAZOS)
+    assert inicio['filas'] == len(registros) - 2 and cambiados.any() and not cambiados[:inicio['filas']].any()
+    assert guardar_filas_agregadas(registros, COLUMNAS_PLAZOS, inicio, str(ruta))[0]
+
+    # El contenido anterior y los saltos de línea del archivo se conservan
+    guardado = ruta.read_bytes()
+    assert guardado[:inicio['bytes']] == contenido[:inicio['bytes']]
+    assert guardado.count(b'\n') == guardado.count(b'\r\n') == contenido.count(b'\r\n')
+
+    # La siguiente carga solo vuelve a leer las filas reescritas
+    recargados = cargar(ruta, COLUMNAS_TABLERO, lecturas)
+    assert lecturas == ['completa', 'cola', 'cola']
+    pd.testing.assert_frame_equal(recargados, leer_registros(str(ruta), COLUMNAS_TABLERO))
+    for columna in COLUMNAS_PLAZOS:
+        assert texto_columna(recargados[columna]).equals(texto_columna(registros[columna]))
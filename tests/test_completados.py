@@ -0,0 +1,29 @@
+import pytest
+
+from constants import CAMPOS_FECHA
+from data_utils import (completados_por_hito_df, contar_registros_completados_por_fecha, procesar_fecha,
+                        verificar_completado_por_fecha)
+from fecha_utils import obtener_fecha_corte
+
+
+def completado_registro(row, columna_fecha_programada, columna_fecha_completado, fecha_corte):
+    """Referencia: el criterio de completado evaluado registro por registro."""
+    if not row.get(columna_fecha_programada):
+        return False
+    fecha_completado = None
+    if row.get(columna_fecha_completado):
+        fecha_completado = procesar_fecha(row[columna_fecha_completado])
+        if fecha_completado is None and str(row[columna_fecha_completado]).strip().upper() in [
+                'SI', 'SÍ', 'S', 'YES', 'Y', 'COMPLETO']:
+            fecha_completado = obtener_fecha_corte(fecha_corte)
+    return verificar_completado_por_fecha(row[columna_fecha_programada], fecha_completado, fecha_corte)
+
+
+@pytest.mark.parametrize('corte', ['2025-01-15', '2025-04-10', '2026-12-31'])
+def test_completados_igual_que_por_registro(registros, corte):
+    completados = completados_por_hito_df(registros, corte)
+
+    for hito, campo_programado in CAMPOS_FECHA.items():
+        esperados = [completado_registro(row, campo_programado, hito, corte) for _, row in registros.iterrows()]
+        assert completados[hito].tolist() == esperados
+        assert contar_registros_completados_por_fecha(registros, campo_programado, hito, corte) == sum(esperados)
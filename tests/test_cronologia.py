@@ -0,0 +1,73 @@
+import pandas as pd
+
+from constants import (CAMPOS_COMPLETO, CAMPOS_FECHA_OFICIO_CIERRE, CAMPOS_SI_NO_OFICIO_CIERRE,
+                       CRONOLOGIA_HITOS)
+from data_utils import aplicar_esquema
+from fecha_utils import procesar_fecha
+from validaciones_utils import (aplicar_reglas_negocio, bits_pares, describir_par, pares_cronologia,
+                                pares_fuera_de_orden, reporte_cronologia, violaciones_cronologia)
+
+
+def pares_fuera_de_orden_registro(row):
+    """Referencia: pares (anterior, posterior) de un registro con la fecha anterior posterior a la otra."""
+    pares = []
+    for i, anterior in enumerate(CRONOLOGIA_HITOS):
+        for posterior in CRONOLOGIA_HITOS[i + 1:]:
+            fecha_anterior = procesar_fecha(row.get(anterior))
+            fecha_posterior = procesar_fecha(row.get(posterior))
+            if fecha_anterior is not None and fecha_posterior is not None and fecha_anterior > fecha_posterior:
+                pares.append((anterior, posterior))
+    return pares
+
+
+def test_violaciones_cronologia_igual_que_por_registro(registros):
+    violaciones = violaciones_cronologia(registros)
+
+    assert violaciones.index.equals(registros.index)
+    encontrados = set()
+    for idx, row in registros.iterrows():
+        pares = pares_fuera_de_orden_registro(row)
+        assert violaciones[idx] == bits_pares(pares)
+        assert pares_fuera_de_orden(violaciones.loc[[idx]]) == pares
+        encontrados.update(pares)
+
+    assert encontrados
+    assert pares_fuera_de_orden(violaciones) == [par for par in pares_cronologia() if par in encontrados]
+
+
+def test_violaciones_cronologia_sin_columnas_o_sin_registros(registros):
+    sin_columnas = registros.drop(columns=[col for col in registros.columns if col.startswith('Publicación')])
+    violaciones = violaciones_cronologia(sin_columnas)
+    for idx, row in sin_columnas.iterrows():
+        assert violaciones[idx] == bits_pares(pares_fuera_de_orden_registro(row))
+
+    vacio = violaciones_cronologia(registros.iloc[:0])
+    assert vacio.empty and vacio.dtype == 'int64'
+    assert pares_fuera_de_orden(vacio) == []
+
+
+def test_reporte_cronologia(registros):
+    reporte = reporte_cronologia(registros)
+    violaciones = violaciones_cronologia(registros)
+
+    assert reporte.index.equals(registros.index[(violaciones != 0).to_numpy()])
+    for idx, row in reporte.iterrows():
+        pares = pares_fuera_de_orden_registro(registros.loc[idx])
+        assert row['Cronología'] == bits_pares(pares)
+        assert row['Fechas fuera de orden'] == '; '.join(describir_par(par) for par in pares)
+
+
+def test_fechas_fuera_de_orden_no_se_corrigen():
+    # Registro cerrado correctamente, salvo que la suscripción es posterior al oficio de cierre
+    registro = {campo: 'Si' for campo in CAMPOS_SI_NO_OFICIO_CIERRE}
+    registro.update({campo: 'Completo' for campo in CAMPOS_COMPLETO})
+    registro.update({campo: '01/03/2025' for campo in CAMPOS_FECHA_OFICIO_CIERRE})
+    registro.update({'Suscripción acuerdo de compromiso': '15/06/2025', 'Fecha de oficio de cierre': '01/04/2025',
+                     'Estado': 'Completado'})
+    df = aplicar_esquema(pd.DataFrame([registro]))
+
+    validados, cambios = aplicar_reglas_negocio(df)
+    assert cambios.empty
+    assert validados.at[0, 'Fecha de oficio de cierre'] == '01/04/2025'
+    assert validados.at[0, 'Estado'] == 'Completado'
+    assert violaciones_cronologia(validados)[0] != 0
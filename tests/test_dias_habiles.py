@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from fecha_utils import (calcular_plazo_analisis, calcular_plazo_cronograma, calcular_plazo_oficio_cierre,
+                         procesar_fechas_series, sumar_dias_habiles, sumar_dias_habiles_fecha)
+from tests.conftest import sumar_dia_a_dia
+
+
+@pytest.fixture
+def fechas():
+    # Todos los días de 2024 a 2026 (fines de semana, festivos, fin de año), con hora y NaT
+    dias = pd.Series(pd.date_range('2024-01-01', '2026-12-31', freq='D'))
+    dias[::7] += pd.Timedelta(hours=15, minutes=30)
+    dias[5::11] = pd.NaT
+    return dias
+
+
+@pytest.mark.parametrize('dias', [0, 1, 3, 5, 7, 300])
+def test_sumar_dias_habiles_igual_que_dia_a_dia(fechas, dias):
+    resultado = sumar_dias_habiles(fechas, dias)
+
+    assert resultado.index.equals(fechas.index)
+    for fecha, plazo in zip(fechas, resultado):
+        if pd.isna(fecha):
+            assert pd.isna(plazo)
+        else:
+            assert plazo == sumar_dia_a_dia(fecha, dias)
+
+
+@pytest.mark.parametrize('dias', [0, 1, 5, 7])
+def test_sumar_dias_habiles_fecha_igual_que_dia_a_dia(fechas, dias):
+    for fecha in fechas.dropna()[::5]:
+        assert sumar_dias_habiles_fecha(fecha.to_pydatetime(), dias) == sumar_dia_a_dia(fecha, dias)
+
+
+def test_plazos_saltan_festivos_y_fines_de_semana():
+    # Viernes 20/06/2025: el lunes 23/06 (Corpus Christi) y el lunes 30/06 (San Pedro) son festivos
+    assert calcular_plazo_analisis('20/06/2025') == pd.Timestamp('2025-07-01')
+    assert calcular_plazo_cronograma('27/06/2025') == pd.Timestamp('2025-07-03')
+    # Jueves 18/12/2025: Navidad y Año Nuevo no son hábiles
+    assert calcular_plazo_oficio_cierre('18/12/2025') == pd.Timestamp('2025-12-30')
+    assert calcular_plazo_analisis('') is None
+    assert calcular_plazo_analisis('abc') is None
+
+
+def test_fechas_fuera_del_rango_de_anios():
+    # 31/12/9999 ("sin plazo") y años mal digitados no se calculan, sin afectar las demás fechas
+    fechas = procesar_fechas_series(pd.Series(['31/12/9999', '01/01/1025', '20/06/2025', '']))
+    plazos = sumar_dias_habiles(fechas, 5)
+
+    assert plazos.isna().tolist() == [True, True, False, True]
+    assert plazos[2] == pd.Timestamp('2025-07-01')
+    assert calcular_plazo_analisis('31/12/9999') is None
+    assert calcular_plazo_analisis('01/01/1025') is None
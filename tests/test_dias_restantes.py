@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from fecha_utils import dias_habiles_restantes, procesar_fechas_series
+from tests.conftest import restantes_dia_a_dia
+
+
+@pytest.mark.parametrize('corte', ['2025-01-01', '2025-06-21', '2025-06-23', '2025-12-24', '2026-03-02'])
+def test_dias_habiles_restantes_igual_que_dia_a_dia(corte):
+    fechas = pd.Series(pd.date_range('2024-10-01', '2026-06-30', freq='D'))
+    fechas[::13] = pd.NaT
+    fechas[::6] += pd.Timedelta(hours=17)
+    resultado = dias_habiles_restantes(fechas, corte)
+
+    hoy = pd.Timestamp(corte).date()
+    for fecha, dias in zip(fechas, resultado):
+        if pd.isna(fecha):
+            assert pd.isna(dias)
+        else:
+            assert dias == restantes_dia_a_dia(fecha.date(), hoy)
+
+
+@pytest.mark.parametrize('corte, esperado', [
+    ('2025-06-13', 0),    # vence hoy (viernes)
+    ('2025-06-14', -1),   # sábado: el viernes ya es un día hábil de retraso
+    ('2025-06-15', -1),   # domingo
+    ('2025-06-16', -1),   # lunes: hoy no se cuenta
+    ('2025-06-17', -2),
+    ('2025-06-12', 1),    # jueves: queda un día hábil (hoy)
+])
+def test_vencimiento_del_viernes_visto_en_fin_de_semana(corte, esperado):
+    fechas = pd.Series(pd.to_datetime(['2025-06-13']))
+    assert dias_habiles_restantes(fechas, corte).iloc[0] == esperado
+
+
+def test_festivo_no_cuenta_como_retraso():
+    # Vence el viernes 27/06/2025; el lunes 30/06 es festivo (San Pedro y San Pablo)
+    fechas = pd.Series(pd.to_datetime(['2025-06-27']))
+    assert dias_habiles_restantes(fechas, '2025-07-01').iloc[0] == -1
+    assert dias_habiles_restantes(fechas, '2025-07-02').iloc[0] == -2
+
+
+def test_fechas_fuera_del_rango_de_anios():
+    fechas = procesar_fechas_series(pd.Series(['31/12/9999', '01/01/1025', '16/06/2025']))
+
+    assert dias_habiles_restantes(fechas, '2025-06-13').tolist() == [pd.NA, pd.NA, 1]
+    assert dias_habiles_restantes(fechas, '9999-12-31').isna().all()
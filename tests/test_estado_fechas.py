@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+from constants import CAMPOS_FECHA, DIAS_ALERTA
+from data_utils import aplicar_esquema, verificar_estado_fechas, verificar_estado_fechas_df
+
+
+@pytest.mark.parametrize('corte', ['2025-01-15', '2025-03-01', '2025-05-20'])
+def test_estado_fechas_df_igual_que_por_registro(registros, corte):
+    estados = verificar_estado_fechas_df(registros, corte)
+    for idx, row in registros.iterrows():
+        assert estados[idx] == verificar_estado_fechas(row, corte)
+
+
+def test_ventana_de_alerta():
+    corte = pd.Timestamp('2025-06-02')
+    fechas = [corte + pd.Timedelta(days=dias) for dias in (DIAS_ALERTA, DIAS_ALERTA + 1, -1)]
+    df = pd.DataFrame({campo: '' for campo in CAMPOS_FECHA.values()}, index=range(3))
+    df[CAMPOS_FECHA['Estándares']] = [fecha.strftime('%d/%m/%Y') for fecha in fechas]
+    aplicar_esquema(df)
+
+    assert verificar_estado_fechas_df(df, corte).tolist() == ['proximo', 'normal', 'vencido']
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from fecha_utils import formatear_fecha, formatear_fechas_series, procesar_fecha, procesar_fechas_series
+
+# Textos en todos los formatos aceptados (FORMATOS_FECHA), ambiguos, inválidos y con caracteres extraños
+TEXTOS = ['01/02/2025', '1/2/2025', '31/12/2024', '2025-04-10', '10-04-2025', '12/31/2024', '02/13/2025',
+          '29/02/2024', '29/02/2025', '30/02/2025', ' 15/03/2025 ', '15/03/2025 00:00', 'abc', '', '  ',
+          '15.03.2025', '2025/04/10', '15/03/25', '0/0/0', '99/99/9999', '\t05/06/2026\n', '05-06-2026x']
+
+
+@pytest.mark.parametrize('serie', [
+    pd.Series(TEXTOS * 3),
+    pd.Series(TEXTOS + [None, float('nan')], dtype=object),
+    pd.Series(TEXTOS + [datetime(2025, 5, 4, 10, 30), pd.Timestamp('2024-02-29'), None], dtype=object),
+], ids=['texto', 'faltantes', 'fechas'])
+def test_procesar_fechas_series_igual_que_procesar_fecha(serie):
+    serie.index = serie.index * 2 + 1
+    resultado = procesar_fechas_series(serie)
+
+    assert resultado.index.equals(serie.index)
+    for valor, fecha in zip(serie, resultado):
+        esperado = procesar_fecha(valor)
+        if esperado is None:
+            assert pd.isna(fecha), valor
+        else:
+            assert fecha == esperado, valor
+
+
+def test_formatear_fechas_series_igual_que_formatear_fecha():
+    serie = pd.Series(TEXTOS + [None], dtype=object)
+    assert formatear_fechas_series(serie).tolist() == [formatear_fecha(valor) for valor in serie]
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from fecha_utils import (actualizar_plazos, calcular_plazo_analisis, calcular_plazo_cronograma,
+                         calcular_plazo_oficio_cierre, obtener_fecha, ordenar_reglas_plazos, procesar_fecha)
+from tests.conftest import sumar_dia_a_dia
+
+
+@pytest.mark.parametrize('calcular, dias, fechas', [
+    (calcular_plazo_analisis, 5, ['15/01/2025', '27/03/2025', '30/04/2025', '20/12/2025']),
+    (calcular_plazo_cronograma, 3, ['22/01/2025', '03/04/2025', '08/05/2025', '30/12/2025']),
+    (calcular_plazo_oficio_cierre, 7, ['15/01/2025', '27/03/2025', '30/04/2025', '20/12/2025']),
+])
+def test_calcular_plazos(calcular, dias, fechas):
+    for fecha in fechas:
+        assert calcular(fecha) == sumar_dia_a_dia(procesar_fecha(fecha), dias)
+
+
+def test_actualizar_plazos_igual_que_por_registro(registros):
+    actualizados = actualizar_plazos(registros)
+
+    assert actualizados.index.equals(registros.index)
+    for idx, row in registros.iterrows():
+        plazo_analisis = calcular_plazo_analisis(row['Fecha de entrega de información'])
+        if plazo_analisis is None:
+            plazo_analisis = procesar_fecha(row['Plazo de análisis'])
+        plazo_cronograma = calcular_plazo_cronograma(plazo_analisis)
+        if plazo_cronograma is None:
+            plazo_cronograma = procesar_fecha(row['Plazo de cronograma'])
+        plazo_oficio = calcular_plazo_oficio_cierre(row['Publicación'])
+        if plazo_oficio is None:
+            plazo_oficio = procesar_fecha(row['Plazo de oficio de cierre'])
+
+        for campo, esperado in [('Plazo de análisis', plazo_analisis), ('Plazo de cronograma', plazo_cronograma),
+                                ('Plazo de oficio de cierre', plazo_oficio)]:
+            assert procesar_fecha(actualizados.at[idx, campo]) == esperado
+            assert procesar_fecha(obtener_fecha(actualizados, campo)[idx]) == esperado
+
+
+def test_actualizar_plazos_solo_los_afectados(registros):
+    actualizados = actualizar_plazos(registros, ['Publicación'])
+
+    pd.testing.assert_series_equal(actualizados['Plazo de análisis'], registros['Plazo de análisis'])
+    pd.testing.assert_series_equal(actualizados['Plazo de oficio de cierre'],
+                                   actualizar_plazos(registros)['Plazo de oficio de cierre'])
+
+
+def test_reglas_de_plazos_circulares():
+    with pytest.raises(ValueError):
+        ordenar_reglas_plazos([('A', 1, 'B'), ('B', 1, 'A')])
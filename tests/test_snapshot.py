@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import data_utils
+from constants import COLUMNAS_TABLERO
+from data_utils import (escribir_snapshot, firma_archivo, leer_registros, leer_registros_con_snapshot,
+                        leer_snapshot, ruta_snapshot)
+
+pytest.importorskip('pyarrow')
+
+def test_snapshot_se_lee_con_la_misma_firma_y_version(ruta):
+    registros = leer_registros(ruta)
+    escribir_snapshot(registros, ruta, firma_archivo(ruta))
+
+    pd.testing.assert_frame_equal(leer_snapshot(ruta, firma_archivo(ruta)), registros)
+
+
+def test_snapshot_se_descarta_si_cambia_la_version_del_esquema(ruta, monkeypatch):
+    escribir_snapshot(leer_registros(ruta), ruta, firma_archivo(ruta))
+
+    monkeypatch.setattr(data_utils, 'VERSION_ESQUEMA', data_utils.VERSION_ESQUEMA + 1)
+    assert leer_snapshot(ruta, firma_archivo(ruta)) is None
+
+
+def test_snapshot_se_descarta_si_cambia_el_csv(ruta):
+    escribir_snapshot(leer_registros(ruta), ruta, firma_archivo(ruta))
+
+    with open(ruta, 'a', encoding='utf-8') as archivo:
+        archivo.write('\n')
+    assert leer_snapshot(ruta, firma_archivo(ruta)) is None
+    assert Path(ruta_snapshot(ruta)).exists()
+
+
+def test_lectura_de_columnas_regenera_el_snapshot(ruta):
+    registros = leer_registros_con_snapshot(ruta, COLUMNAS_TABLERO)
+
+    pd.testing.assert_frame_equal(registros, leer_registros(ruta, COLUMNAS_TABLERO))
+    pd.testing.assert_frame_equal(leer_snapshot(ruta, firma_archivo(ruta)), leer_registros(ruta))
+    pd.testing.assert_frame_equal(leer_snapshot(ruta, firma_archivo(ruta), COLUMNAS_TABLERO), registros)
@@ -0,0 +1,65 @@
+import pandas as pd
+
+from data_utils import aplicar_esquema, es_columna_derivada, sin_columnas_derivadas, texto_columna
+from fecha_utils import procesar_fecha
+from validaciones_utils import (aplicar_reglas_negocio, incumplimientos_reglas, validar_reglas_negocio,
+                                verificar_condicion_publicacion, verificar_condiciones_estandares,
+                                verificar_condiciones_oficio_cierre)
+
+
+def tiene_fecha(row, campo):
+    return procesar_fecha(row[campo]) is not None
+
+
+def test_incumplimientos_coinciden_con_verificacion_por_registro(registros):
+    incumplidas = incumplimientos_reglas(registros)
+
+    for idx, row in registros.iterrows():
+        assert incumplidas.at[idx, 'Estándares'] == (
+            tiene_fecha(row, 'Estándares') and not verificar_condiciones_estandares(row)[0])
+        assert incumplidas.at[idx, 'Publicación'] == (
+            tiene_fecha(row, 'Publicación') and not verificar_condicion_publicacion(row))
+        assert incumplidas.at[idx, 'Oficio de cierre'] == (
+            tiene_fecha(row, 'Fecha de oficio de cierre') and not verificar_condiciones_oficio_cierre(row)[0])
+
+
+def test_validar_reglas_negocio_deja_registros_validos(registros):
+    validados = validar_reglas_negocio(registros)
+
+    assert validados.index.equals(registros.index)
+    for _, row in validados.iterrows():
+        if tiene_fecha(row, 'Estándares'):
+            assert verificar_condiciones_estandares(row)[0]
+        if tiene_fecha(row, 'Publicación'):
+            assert verificar_condicion_publicacion(row)
+        oficio_valido = tiene_fecha(row, 'Fecha de oficio de cierre') and verificar_condiciones_oficio_cierre(row)[0]
+        if tiene_fecha(row, 'Fecha de oficio de cierre'):
+            assert oficio_valido
+        assert (row['Estado'] == 'Completado') == oficio_valido
+
+
+def test_aplicar_reglas_negocio_registra_cada_cambio(registros):
+    validados, cambios = aplicar_reglas_negocio(registros)
+
+    pd.testing.assert_frame_equal(validados, validar_reglas_negocio(registros))
+    assert not cambios.empty
+
+    # Las celdas modificadas son exactamente las registradas, con su último valor
+    for campo in sin_columnas_derivadas(registros).columns:
+        antes, despues = texto_columna(registros[campo]), texto_columna(validados[campo])
+        modificadas = set(registros.index[(antes != despues).to_numpy()])
+        del_campo = cambios[cambios['Campo'] == campo]
+        assert set(del_campo.index) >= modificadas
+        for idx, valor in del_campo.groupby(level=0)['Valor nuevo'].last().items():
+            assert despues[idx] == valor
+
+    # Las columnas derivadas de las celdas modificadas siguen al texto
+    derivadas = [col for col in validados.columns if es_columna_derivada(col)]
+    if derivadas:
+        recalculadas = aplicar_esquema(sin_columnas_derivadas(validados).copy())
+        pd.testing.assert_frame_equal(validados[derivadas], recalculadas[derivadas])
+
+    # Los registros validados ya cumplen todas las reglas
+    assert not incumplimientos_reglas(validados).any().any()
+    assert aplicar_reglas_negocio(validados)[1].empty
+
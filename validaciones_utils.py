@@ -1,14 +1,282 @@
 # Validaciones_utils.py actualizado
 import pandas as pd
 import numpy as np
-from data_utils import procesar_fecha
-from datetime import datetime
+from data_utils import (asignar_valores, texto_columna, obtener_fecha, obtener_bool, cargar_con_cache, firma_archivo,
+                        columna_fecha, columna_bool, filas_distintas)
+from constants import VALORES_NO, REGLAS_VALIDACION, CRONOLOGIA_HITOS
+
+
+def texto_campo(df, campo):
+    """Texto de un campo sin espacios al inicio ni al final ('' si falta el valor o la columna)."""
+    if campo not in df.columns:
+        return pd.Series('', index=df.index)
+    return texto_columna(df[campo]).str.strip()
+
+
+def tiene_valor(df, campo):
+    """Indica, para cada registro, si el campo está diligenciado (no vacío)."""
+    return texto_campo(df, campo) != ''
+
+
+def tiene_fecha(df, campo):
+    """Indica, para cada registro, si el campo está diligenciado con una fecha válida."""
+    if campo not in df.columns:
+        return pd.Series(False, index=df.index)
+    return tiene_valor(df, campo) & obtener_fecha(df, campo).notna()
+
+
+def indicador_campo(df, campo):
+    """
+    Indicador booleano de un campo Si/No ('Si' o equivalente) o (completo) ('Completo'),
+    con False si la columna no existe.
+    """
+    if campo not in df.columns:
+        return pd.Series(False, index=df.index)
+    return obtener_bool(df, campo).astype(bool)
+
+
+def pares_cronologia(campos=CRONOLOGIA_HITOS):
+    """
+    Pares (anterior, posterior) de campos de fecha que deben estar en orden cronológico: cada campo
+    con todos los que le siguen. El bit i de la máscara de violaciones_cronologia corresponde al par i.
+    """
+    return [(anterior, posterior) for i, anterior in enumerate(campos) for posterior in campos[i + 1:]]
+
+
+def bits_pares(pares, campos=CRONOLOGIA_HITOS):
+    """Máscara de bits de los pares (anterior, posterior) indicados (ver pares_cronologia)."""
+    todos = pares_cronologia(campos)
+    return sum(1 << todos.index(par) for par in pares)
+
+
+def describir_par(par):
+    """Texto que explica al usuario un par de fechas fuera de orden."""
+    anterior, posterior = par
+    return f"{anterior} posterior a {posterior}"
+
+
+def matriz_fechas_hitos(df, campos=CRONOLOGIA_HITOS):
+    """Matriz (registros x campos) de las fechas de los hitos, con NaT si falta la fecha o la columna."""
+    matriz = np.full((len(df), len(campos)), np.datetime64('NaT'), dtype='datetime64[us]')
+    for j, campo in enumerate(campos):
+        if campo in df.columns:
+            matriz[:, j] = obtener_fecha(df, campo).astype('datetime64[us]').to_numpy()
+    return matriz
+
+
+def violaciones_cronologia(df, campos=CRONOLOGIA_HITOS):
+    """
+    Verifica el orden cronológico de las fechas de los hitos (CRONOLOGIA_HITOS) de todos los registros
+    con una comparación por par de campos sobre la matriz de fechas (matriz_fechas_hitos).
+    Retorna, por registro, una máscara de bits de los pares fuera de orden (ver pares_cronologia): el
+    bit i está activo si la fecha del primer campo del par i es posterior a la del segundo. Sin alguna
+    de las dos fechas el par no se compara. 0 si todas las fechas están en orden.
+    """
+    pares = pares_cronologia(campos)
+    anteriores = [campos.index(anterior) for anterior, _ in pares]
+    posteriores = [campos.index(posterior) for _, posterior in pares]
+
+    matriz = matriz_fechas_hitos(df, campos)
+    fuera_de_orden = matriz[:, anteriores] > matriz[:, posteriores]
+    bits = np.left_shift(1, np.arange(len(pares), dtype=np.int64))
+    return pd.Series(fuera_de_orden @ bits, index=df.index, dtype='int64')
+
+
+def pares_fuera_de_orden(violaciones, campos=CRONOLOGIA_HITOS):
+    """Pares de campos (ver pares_cronologia) que están fuera de orden en algún registro."""
+    presentes = int(np.bitwise_or.reduce(violaciones.to_numpy(), initial=0))
+    return [par for i, par in enumerate(pares_cronologia(campos)) if presentes >> i & 1]
+
+
+def describir_violaciones_cronologia(violaciones, campos=CRONOLOGIA_HITOS):
+    """Texto con los pares de fechas fuera de orden de cada registro ('' si están en orden)."""
+    detalle = pd.Series('', index=violaciones.index)
+    for i, par in enumerate(pares_cronologia(campos)):
+        fuera_de_orden = (violaciones & (1 << i)) != 0
+        if fuera_de_orden.any():
+            detalle = detalle.where(~fuera_de_orden, detalle + '; ' + describir_par(par))
+    return detalle.str[2:]
+
+
+def evaluar_predicado(df, predicado):
+    """
+    Evalúa un predicado de las reglas de validación (ver REGLAS_VALIDACION) sobre todos los
+    registros y retorna la máscara de los registros que lo cumplen.
+    """
+    tipo, *argumentos = predicado
+    if tipo == 'alguno':
+        cumple = pd.Series(False, index=df.index)
+        for alternativa in argumentos:
+            cumple |= evaluar_predicado(df, alternativa)
+        return cumple
+
+    campo = argumentos[0]
+    if tipo == 'valor':
+        return tiene_valor(df, campo)
+    if tipo == 'vacio':
+        return ~tiene_valor(df, campo)
+    if tipo == 'fecha':
+        return tiene_fecha(df, campo)
+    if tipo in ('si', 'completo'):
+        return indicador_campo(df, campo)
+    if tipo == 'no':
+        return texto_campo(df, campo).str.upper().isin(VALORES_NO)
+    if tipo == 'igual':
+        return texto_campo(df, campo) == argumentos[1]
+    if tipo == 'hasta':
+        limite = argumentos[1]
+        if campo not in df.columns or limite not in df.columns:
+            return pd.Series(True, index=df.index)
+        # Sin alguna de las dos fechas no se compara
+        return ~(obtener_fecha(df, campo) > obtener_fecha(df, limite))
+    raise ValueError(f"Tipo de predicado desconocido en las reglas de validación: {tipo}")
+
+
+def describir_predicado(predicado):
+    """Texto que explica al usuario un requisito (predicado) que no se cumple."""
+    tipo, *argumentos = predicado
+    if tipo == 'alguno':
+        return ' o '.join(describir_predicado(alternativa) for alternativa in argumentos)
+
+    campo = argumentos[0]
+    if tipo == 'valor':
+        return f"Falta diligenciar {campo}"
+    if tipo == 'vacio':
+        return f"{campo} debe estar vacío"
+    if tipo == 'fecha':
+        return f"Falta una fecha válida en {campo}"
+    if tipo == 'si':
+        return f"{campo} debe ser SI"
+    if tipo == 'no':
+        return f"{campo} debe ser NO"
+    if tipo == 'completo':
+        return f"{campo.split(' (')[0]} debe estar Completo"
+    if tipo == 'igual':
+        return f"{campo} debe ser '{argumentos[1]}'"
+    if tipo == 'hasta':
+        return f"La fecha en {campo} debe ser anterior a la fecha en {argumentos[1]}"
+    return str(predicado)
+
+
+def campos_predicado(predicado):
+    """Campos que lee un predicado de las reglas de validación."""
+    tipo, *argumentos = predicado
+    if tipo == 'alguno':
+        return set().union(*(campos_predicado(alternativa) for alternativa in argumentos))
+    if tipo == 'hasta':
+        return {argumentos[0], argumentos[1]}
+    return {argumentos[0]}
+
+
+def campos_leidos(regla):
+    """Campos que lee una regla de validación (en su condición y en sus requisitos)."""
+    return set().union(*(campos_predicado(predicado) for predicado in regla['condicion'] + regla['requisitos']))
+
+
+def ordenar_reglas_validacion(reglas=REGLAS_VALIDACION):
+    """
+    Ordena las reglas de validación de modo que cada regla se evalúe después de las reglas cuya
+    acción modifica alguno de los campos que lee. Las reglas que dependen unas de otras en ciclo
+    se evalúan juntas, en el orden en que están declaradas (la declarada primero tiene prioridad).
+    """
+    n = len(reglas)
+    leidos = [campos_leidos(regla) for regla in reglas]
+    # depende[i]: reglas que modifican campos que lee la regla i
+    depende = [{j for j in range(n) if j != i and reglas[j]['accion'][0] in leidos[i]} for i in range(n)]
+
+    # alcanzables[i]: reglas de las que depende la regla i, directa o indirectamente
+    alcanzables = []
+    for i in range(n):
+        visitadas, pendientes = set(), list(depende[i])
+        while pendientes:
+            j = pendientes.pop()
+            if j not in visitadas:
+                visitadas.add(j)
+                pendientes.extend(depende[j])
+        alcanzables.append(visitadas)
+
+    ordenadas, pendientes = [], list(range(n))
+    while pendientes:
+        # Primer grupo (la regla y las que forman un ciclo con ella) cuyas dependencias ya están ordenadas
+        for i in pendientes:
+            grupo = {i} | {j for j in alcanzables[i] if i in alcanzables[j]}
+            if all(j in ordenadas or j in grupo for k in grupo for j in depende[k]):
+                break
+        ordenadas.extend(sorted(grupo))
+        pendientes = [j for j in pendientes if j not in grupo]
+    return [reglas[i] for i in ordenadas]
+
+
+def evaluar_regla(df, regla, mascaras=None):
+    """
+    Evalúa una regla de validación sobre todos los registros. Retorna la máscara de los registros
+    a los que aplica la regla y la lista de (requisito, máscara de los registros que lo cumplen).
+    mascaras guarda los predicados ya evaluados sobre df, para no repetirlos entre reglas.
+    """
+    mascaras = {} if mascaras is None else mascaras
+
+    def mascara(predicado):
+        if predicado not in mascaras:
+            mascaras[predicado] = evaluar_predicado(df, predicado)
+        return mascaras[predicado]
+
+    aplica = pd.Series(True, index=df.index)
+    for predicado in regla['condicion']:
+        aplica &= mascara(predicado)
+    return aplica, [(predicado, mascara(predicado)) for predicado in regla['requisitos']]
+
+
+def incumple_regla(df, regla, mascaras=None):
+    """Máscara de los registros que incumplen la regla: le aplica y no cumple alguno de sus requisitos."""
+    aplica, requisitos = evaluar_regla(df, regla, mascaras)
+    cumple = pd.Series(True, index=df.index)
+    for _, mascara in requisitos:
+        cumple &= mascara
+    return aplica & ~cumple
+
+
+def incumplimientos_reglas(df, reglas=REGLAS_VALIDACION):
+    """
+    Evalúa las reglas de validación sobre todos los registros (una pasada por predicado).
+    Retorna un DataFrame booleano con una columna por regla: True si el registro la incumple.
+    """
+    mascaras = {}
+    incumplidas = {regla['nombre']: incumple_regla(df, regla, mascaras) for regla in reglas}
+    return pd.DataFrame(incumplidas, index=df.index, columns=[regla['nombre'] for regla in reglas])
+
+
+def requisitos_incumplidos(df, regla):
+    """Texto con los requisitos de la regla que no cumple cada registro ('' si los cumple todos)."""
+    _, requisitos = evaluar_regla(df, regla)
+    detalle = pd.Series('', index=df.index)
+    for predicado, cumple in requisitos:
+        detalle = detalle.where(cumple, detalle + ', ' + describir_predicado(predicado))
+    return detalle.str[2:]
+
+
+def obtener_regla(nombre, reglas=REGLAS_VALIDACION):
+    """Retorna la regla de validación con el nombre indicado."""
+    for regla in reglas:
+        if regla['nombre'] == nombre:
+            return regla
+    raise KeyError(f"No existe la regla de validación: {nombre}")
+
+
+def verificar_requisitos_regla(row, nombre):
+    """
+    Verifica, para un solo registro (fila del DataFrame), los requisitos de una regla de validación.
+    Retorna (valido, requisitos incumplidos), con la descripción de cada requisito incumplido.
+    """
+    fila = row.to_frame().T.infer_objects()
+    _, requisitos = evaluar_regla(fila, obtener_regla(nombre))
+    incumplidos = [describir_predicado(predicado) for predicado, cumple in requisitos if not cumple.iloc[0]]
+    return len(incumplidos) == 0, incumplidos
+
 
 def verificar_condiciones_estandares(row):
     """
-    Verifica si las condiciones para ingresar la fecha de Estándares están cumplidas.
-    Retorna True si todos los campos requeridos con sufijo (completo) están marcados como 'Completo'.
-    Si algún campo no existe, se considerará automáticamente como incompleto.
+    Verifica si las condiciones para ingresar la fecha de Estándares están cumplidas
+    (requisitos de la regla 'Estándares': todos los campos (completo) en 'Completo').
 
     Args:
         row: Fila del DataFrame a verificar
@@ -16,40 +284,15 @@ def verificar_condiciones_estandares(row):
     Returns:
         tuple: (valido, campos_incompletos)
             - valido: True si todos los campos existen y están 'Completo', False en caso contrario
-            - campos_incompletos: Lista de nombres de campos que no están 'Completo' o no existen
-    """
-    # Lista de componentes de estándares que deben estar completos (solo con sufijo completo)
-    campos_estandares_completo = [
-        'Registro (completo)',
-        'ET (completo)',
-        'CO (completo)',
-        'DD (completo)',
-        'REC (completo)',
-        'SERVICIO (completo)'
-    ]
-
-    campos_incompletos = []
-
-    for campo in campos_estandares_completo:
-        if campo in row and pd.notna(row[campo]):
-            # Verificar si el valor es exactamente "Completo"
-            if row[campo] != "Completo":
-                # Extraer el nombre sin el sufijo para el mensaje de error
-                nombre_campo = campo.split(' (')[0]
-                campos_incompletos.append(nombre_campo)
-        else:
-            # Si el campo no existe o es NaN, considerarlo como incompleto
-            nombre_campo = campo.split(' (')[0]
-            campos_incompletos.append(f"{nombre_campo} (campo no existe)")
-
-    # Si todos los campos están completos (lista vacía), retornar válido
-    return len(campos_incompletos) == 0, campos_incompletos
+            - campos_incompletos: Lista de requisitos que no se cumplen
+    """
+    return verificar_requisitos_regla(row, 'Estándares')
 
 
 def verificar_condicion_publicacion(row):
     """
-    Verifica si la condición para ingresar la fecha de Publicación está cumplida.
-    Retorna True si 'Disponer datos temáticos' está marcado como 'Si'.
+    Verifica si la condición para ingresar la fecha de Publicación está cumplida
+    (requisito de la regla 'Publicación': 'Disponer datos temáticos' marcado como 'Si').
 
     Args:
         row: Fila del DataFrame a verificar
@@ -57,19 +300,17 @@ def verificar_condicion_publicacion(row):
     Returns:
         bool: True si 'Disponer datos temáticos' es 'Si', False en caso contrario
     """
-    if 'Disponer datos temáticos' in row and pd.notna(row['Disponer datos temáticos']):
-        valor = row['Disponer datos temáticos']
-        return valor.upper() in ["SI", "SÍ", "S", "YES", "Y"]
-    return False
+    return verificar_requisitos_regla(row, 'Publicación')[0]
 
 
 def verificar_condiciones_oficio_cierre(row):
     """
-    Verifica si las condiciones para ingresar la fecha de Oficio de cierre están cumplidas.
-    Para poder ingresar fecha en el campo oficio de cierre:
+    Verifica si las condiciones para ingresar la fecha de Oficio de cierre están cumplidas
+    (requisitos de la regla 'Oficio de cierre', ver REQUISITOS_OFICIO_CIERRE):
     1. Todos los campos con opciones 'Si' o 'No' deben estar marcados como 'Si'
     2. Todos los estándares (con sufijo completo) deben estar completos
     3. Todos los campos de fecha deben estar diligenciados
+    4. Ninguna fecha puede ser posterior a la fecha de oficio de cierre
 
     Args:
         row: Fila del DataFrame a verificar
@@ -77,77 +318,63 @@ def verificar_condiciones_oficio_cierre(row):
     Returns:
         tuple: (valido, campos_incompletos)
             - valido: True si todas las condiciones se cumplen, False en caso contrario
-            - campos_incompletos: Lista de campos que no cumplen las condiciones
-    """
-    campos_incompletos = []
-
-    # 1. Verificar campos Si/No - todos deben estar como 'Si'
-    campos_si_no = [
-        'Acuerdo de compromiso',
-        'Análisis de información',
-        'Cronograma Concertado',
-        'Seguimiento a los acuerdos',
-        'Disponer datos temáticos',
-        'Catálogo de recursos geográficos',
-        'Oficios de cierre'
-    ]
-
-    for campo in campos_si_no:
-        if campo in row:
-            valor = str(row[campo]).strip().upper() if pd.notna(row[campo]) else ""
-            if valor not in ["SI", "SÍ", "S", "YES", "Y"]:
-                campos_incompletos.append(f"{campo} debe ser SI")
-        else:
-            campos_incompletos.append(f"{campo} no existe y debe ser SI")
-
-    # 2. Verificar que todos los estándares estén completos (usando campos con sufijo completo)
-    campos_estandares_completo = [
-        'Registro (completo)', 'ET (completo)', 'CO (completo)',
-        'DD (completo)', 'REC (completo)', 'SERVICIO (completo)'
-    ]
-
-    for campo in campos_estandares_completo:
-        if campo in row:
-            valor = row[campo] if pd.notna(row[campo]) else ""
-            if valor != "Completo":
-                nombre_campo = campo.split(' (')[0]
-                campos_incompletos.append(f"{nombre_campo} debe estar Completo")
-        else:
-            nombre_campo = campo.split(' (')[0]
-            campos_incompletos.append(f"{nombre_campo} (campo no existe)")
-
-    # 3. Verificar que todos los campos de fecha estén diligenciados
-    campos_fecha = [
-        'Análisis y cronograma',
-        'Estándares',
-        'Publicación',
-        'Fecha de entrega de información'
-    ]
-
-    for campo in campos_fecha:
-        if campo in row:
-            if pd.isna(row[campo]) or str(row[campo]).strip() == "":
-                campos_incompletos.append(f"Falta fecha en {campo}")
-        else:
-            campos_incompletos.append(f"El campo {campo} no existe")
-
-    # 4. Verificar que todas las fechas sean anteriores a la fecha de oficio de cierre
-    fecha_oficio_str = row.get('Fecha de oficio de cierre', None)
-    if fecha_oficio_str and pd.notna(fecha_oficio_str) and fecha_oficio_str != '':
-        fecha_oficio = procesar_fecha(fecha_oficio_str)
-        if fecha_oficio:
-            for campo in campos_fecha:
-                if campo in row and row[campo] and pd.notna(row[campo]):
-                    fecha_campo = procesar_fecha(row[campo])
-                    if fecha_campo and fecha_campo > fecha_oficio:
-                        campos_incompletos.append(f"La fecha en {campo} debe ser anterior a la fecha de oficio de cierre")
-
-    return len(campos_incompletos) == 0, campos_incompletos
+            - campos_incompletos: Lista de requisitos que no se cumplen
+    """
+    return verificar_requisitos_regla(row, 'Oficio de cierre')
 
 
-def validar_reglas_negocio(df):
+def aplicar_reglas_negocio(df, reglas=REGLAS_VALIDACION):
+    """
+    Aplica las reglas de validación (ver validar_reglas_negocio) y retorna (df_actualizado, cambios).
+    Las reglas se evalúan en orden de dependencias (ordenar_reglas_validacion), cada una sobre los
+    valores ya corregidos por las anteriores, de modo que una sola pasada deja los datos estables:
+    se comprueba con una pasada más, que solo vuelve a evaluar los predicados cuyos campos
+    cambiaron y normalmente no modifica nada.
+    cambios es un DataFrame con una fila por celda modificada (índice del registro): Cod, Regla,
+    Campo, Valor anterior y Valor nuevo.
+    """
+    df_actualizado = df.copy()
+    reglas = ordenar_reglas_validacion(reglas)
+    mascaras = {}
+    cambios = []
+
+    for pasada in range(len(reglas)):
+        cambios_pasada = 0
+        for regla in reglas:
+            campo, valor = regla['accion']
+            if campo not in df_actualizado.columns:
+                continue
+
+            anterior = texto_columna(df_actualizado[campo])
+            filas = (incumple_regla(df_actualizado, regla, mascaras) & (anterior != valor)).to_numpy()
+            if not filas.any():
+                continue
+
+            cambios.append(pd.DataFrame({
+                'Cod': texto_columna(df_actualizado.loc[filas, 'Cod']) if 'Cod' in df_actualizado.columns else '',
+                'Regla': regla['nombre'],
+                'Campo': campo,
+                'Valor anterior': anterior[filas],
+                'Valor nuevo': valor
+            }))
+            asignar_valores(df_actualizado, filas, campo, valor)
+            cambios_pasada += int(filas.sum())
+
+            # Los predicados que leen el campo modificado se vuelven a evaluar
+            for predicado in [p for p in mascaras if campo in campos_predicado(p)]:
+                del mascaras[predicado]
+
+        if cambios_pasada == 0:
+            break
+
+    columnas = ['Cod', 'Regla', 'Campo', 'Valor anterior', 'Valor nuevo']
+    cambios_df = pd.concat(cambios) if cambios else pd.DataFrame(columns=columnas)
+    return df_actualizado, cambios_df
+
+
+def validar_reglas_negocio(df, reglas=REGLAS_VALIDACION):
     """
-    Aplica reglas de negocio para mantener consistencia en los datos:
+    Aplica reglas de negocio para mantener consistencia en los datos (REGLAS_VALIDACION):
     1. Si suscripción acuerdo de compromiso o entrega acuerdo de compromiso no está vacío, acuerdo de compromiso = SI
     2. Si análisis y cronograma tiene fecha, análisis de información y cronograma concertado = SI
     3. Si estándares tiene fecha, verificar que los campos con sufijo (completo) = Completo
@@ -155,266 +382,173 @@ def validar_reglas_negocio(df):
     5. Si oficio de cierre tiene fecha, verificar todas las condiciones necesarias
     6. Si oficio de cierre tiene fecha válida, actualizar estado a "Completado"
     7. Si se marca "Disponer datos temáticos" como "No", borrar fecha de publicación
-    8. Si Estado es "Completado" pero no hay fecha de oficio de cierre, cambiar Estado a "En proceso"
+    8. Si Estado es "Completado" pero no hay fecha de oficio de cierre válida, cambiar Estado a "En proceso"
+    La acción de cada regla se aplica a los registros que la incumplen con una sola asignación
+    (asignar_valores); ver aplicar_reglas_negocio, que además informa las celdas modificadas.
     """
-    df_actualizado = df.copy()
+    return aplicar_reglas_negocio(df, reglas)[0]
 
-    # Iterar sobre cada fila
-    for idx, row in df.iterrows():
-        # Regla 1: Si suscripción o entrega acuerdo de compromiso no está vacío, acuerdo de compromiso = SI
-        if 'Suscripción acuerdo de compromiso' in row and pd.notna(row['Suscripción acuerdo de compromiso']) and str(
-                row['Suscripción acuerdo de compromiso']).strip() != '':
-            df_actualizado.at[idx, 'Acuerdo de compromiso'] = 'Si'
-
-        if 'Entrega acuerdo de compromiso' in row and pd.notna(row['Entrega acuerdo de compromiso']) and str(
-                row['Entrega acuerdo de compromiso']).strip() != '':
-            df_actualizado.at[idx, 'Acuerdo de compromiso'] = 'Si'
-
-        # Regla 2: Si análisis y cronograma tiene fecha, análisis de información y cronograma concertado = SI
-        if 'Análisis y cronograma' in row and pd.notna(row['Análisis y cronograma']) and str(
-                row['Análisis y cronograma']).strip() != '':
-            fecha = procesar_fecha(row['Análisis y cronograma'])
-            if fecha is not None:
-                if 'Análisis de información' in df_actualizado.columns:
-                    df_actualizado.at[idx, 'Análisis de información'] = 'Si'
-                if 'Cronograma Concertado' in df_actualizado.columns:
-                    df_actualizado.at[idx, 'Cronograma Concertado'] = 'Si'
-
-        # Regla 3: Si estándares tiene fecha, verificar que todos los campos con sufijo (completo) = Completo
-        if 'Estándares' in row and pd.notna(row['Estándares']) and str(row['Estándares']).strip() != '':
-            fecha = procesar_fecha(row['Estándares'])
-            if fecha is not None:
-                # Verificar que todos los campos requeridos estén completos
-                valido, campos_incompletos = verificar_condiciones_estandares(row)
-
-                # Si hay campos incompletos, eliminar la fecha de estándares
-                if not valido:
-                    df_actualizado.at[idx, 'Estándares'] = ''
-
-        # Regla 4: Si publicación tiene fecha, disponer datos temáticos = SI
-        if 'Publicación' in row and pd.notna(row['Publicación']) and str(row['Publicación']).strip() != '':
-            fecha = procesar_fecha(row['Publicación'])
-            if fecha is not None and 'Disponer datos temáticos' in df_actualizado.columns:
-                df_actualizado.at[idx, 'Disponer datos temáticos'] = 'Si'
-
-        # Regla 7: Si se marca "Disponer datos temáticos" como "No", borrar fecha de publicación
-        if 'Disponer datos temáticos' in row and pd.notna(row['Disponer datos temáticos']):
-            valor = str(row['Disponer datos temáticos']).strip().upper()
-            if valor in ["NO", "N"] and 'Publicación' in df_actualizado.columns:
-                df_actualizado.at[idx, 'Publicación'] = ''
-
-        # Regla 5: Si oficio de cierre tiene fecha, verificar todas las condiciones necesarias
-        if 'Fecha de oficio de cierre' in row and pd.notna(row['Fecha de oficio de cierre']) and str(
-                row['Fecha de oficio de cierre']).strip() != '':
-            fecha = procesar_fecha(row['Fecha de oficio de cierre'])
-            if fecha is not None:
-                # Verificar todas las condiciones para el oficio de cierre
-                valido, campos_incompletos = verificar_condiciones_oficio_cierre(row)
-
-                # Si hay campos incompletos, eliminar la fecha de oficio de cierre
-                if not valido:
-                    df_actualizado.at[idx, 'Fecha de oficio de cierre'] = ''
-                    # Si el estado es "Completado", cambiarlo a "En proceso" si se elimina la fecha
-                    if 'Estado' in df_actualizado.columns and df_actualizado.at[idx, 'Estado'] == 'Completado':
-                        df_actualizado.at[idx, 'Estado'] = 'En proceso'
-                else:
-                    # Regla 6: Si oficio de cierre tiene fecha válida, actualizar estado a "Completado"
-                    if 'Estado' in df_actualizado.columns:
-                        df_actualizado.at[idx, 'Estado'] = 'Completado'
-        
-        # Regla 8: Si Estado es "Completado" pero no hay fecha de oficio de cierre, cambiar Estado a "En proceso"
-        elif 'Estado' in df_actualizado.columns and df_actualizado.at[idx, 'Estado'] == 'Completado':
-            # Verificar si hay fecha de oficio de cierre válida
-            if 'Fecha de oficio de cierre' not in row or pd.isna(row['Fecha de oficio de cierre']) or row['Fecha de oficio de cierre'] == '':
-                df_actualizado.at[idx, 'Estado'] = 'En proceso'
 
-    return df_actualizado
+def campos_accion(df, reglas=REGLAS_VALIDACION):
+    """Campos de df que pueden modificar las reglas de validación (sin repetir, en orden)."""
+    return [campo for campo in dict.fromkeys(regla['accion'][0] for regla in reglas) if campo in df.columns]
 
 
-def mostrar_estado_validaciones(df, st_obj=None):
+def validar_reglas_negocio_con_cache(df, reglas=REGLAS_VALIDACION, ruta=None):
     """
-    Muestra el estado actual de las validaciones para cada registro.
-    Si se proporciona un objeto Streamlit (st_obj), muestra las advertencias en la interfaz.
+    Aplica las reglas de validación (ver validar_reglas_negocio). Si se indica la ruta de
+    registros.csv, df debe ser su contenido recién cargado: los campos corregidos se calculan
+    una sola vez por versión del archivo y, si al archivo solo se le agregaron filas al final,
+    solo para las filas nuevas (las reglas se evalúan registro por registro).
     """
-    resultados = []
-
-    for idx, row in df.iterrows():
-        resultado = {'Cod': row.get('Cod', ''), 'Entidad': row.get('Entidad', ''),
-                     'Nivel Información ': row.get('Nivel Información ', '')}
-
-        # Validar Acuerdo de compromiso
-        tiene_entrega = ('Entrega acuerdo de compromiso' in row and
-                         pd.notna(row['Entrega acuerdo de compromiso']) and
-                         str(row['Entrega acuerdo de compromiso']).strip() != '')
+    if ruta is None or firma_archivo(ruta) is None:
+        return validar_reglas_negocio(df, reglas)
+
+    columnas = [col for campo in campos_accion(df, reglas)
+                for col in (campo, columna_fecha(campo), columna_bool(campo)) if col in df.columns]
+
+    def calcular(_, desde_fila=0):
+        return validar_reglas_negocio(df.iloc[desde_fila:], reglas)[columnas]
+
+    def calcular_cola(_, anteriores, desde_byte):
+        nuevas = calcular(None, len(anteriores))
+        anteriores = anteriores.copy()
+        # Las categorías de las filas nuevas se agregan a las anteriores (ver leer_cola_registros)
+        for col in columnas:
+            if isinstance(anteriores[col].dtype, pd.CategoricalDtype):
+                categorias = anteriores[col].cat.categories
+                categorias = categorias.append(nuevas[col].cat.categories.difference(categorias, sort=False))
+                anteriores[col] = anteriores[col].cat.set_categories(categorias)
+                nuevas[col] = nuevas[col].cat.set_categories(categorias)
+        return pd.concat([anteriores, nuevas])
+
+    corregidos = cargar_con_cache(ruta, calcular, clave=f"{ruta} (reglas de negocio) {tuple(columnas)}",
+                                  lector_cola=calcular_cola)
+    if not corregidos.index.equals(df.index):
+        return validar_reglas_negocio(df, reglas)
+    df_actualizado = df.copy()
+    for columna in columnas:
+        df_actualizado[columna] = corregidos[columna]
+    return df_actualizado
 
-        tiene_acuerdo = ('Acuerdo de compromiso' in row and
-                         pd.notna(row['Acuerdo de compromiso']) and
-                         str(row['Acuerdo de compromiso']).strip().upper() in ['SI', 'SÍ', 'S', 'YES', 'Y', 'COMPLETO'])
 
-        if tiene_entrega and not tiene_acuerdo:
-            resultado['Estado Acuerdo'] = 'Inconsistente'
-        else:
-            resultado['Estado Acuerdo'] = 'Correcto'
+def cambios_reglas_negocio(df, df_validado, reglas=REGLAS_VALIDACION):
+    """
+    Celdas que modificaron las reglas de validación al pasar de df a df_validado (ver
+    aplicar_reglas_negocio): las reglas solo se vuelven a aplicar a los registros que cambiaron.
+    """
+    filas = filas_distintas(df, df_validado, campos_accion(df, reglas))
+    return aplicar_reglas_negocio(df[filas], reglas)[1]
 
-        # Validar Análisis de información
-        tiene_fecha_analisis = ('Análisis y cronograma' in row and
-                                pd.notna(row['Análisis y cronograma']) and
-                                str(row['Análisis y cronograma']).strip() != '')
 
-        tiene_analisis_info = ('Análisis de información' in row and
-                               pd.notna(row['Análisis de información']) and
-                               str(row['Análisis de información']).strip().upper() in ['SI', 'SÍ', 'S', 'YES', 'Y',
-                                                                                       'COMPLETO'])
+def reporte_inconsistencias(df, reglas=REGLAS_VALIDACION):
+    """
+    Registros que incumplen alguna regla de validación (solo esos): Cod, Entidad, Nivel Información,
+    una columna booleana por regla (True si el registro la incumple) y los requisitos incumplidos.
+    """
+    columnas_registro = [col for col in ['Cod', 'Entidad', 'Nivel Información '] if col in df.columns]
+    incumplidas = incumplimientos_reglas(df, reglas)
+    filas = incumplidas.any(axis=1).to_numpy()
+    inconsistentes = df[filas]
+    incumplidas = incumplidas[filas]
+
+    requisitos = pd.Series('', index=inconsistentes.index)
+    for regla in reglas:
+        incumple = incumplidas[regla['nombre']]
+        if incumple.any():
+            requisitos = requisitos.where(~incumple, requisitos + '; ' + requisitos_incumplidos(inconsistentes, regla))
+
+    reporte = pd.DataFrame({col: texto_columna(inconsistentes[col]) for col in columnas_registro},
+                           index=inconsistentes.index)
+    reporte = pd.concat([reporte, incumplidas], axis=1)
+    reporte['Requisitos incumplidos'] = requisitos.str[2:]
+    return reporte
+
+
+def mostrar_estado_validaciones(df, st_obj=None, reglas=REGLAS_VALIDACION, ruta=None):
+    """
+    Muestra los registros que no cumplen las reglas de validación (REGLAS_VALIDACION), con el
+    número de registros que incumplen cada regla (ver reporte_inconsistencias).
+    Si se indica la ruta del archivo de registros, df debe ser su contenido y el reporte se
+    calcula una sola vez por versión del archivo.
+    Si se proporciona un objeto Streamlit (st_obj), muestra el resumen por regla y los registros
+    inconsistentes (que se pueden filtrar por regla).
+    Retorna el reporte de registros inconsistentes.
+    """
+    if ruta is not None and firma_archivo(ruta) is not None:
+        reporte = cargar_con_cache(ruta, lambda _: reporte_inconsistencias(df, reglas),
+                                   clave=f"{ruta} (inconsistencias)")
+    else:
+        reporte = reporte_inconsistencias(df, reglas)
 
-        if tiene_fecha_analisis and not tiene_analisis_info:
-            resultado['Estado Análisis'] = 'Inconsistente'
+    # Si hay un objeto Streamlit, mostrar el resumen y los registros inconsistentes
+    if st_obj is not None:
+        if reporte.empty:
+            st_obj.success("Todos los registros cumplen con las reglas de validación.")
+            return reporte
+
+        resumen = pd.DataFrame({
+            'Regla': [regla['nombre'] for regla in reglas],
+            'Registros': [int(reporte[regla['nombre']].sum()) for regla in reglas],
+            'Mensaje': [regla['mensaje'] for regla in reglas]
+        })
+        resumen = resumen[resumen['Registros'] > 0]
+
+        st_obj.warning(f"{len(reporte)} de {len(df)} registros no cumplen alguna regla de validación.")
+        st_obj.dataframe(resumen, hide_index=True)
+
+        regla_seleccionada = st_obj.selectbox("Mostrar los registros que incumplen la regla",
+                                              ['Todas'] + resumen['Regla'].tolist(), key="regla_inconsistencias")
+        if regla_seleccionada != 'Todas':
+            st_obj.dataframe(reporte[reporte[regla_seleccionada]])
         else:
-            resultado['Estado Análisis'] = 'Correcto'
-
-        # Validar Estándares (usando campos con sufijo completo)
-        tiene_fecha_estandares = ('Estándares' in row and
-                                  pd.notna(row['Estándares']) and
-                                  str(row['Estándares']).strip() != '')
+            st_obj.dataframe(reporte)
 
-        valido, campos_incompletos = verificar_condiciones_estandares(row)
+    return reporte
 
-        if tiene_fecha_estandares and not valido:
-            resultado['Estado Estándares'] = 'Inconsistente'
-            resultado['Campos Incompletos'] = ', '.join(campos_incompletos)
-        else:
-            resultado['Estado Estándares'] = 'Correcto'
-            resultado['Campos Incompletos'] = ''
 
-        # Validar Publicación
-        tiene_fecha_publicacion = ('Publicación' in row and
-                                   pd.notna(row['Publicación']) and
-                                   str(row['Publicación']).strip() != '')
+def reporte_cronologia(df, campos=CRONOLOGIA_HITOS):
+    """
+    Registros con fechas de hitos fuera de orden (solo esos): Cod, Entidad, Nivel Información,
+    la máscara de bits de violaciones_cronologia y los pares de fechas fuera de orden.
+    """
+    columnas_registro = [col for col in ['Cod', 'Entidad', 'Nivel Información '] if col in df.columns]
+    violaciones = violaciones_cronologia(df, campos)
+    filas = (violaciones != 0).to_numpy()
 
-        tiene_disponer_datos = verificar_condicion_publicacion(row)
+    reporte = pd.DataFrame({col: texto_columna(df.loc[filas, col]) for col in columnas_registro},
+                           index=df.index[filas])
+    reporte['Cronología'] = violaciones[filas]
+    reporte['Fechas fuera de orden'] = describir_violaciones_cronologia(violaciones[filas], campos)
+    return reporte
 
-        if tiene_fecha_publicacion and not tiene_disponer_datos:
-            resultado['Estado Publicación'] = 'Inconsistente'
-        else:
-            resultado['Estado Publicación'] = 'Correcto'
-
-        # Validar condición de "Disponer datos temáticos" como "No" y tener fecha de publicación
-        if 'Disponer datos temáticos' in row and pd.notna(row['Disponer datos temáticos']):
-            valor = str(row['Disponer datos temáticos']).strip().upper()
-            if valor in ["NO", "N"] and tiene_fecha_publicacion:
-                resultado['Estado Publicación Disponer'] = 'Inconsistente'
-            else:
-                resultado['Estado Publicación Disponer'] = 'Correcto'
-        else:
-            resultado['Estado Publicación Disponer'] = 'No aplicable'
-
-        # Validar Oficio de cierre
-        tiene_fecha_oficio = ('Fecha de oficio de cierre' in row and
-                              pd.notna(row['Fecha de oficio de cierre']) and
-                              str(row['Fecha de oficio de cierre']).strip() != '')
-
-        if tiene_fecha_oficio:
-            valido, campos_incompletos = verificar_condiciones_oficio_cierre(row)
-            if not valido:
-                resultado['Estado Oficio Cierre'] = 'Inconsistente'
-                resultado['Oficio Incompletos'] = ', '.join(campos_incompletos)
-            else:
-                resultado['Estado Oficio Cierre'] = 'Correcto'
-                resultado['Oficio Incompletos'] = ''
-        else:
-            resultado['Estado Oficio Cierre'] = 'No aplicable'
-            resultado['Oficio Incompletos'] = ''
-            
-        # Validar Estado "Completado" sin fecha de oficio de cierre
-        tiene_estado_completado = ('Estado' in row and pd.notna(row['Estado']) and row['Estado'] == 'Completado')
-        if tiene_estado_completado and not tiene_fecha_oficio:
-            resultado['Estado Inconsistente'] = 'Sí (Completado sin fecha oficio)'
-        else:
-            resultado['Estado Inconsistente'] = 'No'
 
-        resultados.append(resultado)
-
-    # Crear DataFrame con los resultados
-    resultados_df = pd.DataFrame(resultados)
+def mostrar_cronologia_hitos(df, st_obj=None, campos=CRONOLOGIA_HITOS, ruta=None):
+    """
+    Muestra los registros con fechas de hitos fuera de orden (ver reporte_cronologia), con el
+    número de registros por par de fechas. Las fechas fuera de orden no se corrigen.
+    Si se indica la ruta del archivo de registros, df debe ser su contenido y el reporte se
+    calcula una sola vez por versión del archivo.
+    Retorna el reporte.
+    """
+    if ruta is not None and firma_archivo(ruta) is not None:
+        reporte = cargar_con_cache(ruta, lambda _: reporte_cronologia(df, campos), clave=f"{ruta} (cronologia)")
+    else:
+        reporte = reporte_cronologia(df, campos)
 
-    # Si hay un objeto Streamlit, mostrar advertencias
     if st_obj is not None:
-        # Filtrar los registros con estándares inconsistentes
-        estandares_inconsistentes = resultados_df[resultados_df['Estado Estándares'] == 'Inconsistente']
-
-        if not estandares_inconsistentes.empty:
-            st_obj.error(
-                "No es posible diligenciar este campo. Verifique que todos los estándares se encuentren en estado Completo")
-
-            # Crear DataFrame para mostrar los registros con problemas
-            df_validaciones = estandares_inconsistentes[['Cod', 'Entidad', 'Nivel Información ', 'Campos Incompletos']]
-            st_obj.dataframe(df_validaciones)
-
-        # Filtrar registros con inconsistencias de publicación
-        publicacion_inconsistentes = resultados_df[resultados_df['Estado Publicación'] == 'Inconsistente']
-
-        if not publicacion_inconsistentes.empty:
-            st_obj.error(
-                "No es posible diligenciar este campo. El campo 'Disponer datos temáticos' debe estar marcado como 'Si'")
-
-            # Crear DataFrame para mostrar los registros con problemas
-            df_publicacion = publicacion_inconsistentes[['Cod', 'Entidad', 'Nivel Información ']]
-            st_obj.dataframe(df_publicacion)
-            
-        # Filtrar registros con inconsistencias de "Disponer datos temáticos" como "No" y tener fecha de publicación
-        publicacion_disponer_inconsistentes = resultados_df[resultados_df['Estado Publicación Disponer'] == 'Inconsistente']
-        
-        if not publicacion_disponer_inconsistentes.empty:
-            st_obj.error(
-                "Si 'Disponer datos temáticos' está marcado como 'No', no debe tener fecha de publicación. Se borrará la fecha.")
-            
-            # Crear DataFrame para mostrar los registros con problemas
-            df_publicacion_disponer = publicacion_disponer_inconsistentes[['Cod', 'Entidad', 'Nivel Información ']]
-            st_obj.dataframe(df_publicacion_disponer)
-
-        # Filtrar registros con inconsistencias de oficio de cierre
-        oficio_inconsistentes = resultados_df[resultados_df['Estado Oficio Cierre'] == 'Inconsistente']
-
-        if not oficio_inconsistentes.empty:
-            st_obj.error(
-                "No es posible diligenciar la Fecha de oficio de cierre. Debe tener todos los campos Si/No en 'Si', todos los estándares completos, y todas las fechas diligenciadas y anteriores a la fecha de cierre.")
-
-            # Crear DataFrame para mostrar los registros con problemas
-            df_oficio = oficio_inconsistentes[['Cod', 'Entidad', 'Nivel Información ', 'Oficio Incompletos']]
-            st_obj.dataframe(df_oficio)
-
-        # Filtrar registros con Estado "Completado" sin fecha de oficio de cierre
-        estado_inconsistentes = resultados_df[resultados_df['Estado Inconsistente'] == 'Sí (Completado sin fecha oficio)']
-        
-        if not estado_inconsistentes.empty:
-            st_obj.error(
-                "Hay registros con Estado 'Completado' sin fecha de oficio de cierre. El Estado se cambiará a 'En proceso'.")
-            
-            # Crear DataFrame para mostrar los registros con problemas
-            df_estado = estado_inconsistentes[['Cod', 'Entidad', 'Nivel Información ']]
-            st_obj.dataframe(df_estado)
-
-        # Filtrar registros con otras inconsistencias
-        otras_inconsistencias = resultados_df[
-            (resultados_df['Estado Acuerdo'] == 'Inconsistente') |
-            (resultados_df['Estado Análisis'] == 'Inconsistente')
-            ]
-
-        if not otras_inconsistencias.empty:
-            if (estandares_inconsistentes.empty and publicacion_inconsistentes.empty and 
-                publicacion_disponer_inconsistentes.empty and oficio_inconsistentes.empty and 
-                estado_inconsistentes.empty):
-                st_obj.warning("Se detectaron otras inconsistencias en los datos que se corregirán automáticamente:")
-            else:
-                st_obj.warning("Además, se detectaron otras inconsistencias que se corregirán automáticamente:")
-
-            # Filtrar solo las columnas relevantes
-            df_otras = otras_inconsistencias[
-                ['Cod', 'Entidad', 'Nivel Información ', 'Estado Acuerdo', 'Estado Análisis']]
-            st_obj.dataframe(df_otras)
-        elif (estandares_inconsistentes.empty and publicacion_inconsistentes.empty and 
-              publicacion_disponer_inconsistentes.empty and oficio_inconsistentes.empty and 
-              estado_inconsistentes.empty):
-            # No hay inconsistencias
-            st_obj.success("Todos los registros cumplen con las reglas de validación.")
-
-    return resultados_df
+        st_obj.markdown("### Cronología de Hitos")
+        if reporte.empty:
+            st_obj.success("Las fechas de los hitos de todos los registros están en orden cronológico.")
+            return reporte
+
+        pares = pares_fuera_de_orden(reporte['Cronología'], campos)
+        resumen = pd.DataFrame({
+            'Fechas fuera de orden': [describir_par(par) for par in pares],
+            'Registros': [int(((reporte['Cronología'] & bits_pares([par], campos)) != 0).sum()) for par in pares]
+        })
+        st_obj.warning(f"{len(reporte)} de {len(df)} registros tienen fechas de hitos fuera de orden.")
+        st_obj.dataframe(resumen, hide_index=True)
+        st_obj.dataframe(reporte.drop(columns='Cronología'))
+
+    return reporte
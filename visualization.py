@@ -1,100 +1,59 @@
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.figure_factory as ff
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
 import streamlit as st
-from data_utils import procesar_fecha, verificar_completado_por_fecha
+from data_utils import obtener_fecha, texto_columna, completados_por_hito_df, obtener_fecha_corte
+from fecha_utils import en_rango_habiles
+from constants import CAMPOS_FECHA, DURACION_HITOS, COLORES_HITOS
 
 
-def crear_gantt(df):
-    """Crea un diagrama de Gantt a partir de los registros."""
+def crear_gantt(df, fecha_corte=None):
+    """Crea un diagrama de Gantt a partir de los registros, marcando la fecha de corte (por defecto, hoy)."""
     try:
         # Preparar los datos para el diagrama de Gantt
-        gantt_data = []
-        fecha_actual = datetime.now()
-
-        for _, row in df.iterrows():
-            try:
-                # Verificar que las columnas existan
-                if 'Cod' not in row or 'Nivel Información ' not in row:
+        fecha_actual = obtener_fecha_corte(fecha_corte).normalize()
+
+        # Hitos del diagrama: (campo con la fecha de inicio, hito)
+        hitos_gantt = [('Suscripción acuerdo de compromiso', 'Acuerdo de compromiso')] + [
+            (campo, hito) for hito, campo in CAMPOS_FECHA.items()]
+
+        partes = []
+        # Verificar que las columnas existan
+        if 'Cod' in df.columns and 'Nivel Información ' in df.columns:
+            # Usar nivel de información en lugar de entidad
+            nivel_info = texto_columna(df['Nivel Información '])
+            nivel_info = nivel_info.where(nivel_info.str.len() <= 30, nivel_info.str[:30] + "...")
+            etiquetas = texto_columna(df['Cod']) + " - " + nivel_info
+
+            for orden, (campo, hito) in enumerate(hitos_gantt):
+                if campo not in df.columns:
                     continue
 
-                cod = str(row['Cod'])
-                nivel_info = str(row['Nivel Información '])[:30] + "..." if len(
-                    str(row['Nivel Información '])) > 30 else str(row['Nivel Información '])
-
-                # Usar nivel de información en lugar de entidad
-                etiqueta = f"{cod} - {nivel_info}"
-
-                # Hito 1: Acuerdo de compromiso
-                if 'Suscripción acuerdo de compromiso' in row:
-                    fecha_acuerdo = procesar_fecha(row['Suscripción acuerdo de compromiso'])
-                    if fecha_acuerdo is not None and pd.notna(fecha_acuerdo):
-                        fecha_fin_acuerdo = fecha_acuerdo + timedelta(days=7)  # Asumimos 1 semana de duración
-                        gantt_data.append(dict(
-                            Task=etiqueta,
-                            Start=fecha_acuerdo,
-                            Finish=fecha_fin_acuerdo,
-                            Resource='Acuerdo de compromiso'
-                        ))
-
-                # Hito 2: Análisis y cronograma
-                if 'Análisis y cronograma (fecha programada)' in row:
-                    fecha_analisis = procesar_fecha(row['Análisis y cronograma (fecha programada)'])
-                    if fecha_analisis is not None and pd.notna(fecha_analisis):
-                        fecha_fin_analisis = fecha_analisis + timedelta(days=14)  # Asumimos 2 semanas
-                        gantt_data.append(dict(
-                            Task=etiqueta,
-                            Start=fecha_analisis,
-                            Finish=fecha_fin_analisis,
-                            Resource='Análisis y cronograma'
-                        ))
-
-                # Hito 3: Estándares
-                if 'Estándares (fecha programada)' in row:
-                    fecha_estandares = procesar_fecha(row['Estándares (fecha programada)'])
-                    if fecha_estandares is not None and pd.notna(fecha_estandares):
-                        fecha_fin_estandares = fecha_estandares + timedelta(days=14)  # Asumimos 2 semanas
-                        gantt_data.append(dict(
-                            Task=etiqueta,
-                            Start=fecha_estandares,
-                            Finish=fecha_fin_estandares,
-                            Resource='Estándares'
-                        ))
-
-                # Hito 4: Publicación
-                if 'Fecha de publicación programada' in row:
-                    fecha_publicacion = procesar_fecha(row['Fecha de publicación programada'])
-                    if fecha_publicacion is not None and pd.notna(fecha_publicacion):
-                        fecha_fin_publicacion = fecha_publicacion + timedelta(days=7)  # Asumimos 1 semana
-                        gantt_data.append(dict(
-                            Task=etiqueta,
-                            Start=fecha_publicacion,
-                            Finish=fecha_fin_publicacion,
-                            Resource='Publicación'
-                        ))
-            except Exception as e:
-                st.warning(f"Error al procesar registro para Gantt: {e}")
-                continue
-
-        # Crear el dataframe para el diagrama de Gantt
-        gantt_df = pd.DataFrame(gantt_data)
+                # Fechas de inicio ya procesadas en las columnas tipadas (sin años fuera de rango)
+                inicio = obtener_fecha(df, campo)
+                validas = en_rango_habiles(inicio).to_numpy()
+                partes.append(pd.DataFrame({
+                    'Task': etiquetas[validas].to_numpy(),
+                    'Start': inicio[validas].to_numpy(),
+                    'Finish': (inicio[validas] + pd.Timedelta(days=DURACION_HITOS[hito])).to_numpy(),
+                    'Resource': hito,
+                    'fila': np.flatnonzero(validas),
+                    'orden': orden
+                }))
+
+        # Crear el dataframe para el diagrama de Gantt (ordenado por registro y luego por hito)
+        gantt_df = pd.DataFrame()
+        if partes:
+            gantt_df = (pd.concat(partes, ignore_index=True)
+                        .sort_values(['fila', 'orden'], kind='stable')
+                        .drop(columns=['fila', 'orden'])
+                        .reset_index(drop=True))
 
         if not gantt_df.empty:
-            # Colores para cada tipo de hito
-            colors = {
-                'Acuerdo de compromiso': '#1E40AF',
-                'Análisis y cronograma': '#047857',
-                'Estándares': '#B45309',
-                'Publicación': '#BE185D'
-            }
-
             # Crear el diagrama de Gantt
             fig = ff.create_gantt(
                 gantt_df,
-                colors=colors,
+                colors=COLORES_HITOS,
                 index_col='Resource',
                 show_colorbar=True,
                 group_tasks=True,
@@ -115,7 +74,7 @@ def crear_gantt(df):
                 )
             )
 
-            # Agregar línea vertical para la fecha actual
+            # Agregar línea vertical para la fecha de corte
             fig.add_shape(
                 type="line",
                 x0=fecha_actual,
@@ -128,15 +87,15 @@ def crear_gantt(df):
                     width=2,
                     dash="dash",
                 ),
-                name="Fecha Actual"
+                name="Fecha de Corte"
             )
 
-            # Agregar anotación para la fecha actual
+            # Agregar anotación para la fecha de corte
             fig.add_annotation(
                 x=fecha_actual,
                 y=1.05,
                 yref="paper",
-                text=f"Fecha Actual: {fecha_actual.strftime('%d/%m/%Y')}",
+                text=f"Fecha de Corte: {fecha_actual.strftime('%d/%m/%Y')}",
                 showarrow=False,
                 font=dict(
                     family="Arial",
@@ -156,20 +115,9 @@ def crear_gantt(df):
         return None
 
 
-def comparar_avance_metas(df, metas_nuevas_df, metas_actualizar_df):
-    """Compara el avance actual con las metas establecidas."""
+def comparar_avance_metas(df, metas_nuevas_df, metas_actualizar_df, fecha_corte=None):
+    """Compara el avance a la fecha de corte (por defecto, hoy) con las metas establecidas."""
     try:
-        # Obtener la fecha actual
-        fecha_actual = datetime.now()
-
-        # Encontrar la meta más cercana a la fecha actual
-        fechas_metas = metas_nuevas_df.index
-        fecha_meta_cercana = min(fechas_metas, key=lambda x: abs(x - fecha_actual))
-
-        # Obtener los valores de las metas para esa fecha
-        metas_nuevas_actual = metas_nuevas_df.loc[fecha_meta_cercana]
-        metas_actualizar_actual = metas_actualizar_df.loc[fecha_meta_cercana]
-
         # Contar registros completados por hito y tipo (de manera segura)
         # Verificar si la columna TipoDato existe
         if 'TipoDato' not in df.columns:
@@ -181,39 +129,38 @@ def comparar_avance_metas(df, metas_nuevas_df, metas_actualizar_df):
             df['Publicación'] = ''
 
         # Filtrar registros por tipo, asegurando que TipoDato exista y no sea NaN
-        df['TipoDato'] = df['TipoDato'].fillna('').astype(str)
-        registros_nuevos = df[df['TipoDato'].str.upper() == 'NUEVO']
-        registros_actualizar = df[df['TipoDato'].str.upper() == 'ACTUALIZAR']
+        # (sin reemplazar la columna, que puede ser categórica)
+        tipo_dato = texto_columna(df['TipoDato']).str.upper()
 
-        # Para registros nuevos
-        # Asegurar que la columna 'Acuerdo de compromiso' existe y no es NaN
-        if 'Acuerdo de compromiso' not in df.columns:
-            df['Acuerdo de compromiso'] = ''
-        df['Acuerdo de compromiso'] = df['Acuerdo de compromiso'].fillna('').astype(str)
-        
-        completados_nuevos = {
-            'Acuerdo de compromiso': len(registros_nuevos[registros_nuevos['Acuerdo de compromiso'].str.upper().isin(
-                ['SI', 'SÍ', 'S', 'YES', 'Y', 'COMPLETO'])]),
-            'Análisis y cronograma': contar_registros_completados_por_fecha(
-                registros_nuevos, 'Análisis y cronograma (fecha programada)', 'Análisis y cronograma'),
-            'Estándares': contar_registros_completados_por_fecha(
-                registros_nuevos, 'Estándares (fecha programada)', 'Estándares'),
-            'Publicación': contar_registros_completados_por_fecha(
-                registros_nuevos, 'Fecha de publicación programada', 'Publicación')
-        }
-
-        # Para registros a actualizar
-        completados_actualizar = {
-            'Acuerdo de compromiso': len(registros_actualizar[
-                                             registros_actualizar['Acuerdo de compromiso'].str.upper().isin(
-                                                 ['SI', 'SÍ', 'S', 'YES', 'Y', 'COMPLETO'])]),
-            'Análisis y cronograma': contar_registros_completados_por_fecha(
-                registros_actualizar, 'Análisis y cronograma (fecha programada)', 'Análisis y cronograma'),
-            'Estándares': contar_registros_completados_por_fecha(
-                registros_actualizar, 'Estándares (fecha programada)', 'Estándares'),
-            'Publicación': contar_registros_completados_por_fecha(
-                registros_actualizar, 'Fecha de publicación programada', 'Publicación')
-        }
+        # Hitos completados por registro (ver completados_por_hito_df)
+        completados = completados_por_hito_df(df, fecha_corte)
+        completados_nuevos = completados[tipo_dato == 'NUEVO'].sum().astype(int).to_dict()
+        completados_actualizar = completados[tipo_dato == 'ACTUALIZAR'].sum().astype(int).to_dict()
+
+        return comparar_completados_con_metas(completados_nuevos, completados_actualizar,
+                                              metas_nuevas_df, metas_actualizar_df, fecha_corte)
+    except Exception as e:
+        st.error(f"Error al comparar avance con metas: {e}")
+        return comparacion_metas_vacia(fecha_corte)
+
+
+def comparar_completados_con_metas(completados_nuevos, completados_actualizar, metas_nuevas_df,
+                                   metas_actualizar_df, fecha_corte=None):
+    """
+    Compara los registros completados por hito (ya contados, por ejemplo en el modo
+    por bloques) con la meta más cercana a la fecha de corte (por defecto, hoy).
+    """
+    try:
+        # Obtener el día de corte
+        fecha_actual = obtener_fecha_corte(fecha_corte).normalize()
+
+        # Encontrar la meta más cercana a la fecha de corte
+        fechas_metas = metas_nuevas_df.index
+        fecha_meta_cercana = min(fechas_metas, key=lambda x: abs(x - fecha_actual))
+
+        # Obtener los valores de las metas para esa fecha
+        metas_nuevas_actual = metas_nuevas_df.loc[fecha_meta_cercana]
+        metas_actualizar_actual = metas_actualizar_df.loc[fecha_meta_cercana]
 
         # Crear dataframes para la comparación
         comparacion_nuevos = pd.DataFrame({
@@ -240,56 +187,33 @@ def comparar_avance_metas(df, metas_nuevas_df, metas_actualizar_df):
         return comparacion_nuevos, comparacion_actualizar, fecha_meta_cercana
     except Exception as e:
         st.error(f"Error al comparar avance con metas: {e}")
-        # Crear DataFrames de respaldo
-        fecha_meta_cercana = datetime.now()
+        return comparacion_metas_vacia(fecha_corte)
 
-        completados_nuevos = {'Acuerdo de compromiso': 0, 'Análisis y cronograma': 0, 'Estándares': 0,
-                              'Publicación': 0}
-        completados_actualizar = {'Acuerdo de compromiso': 0, 'Análisis y cronograma': 0, 'Estándares': 0,
-                                  'Publicación': 0}
 
-        metas_nuevas_actual = pd.Series(
-            {'Acuerdo de compromiso': 0, 'Análisis y cronograma': 0, 'Estándares': 0, 'Publicación': 0})
-        metas_actualizar_actual = pd.Series(
-            {'Acuerdo de compromiso': 0, 'Análisis y cronograma': 0, 'Estándares': 0, 'Publicación': 0})
+def comparacion_metas_vacia(fecha_corte=None):
+    """Crea DataFrames de respaldo (en cero) para la comparación con metas."""
+    fecha_meta_cercana = obtener_fecha_corte(fecha_corte).normalize()
 
-        comparacion_nuevos = pd.DataFrame({
-            'Completados': completados_nuevos,
-            'Meta': metas_nuevas_actual,
-            'Porcentaje': [0, 0, 0, 0]
-        })
+    completados_nuevos = {'Acuerdo de compromiso': 0, 'Análisis y cronograma': 0, 'Estándares': 0,
+                          'Publicación': 0}
+    completados_actualizar = {'Acuerdo de compromiso': 0, 'Análisis y cronograma': 0, 'Estándares': 0,
+                              'Publicación': 0}
 
-        comparacion_actualizar = pd.DataFrame({
-            'Completados': completados_actualizar,
-            'Meta': metas_actualizar_actual,
-            'Porcentaje': [0, 0, 0, 0]
-        })
+    metas_nuevas_actual = pd.Series(
+        {'Acuerdo de compromiso': 0, 'Análisis y cronograma': 0, 'Estándares': 0, 'Publicación': 0})
+    metas_actualizar_actual = pd.Series(
+        {'Acuerdo de compromiso': 0, 'Análisis y cronograma': 0, 'Estándares': 0, 'Publicación': 0})
 
-        return comparacion_nuevos, comparacion_actualizar, fecha_meta_cercana
+    comparacion_nuevos = pd.DataFrame({
+        'Completados': completados_nuevos,
+        'Meta': metas_nuevas_actual,
+        'Porcentaje': [0, 0, 0, 0]
+    })
 
+    comparacion_actualizar = pd.DataFrame({
+        'Completados': completados_actualizar,
+        'Meta': metas_actualizar_actual,
+        'Porcentaje': [0, 0, 0, 0]
+    })
 
-def contar_registros_completados_por_fecha(df, columna_fecha_programada, columna_fecha_completado):
-    """
-    Cuenta los registros que tienen una fecha de completado o cuya fecha programada ya pasó.
-    """
-    count = 0
-    for _, row in df.iterrows():
-        if columna_fecha_programada in row and row[columna_fecha_programada]:
-            fecha_programada = row[columna_fecha_programada]
-
-            # Verificar si hay una fecha de completado
-            fecha_completado = None
-            if columna_fecha_completado in row and row[columna_fecha_completado]:
-                # Intentar procesar como fecha primero
-                fecha_completado = procesar_fecha(row[columna_fecha_completado])
-                # Si no es una fecha, verificar si es un valor booleano positivo
-                if fecha_completado is None and str(row[columna_fecha_completado]).strip().upper() in ['SI', 'SÍ',
-                                                                                                       'S', 'YES',
-                                                                                                       'Y',
-                                                                                                       'COMPLETO']:
-                    fecha_completado = datetime.now()  # Usar fecha actual como completado
-
-            if verificar_completado_por_fecha(fecha_programada, fecha_completado):
-                count += 1
-
-    return count
\ No newline at end of file
+    return comparacion_nuevos, comparacion_actualizar, fecha_meta_cercana